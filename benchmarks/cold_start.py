@@ -0,0 +1,71 @@
+import asyncio
+import importlib
+import json
+import sys
+import time
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from src.runtime.startup import StartupReport
+
+# Run in a fresh interpreter by benchmarks.run_benchmarks:
+#   python -m benchmarks.cold_start '<BenchmarkSettings JSON>' <sequence_id>
+# Prints the cold start phases of one process as a JSON line.
+
+
+def main() -> None:
+    settings = json.loads(sys.argv[1])
+    sequence_id = sys.argv[2]
+
+    started = time.perf_counter()
+    importlib.import_module("src.app")
+    imported = time.perf_counter()
+
+    # The stacks src.app defers, loaded by the first invocation in production
+    importlib.import_module("src.runtime.runtime_context")
+    importlib.import_module("src.sequence.sequence_runner")
+    runtime_imported = time.perf_counter()
+
+    from benchmarks.harness import build_runtime, run_payload
+    from benchmarks.workloads import make_payload
+
+    harness_imported = time.perf_counter()
+    runtime, _ = build_runtime(settings)
+    initialized = time.perf_counter()
+
+    async def runs() -> tuple[float, float, "StartupReport | None"]:
+        first_started = time.perf_counter()
+        _, first_runner = await run_payload(runtime, make_payload(sequence_id, 0))
+        warm_started = time.perf_counter()
+        await run_payload(runtime, make_payload(sequence_id, 1))
+        finished = time.perf_counter()
+        await runtime.mcp_pool.close()
+        return (
+            warm_started - first_started,
+            finished - warm_started,
+            first_runner.startup_report,
+        )
+
+    first_run, warm_run, startup = asyncio.run(runs())
+    # The first run's startup stages, see SequenceRunner.startup()
+    stage_ms = {
+        f"startup_{name}_ms": timing["duration_ms"]
+        for name, timing in (startup["stages"] if startup else {}).items()
+    }
+    print(
+        json.dumps(
+            {
+                "import_ms": round((imported - started) * 1000, 3),
+                "runtime_import_ms": round((runtime_imported - imported) * 1000, 3),
+                "runtime_init_ms": round((initialized - harness_imported) * 1000, 3),
+                "first_run_ms": round(first_run * 1000, 3),
+                "startup_ms": startup["total_ms"] if startup else 0.0,
+                **stage_ms,
+                "warm_run_ms": round(warm_run * 1000, 3),
+            }
+        )
+    )
+
+
+if __name__ == "__main__":
+    main()
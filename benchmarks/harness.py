@@ -0,0 +1,71 @@
+import os
+from typing import TypedDict
+
+from benchmarks.scripted_model import ScriptedCallLog, ScriptedChatModel
+from benchmarks.workloads import build_config_loader
+from src.metrics.sinks import InMemoryMetricsSink
+from src.runtime.runtime_context import RuntimeContext
+from src.sequence.sequence_runner import SequenceRunner
+from src.state.session_state import SessionState
+from src.state.step_checkpoints import InMemoryStepCheckpointStore
+from src.types import SequenceRunnerPayload
+from tests.fake_mcp import fake_server_parameters
+
+
+# Knobs of the fake model and tool server, and of the synthetic sequences
+class BenchmarkSettings(TypedDict):
+    model_latency_ms: float
+    tool_latency_ms: float
+    prompt_tokens: int
+    completion_tokens: int
+    cached_tokens: int
+    long_length: int
+    wide_width: int
+
+
+def build_runtime(
+    settings: BenchmarkSettings,
+) -> tuple[RuntimeContext, ScriptedCallLog]:
+    """
+    A runtime wired to the fake MCP server and scripted models, with no
+    secrets, tracing or metrics output. Steps are recorded in memory only.
+    """
+    # Overrides a .env value, loaded when the src package was imported
+    os.environ["LANGSMITH_TRACING"] = "false"
+    call_log = ScriptedCallLog()
+
+    def model_factory(model: str) -> ScriptedChatModel:
+        return ScriptedChatModel(
+            model_name=model,
+            latency_ms=settings["model_latency_ms"],
+            prompt_tokens=settings["prompt_tokens"],
+            completion_tokens=settings["completion_tokens"],
+            cached_tokens=settings["cached_tokens"],
+            call_log=call_log,
+        )
+
+    runtime = RuntimeContext(
+        secrets_ttl_seconds=None,
+        config_loader=build_config_loader(
+            settings["long_length"], settings["wide_width"]
+        ),
+        checkpoint_store=InMemoryStepCheckpointStore(),
+        metrics_sinks=[InMemoryMetricsSink()],
+        model_factory=model_factory,
+        mcp_server_parameters=fake_server_parameters(settings["tool_latency_ms"]),
+    )
+    return runtime, call_log
+
+
+async def run_payload(
+    runtime: RuntimeContext, payload: SequenceRunnerPayload
+) -> tuple[SessionState, SequenceRunner]:
+    sequence_runner = SequenceRunner(
+        payload["sequence_id"],
+        payload["client_id"],
+        payload["product_id"],
+        payload.get("initial_state"),
+        runtime=runtime,
+    )
+    await sequence_runner.startup()
+    return await sequence_runner.run_sequence_async(), sequence_runner
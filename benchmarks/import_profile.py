@@ -0,0 +1,124 @@
+import argparse
+import json
+import subprocess
+import sys
+from typing import Any, TypedDict
+
+# Import-time profile of a module in a fresh interpreter, from the output of
+# python -X importtime:
+#   python -m benchmarks.import_profile src.app --top 20
+#   python -m benchmarks.import_profile src.runtime.runtime_context --json
+
+
+class ImportRecord(TypedDict):
+    module: str
+    self_ms: float
+    cumulative_ms: float
+    # Nesting level in the import tree, 0 for modules imported by the probe
+    depth: int
+
+
+class ImportProfile(TypedDict):
+    module: str
+    total_ms: float
+    # Every module loaded on the way, in the order they finished importing
+    imports: list[ImportRecord]
+
+
+def _import_times(code: str) -> list[ImportRecord]:
+    probe = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    imports: list[ImportRecord] = []
+    for line in probe.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line.removeprefix("import time:").split("|")
+        stripped = name.lstrip()
+        imports.append(
+            {
+                "module": stripped,
+                "self_ms": int(self_us) / 1000,
+                "cumulative_ms": int(cumulative_us) / 1000,
+                "depth": (len(name) - len(stripped) - 1) // 2,
+            }
+        )
+    return imports
+
+
+def profile_imports(module: str) -> ImportProfile:
+    """
+    Imports a module in a new process and returns the time spent in each
+    module it loaded. Modules the interpreter imports at start-up (e.g. site)
+    are not part of the profile.
+    """
+    startup = {record["module"] for record in _import_times("pass")}
+    imports = [
+        record
+        for record in _import_times(f"import {module}")
+        if record["module"] not in startup
+    ]
+    # The probed module and its parent packages are the top-level entries
+    total_ms = sum(record["cumulative_ms"] for record in imports if not record["depth"])
+    return {"module": module, "total_ms": round(total_ms, 3), "imports": imports}
+
+
+def by_package(profile: ImportProfile) -> dict[str, float]:
+    """
+    Self time summed per top-level package, largest first.
+    """
+    totals: dict[str, float] = {}
+    for record in profile["imports"]:
+        package = record["module"].split(".")[0]
+        totals[package] = totals.get(package, 0.0) + record["self_ms"]
+    return {
+        package: round(ms, 3)
+        for package, ms in sorted(totals.items(), key=lambda item: -item[1])
+    }
+
+
+def report(profile: ImportProfile, top: int) -> dict[str, Any]:
+    slowest = sorted(profile["imports"], key=lambda record: -record["cumulative_ms"])
+    return {
+        "module": profile["module"],
+        "total_ms": profile["total_ms"],
+        "modules_loaded": len(profile["imports"]),
+        "packages": dict(list(by_package(profile).items())[:top]),
+        "slowest": slowest[:top],
+    }
+
+
+def print_report(summary: dict[str, Any]) -> None:
+    print(
+        f"import {summary['module']}: {summary['total_ms']:.1f} ms, "
+        f"{summary['modules_loaded']} modules"
+    )
+    print("\nself time by package")
+    for package, ms in summary["packages"].items():
+        print(f"  {package:40} {ms:>10.1f} ms")
+    print("\nslowest modules, including their own imports")
+    for record in summary["slowest"]:
+        print(f"  {record['module']:60} {record['cumulative_ms']:>10.1f} ms")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Import-time profile of a module in a fresh interpreter."
+    )
+    parser.add_argument("module", nargs="?", default="src.app")
+    parser.add_argument("--top", type=int, default=20)
+    parser.add_argument("--json", action="store_true", help="Print JSON instead")
+    args = parser.parse_args()
+
+    summary = report(profile_imports(args.module), args.top)
+    if args.json:
+        print(json.dumps(summary, indent=2))
+    else:
+        print_report(summary)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,300 @@
+import argparse
+import asyncio
+import json
+import platform
+import resource
+import statistics
+import subprocess
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timezone
+from typing import Any
+
+from benchmarks.harness import BenchmarkSettings, build_runtime, run_payload
+from benchmarks.workloads import make_payload, make_payloads
+from src.batch.batch_runner import BatchRunner
+from src.metrics.types import RunSummary
+
+# Offline benchmarks of SequenceRunner against the fake MCP server and scripted
+# models, written as JSON for regression comparison:
+#   python -m benchmarks.run_benchmarks -o results.json --baseline previous.json
+
+
+def measure_cold_start(
+    settings: BenchmarkSettings, sequence_id: str, runs: int
+) -> dict[str, Any]:
+    """
+    Median cold start phases over fresh interpreter processes: importing the
+    app, importing the runtime stack it defers, creating the runtime, the first
+    run (MCP server start, graph and agent builds) with its startup stages and
+    a second, warm run.
+    """
+    samples: list[dict[str, float]] = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        probe = subprocess.run(
+            [
+                sys.executable,
+                "-m",
+                "benchmarks.cold_start",
+                json.dumps(settings),
+                sequence_id,
+            ],
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+        sample = json.loads(probe.stdout.strip().splitlines()[-1])
+        sample["process_ms"] = round((time.perf_counter() - started) * 1000, 3)
+        samples.append(sample)
+    return {
+        "sequence_id": sequence_id,
+        "runs": runs,
+        **{key: statistics.median(s[key] for s in samples) for key in samples[0]},
+    }
+
+
+async def measure_step_overhead(
+    settings: BenchmarkSettings, sequence_id: str, runs: int
+) -> dict[str, Any]:
+    """
+    Framework time per step with zero model and tool latency, split into time
+    inside the steps (minus tool round trips) and orchestration between them.
+    """
+    runtime, _ = build_runtime(
+        {**settings, "model_latency_ms": 0, "tool_latency_ms": 0}
+    )
+    summaries: list[RunSummary] = []
+    try:
+        # Warm-up, so MCP start and graph and agent builds are excluded
+        await run_payload(runtime, make_payload(sequence_id, 0))
+        for index in range(1, runs + 1):
+            _, sequence_runner = await run_payload(
+                runtime, make_payload(sequence_id, index)
+            )
+            if sequence_runner.run_summary is not None:
+                summaries.append(sequence_runner.run_summary)
+    finally:
+        await runtime.mcp_pool.close()
+
+    steps = len(summaries[0]["steps"])
+    tool_calls = sum(summary["tool_calls"] for summary in summaries)
+    in_step_ms = [
+        sum(step["wall_ms"] - step["tool_ms"] for step in summary["steps"]) / steps
+        for summary in summaries
+    ]
+    orchestration_ms = [
+        (summary["wall_ms"] - sum(step["wall_ms"] for step in summary["steps"])) / steps
+        for summary in summaries
+    ]
+    return {
+        "sequence_id": sequence_id,
+        "steps": steps,
+        "runs": runs,
+        "run_ms": statistics.median(summary["wall_ms"] for summary in summaries),
+        "in_step_ms_per_step": round(statistics.median(in_step_ms), 3),
+        "orchestration_ms_per_step": round(statistics.median(orchestration_ms), 3),
+        "tool_rtt_ms": round(
+            sum(summary["tool_ms"] for summary in summaries) / max(tool_calls, 1), 3
+        ),
+    }
+
+
+async def measure_throughput(
+    settings: BenchmarkSettings,
+    sequence_ids: list[str],
+    concurrency: int,
+    runs: int,
+    trace_memory: bool = False,
+) -> dict[str, Any]:
+    """
+    Runs a mix of all sequences through a BatchRunner at one concurrency
+    level, after warming every sequence up once.
+    """
+    runtime, call_log = build_runtime(settings)
+    batch_runner = BatchRunner(concurrency, runtime)
+    try:
+        for index, sequence_id in enumerate(sequence_ids):
+            await run_payload(runtime, make_payload(sequence_id, -1 - index))
+        model_calls = call_log.calls + call_log.structured_calls
+
+        if trace_memory:
+            tracemalloc.start()
+        async for _ in batch_runner.run(make_payloads(sequence_ids, runs)):
+            pass
+        if trace_memory:
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+    finally:
+        await batch_runner.close()
+
+    summary = batch_runner.summary()
+    result: dict[str, Any] = {
+        "concurrency": concurrency,
+        "runs": summary["total"],
+        "failed": summary["failed"],
+        "runs_per_second": summary["runs_per_second"],
+        "latency_ms": summary["latency_ms"],
+        "model_calls_per_run": round(
+            (call_log.calls + call_log.structured_calls - model_calls) / runs, 3
+        ),
+    }
+    if trace_memory:
+        result["tracemalloc_peak_mb"] = round(peak / 2**20, 3)
+    return result
+
+
+def headline_metrics(results: dict[str, Any]) -> dict[str, tuple[float, bool]]:
+    """
+    The metrics compared against a baseline, with whether higher is better.
+    """
+    metrics: dict[str, tuple[float, bool]] = {}
+    for key in (
+        "process_ms",
+        "import_ms",
+        "runtime_import_ms",
+        "first_run_ms",
+        "startup_ms",
+        "warm_run_ms",
+    ):
+        metrics[f"cold_start.{key}"] = (results["cold_start"][key], False)
+    for key in ("in_step_ms_per_step", "orchestration_ms_per_step"):
+        metrics[f"step_overhead.{key}"] = (results["step_overhead"][key], False)
+    for level in results["throughput"]:
+        prefix = f"throughput.c{level['concurrency']}"
+        metrics[f"{prefix}.runs_per_second"] = (level["runs_per_second"], True)
+        metrics[f"{prefix}.p95_ms"] = (level["latency_ms"]["p95"], False)
+    metrics["memory.tracemalloc_peak_mb"] = (
+        results["memory"]["tracemalloc_peak_mb"],
+        False,
+    )
+    return metrics
+
+
+def compare(
+    results: dict[str, Any], baseline: dict[str, Any], tolerance: float
+) -> list[str]:
+    """
+    Prints the relative change of every headline metric to stderr, and
+    returns the ones that got worse by more than the tolerance.
+    """
+    current = headline_metrics(results)
+    previous = headline_metrics(baseline)
+    regressions: list[str] = []
+    print(
+        f"{'metric':45} {'baseline':>12} {'current':>12} {'change':>8}",
+        file=sys.stderr,
+    )
+    for name, (value, higher_is_better) in current.items():
+        if name not in previous or not previous[name][0]:
+            continue
+        baseline_value = previous[name][0]
+        change = (value - baseline_value) / baseline_value
+        worse = -change if higher_is_better else change
+        flag = "REGRESSION" if worse > tolerance else ""
+        print(
+            f"{name:45} {baseline_value:>12.3f} {value:>12.3f} {change:+8.1%} {flag}",
+            file=sys.stderr,
+        )
+        if flag:
+            regressions.append(name)
+    return regressions
+
+
+async def run_benchmarks(args: argparse.Namespace) -> dict[str, Any]:
+    settings: BenchmarkSettings = {
+        "model_latency_ms": args.model_latency_ms,
+        "tool_latency_ms": args.tool_latency_ms,
+        "prompt_tokens": args.prompt_tokens,
+        "completion_tokens": args.completion_tokens,
+        "cached_tokens": args.cached_tokens,
+        "long_length": args.long,
+        "wide_width": args.wide,
+    }
+    sequence_ids = [
+        "test-seq",
+        "agent-as-tool-seq",
+        f"long-{args.long}",
+        f"wide-{args.wide}",
+    ]
+
+    results: dict[str, Any] = {
+        "meta": {
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "git_commit": subprocess.run(
+                ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True
+            ).stdout.strip(),
+            "settings": settings,
+            "sequences": sequence_ids,
+        }
+    }
+    results["cold_start"] = await asyncio.to_thread(
+        measure_cold_start, settings, "test-seq", args.cold_runs
+    )
+    results["step_overhead"] = await measure_step_overhead(
+        settings, f"long-{args.long}", args.overhead_runs
+    )
+    results["throughput"] = [
+        await measure_throughput(settings, sequence_ids, concurrency, args.runs)
+        for concurrency in args.concurrency
+    ]
+    memory = await measure_throughput(
+        settings, sequence_ids, max(args.concurrency), args.runs, trace_memory=True
+    )
+    results["memory"] = {
+        "concurrency": memory["concurrency"],
+        "tracemalloc_peak_mb": memory["tracemalloc_peak_mb"],
+        # Kilobytes on Linux, the MCP server processes are not included
+        "max_rss_mb": round(
+            resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 3
+        ),
+    }
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Offline SequenceRunner benchmarks with a fake MCP server "
+        "and scripted chat models."
+    )
+    parser.add_argument("-o", "--output", help="JSON results file (default stdout)")
+    parser.add_argument("--baseline", help="Earlier results to compare against")
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=0.2,
+        help="Relative slowdown tolerated before --baseline fails the run",
+    )
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 4, 16])
+    parser.add_argument("--runs", type=int, default=64, help="Runs per level")
+    parser.add_argument("--cold-runs", type=int, default=3)
+    parser.add_argument("--overhead-runs", type=int, default=10)
+    parser.add_argument("--model-latency-ms", type=float, default=50.0)
+    parser.add_argument("--tool-latency-ms", type=float, default=5.0)
+    parser.add_argument("--prompt-tokens", type=int, default=800)
+    parser.add_argument("--completion-tokens", type=int, default=120)
+    parser.add_argument("--cached-tokens", type=int, default=0)
+    parser.add_argument("--long", type=int, default=24, help="Steps of long-N")
+    parser.add_argument("--wide", type=int, default=8, help="Branches of wide-N")
+    args = parser.parse_args()
+
+    results = asyncio.run(run_benchmarks(args))
+    rendered = json.dumps(results, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(rendered + "\n")
+    else:
+        print(rendered)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressions = compare(results, json.load(f), args.tolerance)
+        if regressions:
+            sys.exit(f"Regressed beyond {args.tolerance:.0%}: {', '.join(regressions)}")
+
+
+if __name__ == "__main__":
+    main()
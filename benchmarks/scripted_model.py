@@ -0,0 +1,162 @@
+import asyncio
+import time
+import types
+from typing import Any, Sequence, Union, get_args, get_origin
+
+from langchain_core.callbacks import (
+    AsyncCallbackManagerForLLMRun,
+    CallbackManagerForLLMRun,
+)
+from langchain_core.language_models import BaseChatModel
+from langchain_core.messages import AIMessage, BaseMessage, ToolMessage
+from langchain_core.outputs import ChatGeneration, ChatResult
+from langchain_core.runnables import Runnable, RunnableLambda
+from langchain_core.utils.function_calling import convert_to_openai_tool
+from pydantic import BaseModel, ConfigDict, Field
+
+# Placeholder tool arguments by JSON schema type
+_ARGUMENT_PLACEHOLDERS: dict[str, Any] = {
+    "string": "benchmark",
+    "integer": 0,
+    "number": 0.0,
+    "boolean": False,
+    "object": {},
+    "array": [],
+}
+
+
+class ScriptedCallLog:
+    """
+    Shared by a model and every copy bind_tools() makes of it.
+    """
+
+    def __init__(self) -> None:
+        self.calls = 0
+        self.structured_calls = 0
+
+
+def placeholder_for(annotation: Any) -> Any:
+    origin = get_origin(annotation)
+    if origin in (Union, types.UnionType):
+        return placeholder_for(
+            next(arg for arg in get_args(annotation) if arg is not type(None))
+        )
+    if origin is list:
+        return []
+    if origin is dict:
+        return {}
+    if isinstance(annotation, type) and issubclass(annotation, BaseModel):
+        return fill_schema(annotation)
+    if annotation is bool:
+        return False
+    if annotation in (int, float):
+        return annotation(0)
+    return "benchmark"
+
+
+def fill_schema(schema: type[BaseModel]) -> BaseModel:
+    return schema.model_construct(
+        **{
+            name: placeholder_for(field.annotation)
+            for name, field in schema.model_fields.items()
+        }
+    )
+
+
+class ScriptedChatModel(BaseChatModel):
+    """
+    Deterministic chat model for offline runs. With tools bound, the first
+    turn calls every tool once and the turn after the tool results answers.
+    Structured output is filled with placeholders matching the schema. Every
+    call sleeps for latency_ms and reports the configured token usage.
+    """
+
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+
+    model_name: str = "scripted"
+    latency_ms: float = 0.0
+    prompt_tokens: int = 200
+    completion_tokens: int = 40
+    cached_tokens: int = 0
+    bound_tools: list[dict[str, Any]] = []
+    call_log: ScriptedCallLog = Field(default_factory=ScriptedCallLog)
+
+    @property
+    def _llm_type(self) -> str:
+        return "scripted"
+
+    def _generate(
+        self,
+        messages: list[BaseMessage],
+        stop: list[str] | None = None,
+        run_manager: CallbackManagerForLLMRun | None = None,
+        **kwargs: Any,
+    ) -> ChatResult:
+        time.sleep(self.latency_ms / 1000)
+        return self._respond(messages)
+
+    async def _agenerate(
+        self,
+        messages: list[BaseMessage],
+        stop: list[str] | None = None,
+        run_manager: AsyncCallbackManagerForLLMRun | None = None,
+        **kwargs: Any,
+    ) -> ChatResult:
+        await asyncio.sleep(self.latency_ms / 1000)
+        return self._respond(messages)
+
+    def _respond(self, messages: list[BaseMessage]) -> ChatResult:
+        self.call_log.calls += 1
+        if self.bound_tools and not isinstance(messages[-1], ToolMessage):
+            message = AIMessage(
+                content="",
+                tool_calls=[
+                    {
+                        "name": tool["function"]["name"],
+                        "args": self._tool_arguments(tool),
+                        "id": f"call_{self.call_log.calls}_{index}",
+                    }
+                    for index, tool in enumerate(self.bound_tools)
+                ],
+            )
+        else:
+            message = AIMessage(content="Scripted answer.")
+        message.usage_metadata = {
+            "input_tokens": self.prompt_tokens,
+            "output_tokens": self.completion_tokens,
+            "total_tokens": self.prompt_tokens + self.completion_tokens,
+            "input_token_details": {"cache_read": self.cached_tokens},
+        }
+        message.response_metadata = {"model_name": self.model_name}
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+    @staticmethod
+    def _tool_arguments(tool: dict[str, Any]) -> dict[str, Any]:
+        parameters = tool["function"].get("parameters", {})
+        return {
+            name: _ARGUMENT_PLACEHOLDERS.get(prop.get("type", "string"), "benchmark")
+            for name, prop in parameters.get("properties", {}).items()
+            if name in parameters.get("required", [])
+        }
+
+    def bind_tools(
+        self, tools: Sequence[Any], **kwargs: Any
+    ) -> Runnable[Any, BaseMessage]:
+        return self.model_copy(
+            update={"bound_tools": [convert_to_openai_tool(tool) for tool in tools]}
+        )
+
+    def with_structured_output(  # type: ignore[override]
+        self, schema: type[BaseModel], **kwargs: Any
+    ) -> Runnable[Any, BaseModel]:
+        def respond(_input: Any) -> BaseModel:
+            time.sleep(self.latency_ms / 1000)
+            self.call_log.structured_calls += 1
+            return fill_schema(schema)
+
+        async def arespond(_input: Any) -> BaseModel:
+            await asyncio.sleep(self.latency_ms / 1000)
+            self.call_log.structured_calls += 1
+            return fill_schema(schema)
+
+        return RunnableLambda(respond, afunc=arespond)
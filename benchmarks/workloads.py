@@ -0,0 +1,167 @@
+import copy
+import json
+from typing import Any
+
+from src.agent.types import Agent
+from src.data.config_store import InMemoryConfigStore
+from src.data.mock_db import AGENTS, CLIENT_CONFIGS, SEQUENCES
+from src.sequence.sequence_config_loader import SequenceConfigLoader
+from src.sequence.types import Sequence, StepBase
+from src.types import SequenceRunnerPayload
+
+BENCH_CLIENT_ID = "client-123"
+
+# Initial states of the mock sequences, as in tests/fixtures
+_MOCK_INITIAL_STATES: dict[str, dict[str, Any]] = {
+    "test-seq": {
+        "incoming_message": {
+            "content": "Yes, I would like to schedule an appointment.",
+            "channel": "email",
+            "timestamp": "2025-05-01T12:00:00Z",
+        }
+    },
+    "agent-as-tool-seq": {
+        "incoming_message": {
+            "content": "Bro, I demand for you to schedule an appointment ASAP.",
+            "channel": "sms",
+            "timestamp": "2025-05-22T12:00:00Z",
+        }
+    },
+}
+
+
+def bench_agent(agent_id: str) -> Agent:
+    return {
+        "id": agent_id,
+        "name": "BenchmarkAgent",
+        "model": "bench:scripted",
+        "prompt": [
+            ("system", "Answer the customer in one sentence."),
+            ("user", "{incoming_message}"),
+        ],
+        "tools": [],
+        "sub_agents": [],
+        "dependencies": [
+            {"key": "incoming_message", "default_value": None, "override": False}
+        ],
+        "output_schema": json.dumps(
+            {
+                "type": "object",
+                "properties": {"answer": {"type": "string"}},
+                "required": ["answer"],
+            }
+        ),
+    }
+
+
+def long_sequence(length: int) -> tuple[Sequence, dict[str, Agent]]:
+    """
+    Sequential chain alternating echo tools and agents, each tool step
+    reading the output of the step before it.
+    """
+    steps: list[StepBase] = []
+    agents: dict[str, Agent] = {}
+    previous_key = "incoming_message[content]"
+    for index in range(length):
+        if index % 2 == 0:
+            steps.append(
+                {
+                    "type": "tool",
+                    "id": f"bench-echo-{index}",
+                    "arguments": {"value": {"type": "dynamic", "value": previous_key}},
+                    "output_key": f"step_{index}",
+                }
+            )
+        else:
+            agent_id = f"bench-long-agent-{index}"
+            agents[agent_id] = bench_agent(agent_id)
+            steps.append(
+                {"type": "agent", "id": agent_id, "output_key": f"step_{index}"}
+            )
+        previous_key = f"step_{index}"
+    return {"id": f"long-{length}", "steps": steps}, agents
+
+
+def wide_sequence(width: int) -> tuple[Sequence, dict[str, Agent]]:
+    """
+    Parallel fan-out of independent agents and echo tools, joined by one
+    final tool step.
+    """
+    steps: list[StepBase] = []
+    agents: dict[str, Agent] = {}
+    for index in range(width):
+        if index % 2 == 0:
+            agent_id = f"bench-wide-agent-{index}"
+            agents[agent_id] = bench_agent(agent_id)
+            steps.append(
+                {"type": "agent", "id": agent_id, "output_key": f"branch_{index}"}
+            )
+        else:
+            steps.append(
+                {
+                    "type": "tool",
+                    "id": f"bench-echo-{index}",
+                    "arguments": {
+                        "value": {
+                            "type": "dynamic",
+                            "value": "incoming_message[content]",
+                        }
+                    },
+                    "output_key": f"branch_{index}",
+                }
+            )
+    steps.append(
+        {
+            "type": "tool",
+            "id": "bench-join",
+            "arguments": {"branches": {"type": "static", "value": width}},
+            "depends_on": [step["id"] for step in steps],
+            "output_key": "joined",
+        }
+    )
+    return {"id": f"wide-{width}", "steps": steps, "execution_mode": "parallel"}, agents
+
+
+def build_config_loader(long_length: int, wide_width: int) -> SequenceConfigLoader:
+    """
+    The mock sequences and agents, plus one long and one wide synthetic
+    sequence with their agents.
+    """
+    sequences = copy.deepcopy(SEQUENCES)
+    agents = copy.deepcopy(AGENTS)
+    for sequence, sequence_agents in (
+        long_sequence(long_length),
+        wide_sequence(wide_width),
+    ):
+        sequences[sequence["id"]] = sequence
+        agents.update(sequence_agents)
+    return SequenceConfigLoader(
+        InMemoryConfigStore(sequences, copy.deepcopy(CLIENT_CONFIGS), agents)
+    )
+
+
+def make_payload(sequence_id: str, index: int) -> SequenceRunnerPayload:
+    """
+    Every payload carries a distinct message, so content-addressed caches
+    only hit where production traffic would.
+    """
+    initial_state = copy.deepcopy(
+        _MOCK_INITIAL_STATES.get(
+            sequence_id,
+            {"incoming_message": {"content": "Do you have the SUV in stock?"}},
+        )
+    )
+    initial_state["incoming_message"]["content"] += f" (#{index})"
+    return {
+        "sequence_id": sequence_id,
+        "client_id": BENCH_CLIENT_ID,
+        "product_id": "sales_ai",
+        "initial_state": initial_state,
+    }
+
+
+def make_payloads(sequence_ids: list[str], count: int) -> list[SequenceRunnerPayload]:
+    return [
+        make_payload(sequence_ids[index % len(sequence_ids)], index)
+        for index in range(count)
+    ]
@@ -0,0 +1,40 @@
+import argparse
+import asyncio
+import json
+import sys
+
+from src.batch.batch_runner import BatchRunner, load_payloads
+from src.batch.constants import BATCH_CONCURRENCY
+
+
+async def main(args: argparse.Namespace) -> None:
+    batch_runner = BatchRunner(concurrency=args.concurrency)
+    if not args.skip_secrets:
+        batch_runner.runtime.prepare_invocation()
+
+    output = open(args.output, "w") if args.output else sys.stdout
+    try:
+        async for result in batch_runner.run(load_payloads(args.input)):
+            output.write(json.dumps(result, default=str) + "\n")
+            output.flush()
+    finally:
+        await batch_runner.close()
+        if output is not sys.stdout:
+            output.close()
+
+    print(json.dumps(batch_runner.summary(), indent=2), file=sys.stderr)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Run a JSONL file (or JSON list) of sequence payloads."
+    )
+    parser.add_argument("input", help="JSONL or JSON list of payloads/lambda events")
+    parser.add_argument("-c", "--concurrency", type=int, default=BATCH_CONCURRENCY)
+    parser.add_argument("-o", "--output", help="JSONL results file (default stdout)")
+    parser.add_argument(
+        "--skip-secrets",
+        action="store_true",
+        help="Do not load secrets from AWS Secrets Manager, e.g. when .env has them",
+    )
+    asyncio.run(main(parser.parse_args()))
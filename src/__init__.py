@@ -0,0 +1,5 @@
+from dotenv import load_dotenv
+
+# Before any module reads its constants from the environment, so values
+# from a local .env take effect. Variables already set are kept.
+load_dotenv()
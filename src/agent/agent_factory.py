@@ -1,137 +1,252 @@
-import asyncio
 import json
-from typing import Any
+from operator import itemgetter
+from typing import Any, Coroutine, Hashable
 
 import pydantic
 from jsonschema_pydantic import jsonschema_to_pydantic
-from langchain.chat_models import init_chat_model
 from langchain_core.messages import BaseMessage
 from langchain_core.prompts import ChatPromptTemplate
-from langchain_core.tools import BaseTool, StructuredTool, tool
-from langgraph.graph.graph import CompiledGraph
+from langchain_core.runnables import Runnable, RunnableConfig, RunnableParallel
+from langchain_core.runnables.config import patch_config
+from langchain_core.tools import BaseTool, StructuredTool
 from langgraph.prebuilt import create_react_agent
 
-from src.agent.types import Agent, Dependency
+from src.agent.agent_cache import AgentCache, PreparedAgent
+from src.agent.constants import (
+    AGENT_CONTEXT_CONFIG_KEY,
+    LLM_RESPONSE_CACHE_TTL_SECONDS,
+)
+from src.agent.prompt_layout import split_prompt
+from src.agent.response_cache import LLMResponseCache
+from src.agent.types import Agent, AgentPath, Dependency
+from src.cache.hashing import stable_hash
+from src.graph.constants import (
+    MCP_TOOLS_CONFIG_KEY,
+    MCP_TOOLS_FINGERPRINT_CONFIG_KEY,
+    RUN_LOOP_CONFIG_KEY,
+)
+from src.metrics.run_metrics import record_agent_path
+from src.runtime.loop_thread import get_loop_thread, run_on_loop
+from src.sequence.step_arguments import StepArguments
+from src.sequence.step_dependencies import root_key
 from src.sequence.step_utils import get_step_context_static
-from src.sequence.types import Arguments
-from src.state.session_state import SessionState
+from src.sequence.types import ToolCachePolicy
+from src.state.session_state import SessionState, StepContext, layered_context
+from src.tools.constants import TOOL_CACHE_POLICIES_CONFIG_KEY
 from src.tools.tool_invoker import ToolInvoker
 
 
 class AgentFactory:
-    def __init__(self, agents_config: dict[str, Agent], client_config: dict[str, Any]):
+    def __init__(
+        self,
+        agents_config: dict[str, Agent],
+        client_config: dict[str, Any],
+        agent_cache: AgentCache | None = None,
+        response_cache: LLMResponseCache | None = None,
+        tool_invoker: ToolInvoker | None = None,
+    ):
         self._configs = agents_config
         self._client_config = client_config
+        self._cache = agent_cache or AgentCache()
+        self._response_cache = response_cache
+        self._tool_invoker = tool_invoker or ToolInvoker()
+        self._tree_versions: dict[str, str] = {}
 
-    def create_agent(
-        self,
-        agent_id: str,
-        all_tools: list[BaseTool],
-        state: SessionState,
-        arguments: Arguments,
-    ) -> tuple[CompiledGraph, list[BaseMessage]]:
+    def get_config(self, agent_id: str) -> Agent:
         try:
-            config = self._configs[agent_id]
-        except:
+            return self._configs[agent_id]
+        except KeyError:
             raise ValueError(f"Agent {agent_id} not found")
 
-        # Build context defaults
-        optional_defaults = {}
-        required_defaults = {}
-        for dep in config.get("dependencies", []):
-            key = dep["key"]
-            default = dep.get("default_value")
-            if default is not None and dep.get("override"):
-                required_defaults[key] = default
-            elif default is not None:
-                optional_defaults[key] = default
-
+    async def ainvoke_agent(
+        self,
+        agent_id: str,
+        state: SessionState,
+        arguments: StepArguments,
+        config: RunnableConfig,
+    ) -> Any:
+        """
+        Runs an agent step and returns its structured response. Everything
+        but the context and the prompt messages comes from the agent cache.
+        """
+        prepared = self.prepare_agent(agent_id, config)
+        record_agent_path(prepared["path"])
         base_context = get_step_context_static(arguments, state, self._client_config)
-        context = {**optional_defaults, **base_context, **required_defaults}
-
-        # Prompt messages
-        prompt_list = config["prompt"]
-        # ToDo: Implement support for MessagesPlaceholder(variable_name="conversation_history") insert inside
-        # prompt_message_list for passing in a dynamic list of user messages
-        chat_template = ChatPromptTemplate.from_messages(prompt_list)
-        try:
-            messages = chat_template.format_messages(**context)
-        except KeyError as e:
-            raise ValueError(f"Missing key {e} in context for agent {agent_id}")
+        context = self._build_context(prepared["config"], base_context)
+        messages = self._format_messages(prepared, agent_id, context)
+        return await self._ainvoke_prepared(
+            agent_id, prepared, messages, self._with_context(config, context)
+        )
 
-        # Wrap tools & sub-agents
-        wrapped_tools: list[StructuredTool] = []
-        for tool_name in config.get("tools", []):
-            wrapped_tools.append(self._wrap_tool(tool_name, all_tools, context))
+    async def _ainvoke_prepared(
+        self,
+        agent_id: str,
+        prepared: PreparedAgent,
+        messages: list[BaseMessage],
+        config: RunnableConfig,
+    ) -> Any:
+        """
+        Answers from the response cache when the agent opted in and an
+        identical request was seen, otherwise calls the model.
+        """
+        cache_config = prepared["config"].get("response_cache")
+        cache_key: str | None = None
+        if cache_config is not None and self._response_cache is not None:
+            cache_key = self._response_cache.make_key(
+                prepared["config"]["model"],
+                messages,
+                prepared["config"].get("tools", [])
+                + prepared["config"].get("sub_agents", []),
+                prepared["config"]["output_schema"],
+                config["configurable"][MCP_TOOLS_FINGERPRINT_CONFIG_KEY],
+            )
+            cached = await self._response_cache.get(agent_id, cache_key)
+            if cached is not None:
+                return cached
 
-        wrapped_sub_agents = [
-            self.create_agent_tool(agent_id, all_tools, context, arguments)
-            for agent_id in config.get("sub_agents", [])
-        ]
+        # Timeouts and retries are up to the step's policy
+        resp = await prepared["runnable"].ainvoke({"messages": messages}, config)
+        result = self._structured_output(resp)
 
-        # Output schema & model
-        OutputSchema = jsonschema_to_pydantic(json.loads(config["output_schema"]))
-        model = init_chat_model(config["model"], temperature=0)
+        if (
+            cache_key is not None
+            and cache_config is not None
+            and self._response_cache is not None
+        ):
+            await self._response_cache.set(
+                cache_key,
+                result,
+                cache_config.get("ttl_seconds", LLM_RESPONSE_CACHE_TTL_SECONDS),
+            )
+        return result
 
-        react_agent = create_react_agent(
-            model=model,
-            tools=wrapped_tools + wrapped_sub_agents,
-            response_format=OutputSchema,
+    def prepare_agent(self, agent_id: str, config: RunnableConfig) -> PreparedAgent:
+        """
+        Returns the cached model client, output schema, prompt template and
+        runnable (a ReAct graph, or a direct structured-output call for agents
+        without tools or sub-agents) for an agent, building them on the first
+        request for the agent's config version and tool set.
+        """
+        agent_config = self.get_config(agent_id)
+        configurable = config["configurable"]
+        all_tools: dict[str, BaseTool] = configurable[MCP_TOOLS_CONFIG_KEY]
+        key: Hashable = (
+            agent_id,
+            self._tree_version(agent_id),
+            configurable[MCP_TOOLS_FINGERPRINT_CONFIG_KEY],
+        )
+        return self._cache.get_or_prepare(
+            key, lambda: self._prepare(agent_id, agent_config, all_tools)
         )
 
-        return react_agent, messages
+    def _tree_version(self, agent_id: str) -> str:
+        """
+        Version of an agent together with every sub-agent it can reach, so a
+        cached parent never wraps an outdated child.
+        """
+        if agent_id not in self._tree_versions:
+            versions: dict[str, str] = {}
+            pending = [agent_id]
+            while pending:
+                current = pending.pop()
+                if current in versions:
+                    continue
+                config = self.get_config(current)
+                versions[current] = config.get("version", stable_hash(config))
+                pending.extend(config.get("sub_agents", []))
+            self._tree_versions[agent_id] = stable_hash(versions)
+        return self._tree_versions[agent_id]
 
-    def create_agent_tool(
+    def _prepare(
         self,
         agent_id: str,
-        all_tools: list[BaseTool],
-        context: dict,
-        arguments: Arguments,
-    ) -> BaseTool:
+        config: Agent,
+        all_tools: dict[str, BaseTool],
+    ) -> PreparedAgent:
+        # Static messages lead, so providers can cache the prompt prefix
+        static_prompt, dynamic_prompt = split_prompt(config["prompt"])
+        prefix = ChatPromptTemplate.from_messages(static_prompt).format_messages()
+        # ToDo: Implement support for MessagesPlaceholder(variable_name="conversation_history") insert inside
+        # prompt_message_list for passing in a dynamic list of user messages
+        chat_template = ChatPromptTemplate.from_messages(dynamic_prompt)
+
+        # Output schema & model
+        OutputSchema = jsonschema_to_pydantic(json.loads(config["output_schema"]))
+        model = self._cache.get_model(config["model"])
+
+        runnable: Runnable[dict[str, Any], dict[str, Any]]
+        if not config.get("tools") and not config.get("sub_agents"):
+            # Nothing to call, so one structured-output call replaces the
+            # ReAct turn and its separate structured-response call
+            path: AgentPath = "direct"
+            runnable = itemgetter("messages") | RunnableParallel(
+                structured_response=model.with_structured_output(OutputSchema)
+            )
+        else:
+            # Wrap tools & sub-agents, they read the caller's context at call time
+            wrapped_tools: list[BaseTool] = [
+                self._wrap_tool(tool_name, all_tools)
+                for tool_name in config.get("tools", [])
+            ]
+            wrapped_sub_agents = [
+                self.create_agent_tool(sub_agent_id)
+                for sub_agent_id in config.get("sub_agents", [])
+            ]
+            path = "react"
+            runnable = create_react_agent(
+                model=model,
+                tools=wrapped_tools + wrapped_sub_agents,
+                response_format=OutputSchema,
+            )
+        return {
+            "config": config,
+            "prefix": prefix,
+            "prompt": chat_template,
+            "output_schema": OutputSchema,
+            "model": model,
+            "path": path,
+            "runnable": runnable,
+        }
+
+    def create_agent_tool(self, agent_id: str) -> BaseTool:
         """
         Wraps a child agent as a sync/async tool, so it can be called
-        as a sub-agent from another agent.
+        as a sub-agent from another agent. Both run the async path. The child
+        is only prepared when the calling model first uses the tool, then
+        memoized. The child sees the calling agent's context, on top of the
+        arguments the model passes.
         """
-        react_agent, messages = self.create_agent(
-            agent_id, all_tools, context, arguments
-        )
-        try:
-            config = self._configs[agent_id]
-        except:
-            raise ValueError(f"Agent {agent_id} not found")
+        child_config = self.get_config(agent_id)
+        memo: list[PreparedAgent] = []
 
-        # ToDo: Make sure to support all outputs from the agent
-        @tool(description=f"Sub-agent tool for {agent_id}")
-        def sync_fn(**tool_kwargs: Any) -> Any:
-            merged = {**tool_kwargs, **context}
-            return react_agent.invoke(
-                {
-                    "messages": messages,
-                    **merged,
-                }
+        def child_inputs(
+            tool_config: RunnableConfig, tool_kwargs: dict[str, Any]
+        ) -> tuple[PreparedAgent, list[BaseMessage], RunnableConfig]:
+            if not memo:
+                memo.append(self.prepare_agent(agent_id, tool_config))
+            prepared = memo[0]
+            parent_context = tool_config["configurable"][AGENT_CONTEXT_CONFIG_KEY]
+            context = self._build_context(
+                prepared["config"], layered_context(parent_context, tool_kwargs)
             )
+            messages = self._format_messages(prepared, agent_id, context)
+            return prepared, messages, self._with_context(tool_config, context)
 
-        async def async_fn(**tool_kwargs: Any) -> Any:
-            merged = {**tool_kwargs, **context}
-            resp = await react_agent.ainvoke(
-                {
-                    "messages": messages,
-                    **merged,
-                }
-            )
-            structured_response = resp["structured_response"]
-            return (
-                # ToDo: .model_dump instead of .dict, duplicate code
-                structured_response.dict()
-                if hasattr(structured_response, "dict")
-                else structured_response
+        # ToDo: Make sure to support all outputs from the agent
+        async def async_fn(config: RunnableConfig, **tool_kwargs: Any) -> Any:
+            prepared, messages, run_config = child_inputs(config, tool_kwargs)
+            return await self._ainvoke_prepared(
+                agent_id, prepared, messages, run_config
             )
 
+        def sync_fn(config: RunnableConfig, **tool_kwargs: Any) -> Any:
+            return self._run_sync(config, async_fn(config, **tool_kwargs))
+
         input_fields: dict[str, Any] = {}
-        dependencies: list[Dependency] = config["dependencies"]
+        dependencies: list[Dependency] = child_config["dependencies"]
         for item in dependencies:
             input_fields[item["key"]] = (Any, None)
-        OutputSchema = pydantic.create_model(
+        InputSchema = pydantic.create_model(
             "DynamicInputSchema",
             **input_fields,
         )
@@ -142,22 +257,29 @@ class AgentFactory:
             coroutine=async_fn,
             name=agent_id,
             description=f"Agent wrapper for {agent_id}",
-            args_schema=OutputSchema,
+            args_schema=InputSchema,
         )
 
-    @staticmethod
     def _wrap_tool(
-        tool_name: str, all_tools: list[BaseTool], context: dict
+        self, tool_name: str, all_tools: dict[str, BaseTool]
     ) -> StructuredTool:
-        original_tool = next(t for t in all_tools if t.name == tool_name)
+        original_tool = all_tools[tool_name]
 
-        async def _async_wrapper(**kwargs: Any) -> Any:
-            merged = {**kwargs, **context}
-            return await ToolInvoker.invoke(original_tool, merged)
+        async def _async_wrapper(config: RunnableConfig, **kwargs: Any) -> Any:
+            # Resolve the tool of the session this run borrowed
+            configurable = config["configurable"]
+            session_tool = configurable[MCP_TOOLS_CONFIG_KEY][tool_name]
+            merged = layered_context(configurable[AGENT_CONTEXT_CONFIG_KEY], kwargs)
+            # Cache policies come from the running sequence, not the agent
+            policies: dict[str, ToolCachePolicy] = configurable.get(
+                TOOL_CACHE_POLICIES_CONFIG_KEY, {}
+            )
+            return await self._tool_invoker.invoke_cached(
+                session_tool, merged, policies.get(tool_name)
+            )
 
-        def _sync(**kwargs: Any) -> Any:
-            merged = {**kwargs, **context}
-            return asyncio.run(_async_wrapper(**merged))
+        def _sync(config: RunnableConfig, **kwargs: Any) -> Any:
+            return self._run_sync(config, _async_wrapper(config, **kwargs))
 
         return StructuredTool.from_function(
             func=_sync,
@@ -166,3 +288,60 @@ class AgentFactory:
             description=original_tool.description,
             args_schema=original_tool.args_schema,
         )
+
+    @staticmethod
+    def _run_sync(config: RunnableConfig, coroutine: Coroutine[Any, Any, Any]) -> Any:
+        """
+        Sync tool entry points, called from a worker thread, run the async
+        path on the loop owning the run's sessions instead of a loop of their
+        own. Outside of a run, the shared loop thread is used.
+        """
+        loop = config["configurable"].get(RUN_LOOP_CONFIG_KEY)
+        return run_on_loop(loop or get_loop_thread().loop, coroutine)
+
+    @staticmethod
+    def _build_context(config: Agent, base_context: StepContext) -> StepContext:
+        # Build context defaults
+        optional_defaults = {}
+        required_defaults = {}
+        for dep in config.get("dependencies", []):
+            key = dep["key"]
+            default = dep.get("default_value")
+            if default is not None and dep.get("override"):
+                required_defaults[key] = default
+            elif default is not None:
+                optional_defaults[key] = default
+
+        return layered_context(required_defaults, base_context, optional_defaults)
+
+    @staticmethod
+    def _format_messages(
+        prepared: PreparedAgent, agent_id: str, context: StepContext
+    ) -> list[BaseMessage]:
+        prompt = prepared["prompt"]
+        try:
+            # Only the prompt's variables, not every key of the layered context
+            variables = {root_key(name) for name in prompt.input_variables}
+            return [
+                *prepared["prefix"],
+                *prompt.format_messages(**{key: context[key] for key in variables}),
+            ]
+        except KeyError as e:
+            raise ValueError(f"Missing key {e} in context for agent {agent_id}")
+
+    @staticmethod
+    def _with_context(config: RunnableConfig, context: StepContext) -> RunnableConfig:
+        return patch_config(
+            config,
+            configurable={
+                **config.get("configurable", {}),
+                AGENT_CONTEXT_CONFIG_KEY: context,
+            },
+        )
+
+    @staticmethod
+    def _structured_output(resp: dict[str, Any]) -> Any:
+        structured_response = resp["structured_response"]
+        if isinstance(structured_response, pydantic.BaseModel):
+            return structured_response.model_dump()
+        return structured_response
@@ -0,0 +1,39 @@
+import os
+
+# Prepared agents (model client, schemas, prompt and ReAct graph) kept per container
+AGENT_CACHE_MAX_SIZE = int(os.getenv("AGENT_CACHE_MAX_SIZE", "128"))
+
+# RunnableConfig["configurable"] key carrying the calling agent's formatted context
+AGENT_CONTEXT_CONFIG_KEY = "agent_context"
+
+# Deepest allowed nesting of sub-agents below a step's agent
+MAX_SUB_AGENT_DEPTH = int(os.getenv("MAX_SUB_AGENT_DEPTH", "4"))
+
+# Response cache for agents that opt in with "response_cache" in their config
+LLM_RESPONSE_CACHE_BACKEND = os.getenv("LLM_RESPONSE_CACHE_BACKEND", "memory")
+LLM_RESPONSE_CACHE_PATH = os.getenv(
+    "LLM_RESPONSE_CACHE_PATH", "/tmp/llm_response_cache.sqlite3"
+)
+LLM_RESPONSE_CACHE_MAX_ENTRIES = int(
+    os.getenv("LLM_RESPONSE_CACHE_MAX_ENTRIES", "10000")
+)
+LLM_RESPONSE_CACHE_TTL_SECONDS = float(
+    os.getenv("LLM_RESPONSE_CACHE_TTL_SECONDS", "3600")
+)
+
+# Limits on model calls shared by every run in the container, as JSON by model
+# name with "*" for models without an entry. Each entry takes max_concurrency,
+# requests_per_minute and tokens_per_minute, all unlimited when absent
+LLM_LIMITS = os.getenv("LLM_LIMITS", '{"*": {"max_concurrency": 16}}')
+# Rate-limited calls pause their model's queue and are retried, backing off
+# exponentially (or for the provider's retry-after) up to the max
+LLM_RATE_LIMIT_RETRIES = int(os.getenv("LLM_RATE_LIMIT_RETRIES", "3"))
+LLM_BACKOFF_BASE_SECONDS = float(os.getenv("LLM_BACKOFF_BASE_SECONDS", "1"))
+LLM_BACKOFF_MAX_SECONDS = float(os.getenv("LLM_BACKOFF_MAX_SECONDS", "30"))
+# Added to a call's approximate prompt tokens until its actual usage is known
+LLM_ESTIMATED_COMPLETION_TOKENS = int(
+    os.getenv("LLM_ESTIMATED_COMPLETION_TOKENS", "256")
+)
+
+# RunnableConfig["configurable"] key carrying the run's priority for model calls
+LLM_PRIORITY_CONFIG_KEY = "llm_priority"
@@ -0,0 +1,362 @@
+import asyncio
+import heapq
+import itertools
+import json
+import time
+from typing import Any, Awaitable, Callable, NotRequired, Sequence, TypedDict, TypeVar
+
+from langchain_core.callbacks import CallbackManagerForLLMRun
+from langchain_core.language_models import BaseChatModel
+from langchain_core.messages import AIMessage, BaseMessage
+from langchain_core.messages.utils import count_tokens_approximately
+from langchain_core.outputs import ChatResult
+from langchain_core.prompt_values import PromptValue
+from langchain_core.runnables import Runnable, RunnableConfig, ensure_config
+from pydantic import ConfigDict
+
+from src.agent.constants import (
+    LLM_BACKOFF_BASE_SECONDS,
+    LLM_BACKOFF_MAX_SECONDS,
+    LLM_ESTIMATED_COMPLETION_TOKENS,
+    LLM_LIMITS,
+    LLM_PRIORITY_CONFIG_KEY,
+    LLM_RATE_LIMIT_RETRIES,
+)
+from src.metrics.run_metrics import record_llm_call
+
+T = TypeVar("T")
+
+
+# Limits of one model, unlimited when absent
+class ModelLimits(TypedDict):
+    max_concurrency: NotRequired[int]
+    requests_per_minute: NotRequired[float]
+    tokens_per_minute: NotRequired[float]
+
+
+def parse_model_limits(raw: str) -> dict[str, ModelLimits]:
+    try:
+        limits = json.loads(raw)
+    except json.JSONDecodeError as e:
+        raise ValueError(f"Invalid LLM_LIMITS: {e}")
+    if not isinstance(limits, dict):
+        raise ValueError("LLM_LIMITS must map model names to limits")
+    return limits
+
+
+def estimate_tokens(model_input: Any) -> int:
+    if isinstance(model_input, PromptValue):
+        model_input = model_input.to_messages()
+    elif not isinstance(model_input, list):
+        model_input = [model_input]
+    try:
+        prompt_tokens = count_tokens_approximately(model_input)
+    except (NotImplementedError, TypeError, ValueError):
+        prompt_tokens = 0
+    return prompt_tokens + LLM_ESTIMATED_COMPLETION_TOKENS
+
+
+def is_rate_limit_error(error: Exception) -> bool:
+    return (
+        getattr(error, "status_code", None) == 429
+        or type(error).__name__ == "RateLimitError"
+    )
+
+
+def retry_after_seconds(error: Exception) -> float:
+    headers = getattr(getattr(error, "response", None), "headers", None) or {}
+    try:
+        return float(headers.get("retry-after", 0))
+    except (TypeError, ValueError):
+        return 0.0
+
+
+class TokenBucket:
+    """
+    Refills continuously up to its per-minute capacity. Takes may overdraw it,
+    the debt then delays the next takes.
+    """
+
+    def __init__(self, per_minute: float):
+        self.capacity = per_minute
+        self._rate = per_minute / 60
+        self._level = per_minute
+        self._updated = time.monotonic()
+
+    def wait_seconds(self, amount: float, now: float) -> float:
+        self._refill(now)
+        # Requests larger than the bucket wait for a full one, not forever
+        missing = min(amount, self.capacity) - self._level
+        return max(missing, 0.0) / self._rate
+
+    def take(self, amount: float, now: float) -> None:
+        self._refill(now)
+        self._level -= amount
+
+    def _refill(self, now: float) -> None:
+        self._level = min(
+            self._level + (now - self._updated) * self._rate, self.capacity
+        )
+        self._updated = now
+
+
+class ModelLane:
+    """
+    Queue of one model's calls. Calls start in priority order, then arrival
+    order, once a concurrency slot is free and both buckets allow them. A
+    rate-limited response pauses the lane and halves its concurrency, which
+    grows back by one per successful call.
+    """
+
+    def __init__(self, limits: ModelLimits):
+        self.max_concurrency = limits.get("max_concurrency")
+        self.concurrency = self.max_concurrency
+        rpm = limits.get("requests_per_minute")
+        tpm = limits.get("tokens_per_minute")
+        self._requests = TokenBucket(rpm) if rpm else None
+        self._tokens = TokenBucket(tpm) if tpm else None
+        # (-priority, arrival, waiter, estimated tokens)
+        self._queue: list[tuple[int, int, asyncio.Future[None], int]] = []
+        self._arrivals = itertools.count()
+        self._wakeup: asyncio.TimerHandle | None = None
+        self._backoff_seconds = 0.0
+        self.paused_until = 0.0
+        self.in_flight = 0
+        self.calls = 0
+        self.rate_limited = 0
+        self.wait_seconds_total = 0.0
+        self.wait_seconds_max = 0.0
+
+    async def acquire(self, priority: int, tokens: int) -> float:
+        """
+        Waits for the call's turn and returns how long it waited.
+        """
+        started = time.monotonic()
+        waiter: asyncio.Future[None] = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._queue, (-priority, next(self._arrivals), waiter, tokens))
+        self._dispatch()
+        try:
+            await waiter
+        except asyncio.CancelledError:
+            # Cancelled after being let through, give the slot back
+            if waiter.done() and not waiter.cancelled():
+                self.release(tokens, tokens)
+            raise
+
+        waited = time.monotonic() - started
+        self.calls += 1
+        self.wait_seconds_total += waited
+        self.wait_seconds_max = max(self.wait_seconds_max, waited)
+        return waited
+
+    def release(
+        self,
+        estimated_tokens: int,
+        used_tokens: int,
+        rate_limited: bool = False,
+        retry_after: float = 0.0,
+    ) -> None:
+        now = time.monotonic()
+        self.in_flight -= 1
+        if self._tokens is not None:
+            # Settle the estimate taken at acquire with the actual usage
+            self._tokens.take(used_tokens - estimated_tokens, now)
+
+        if rate_limited:
+            self.rate_limited += 1
+            self._backoff_seconds = min(
+                max(self._backoff_seconds * 2, LLM_BACKOFF_BASE_SECONDS),
+                LLM_BACKOFF_MAX_SECONDS,
+            )
+            self.paused_until = max(
+                self.paused_until, now + max(self._backoff_seconds, retry_after)
+            )
+            if self.concurrency is not None:
+                self.concurrency = max(self.concurrency // 2, 1)
+        else:
+            self._backoff_seconds /= 2
+            if (
+                self.concurrency is not None
+                and self.max_concurrency is not None
+                and self.concurrency < self.max_concurrency
+            ):
+                self.concurrency += 1
+        self._dispatch()
+
+    def _dispatch(self) -> None:
+        if self._wakeup is not None:
+            self._wakeup.cancel()
+            self._wakeup = None
+
+        now = time.monotonic()
+        while self._queue:
+            _, _, waiter, tokens = self._queue[0]
+            if waiter.done():
+                # Cancelled while queued
+                heapq.heappop(self._queue)
+                continue
+            if self.concurrency is not None and self.in_flight >= self.concurrency:
+                # The next release dispatches again
+                return
+
+            wait = self.paused_until - now
+            if self._requests is not None:
+                wait = max(wait, self._requests.wait_seconds(1, now))
+            if self._tokens is not None:
+                wait = max(wait, self._tokens.wait_seconds(tokens, now))
+            if wait > 0:
+                # Later calls never overtake the head of the queue
+                self._wakeup = asyncio.get_running_loop().call_later(
+                    wait, self._dispatch
+                )
+                return
+
+            heapq.heappop(self._queue)
+            if self._requests is not None:
+                self._requests.take(1, now)
+            if self._tokens is not None:
+                self._tokens.take(tokens, now)
+            self.in_flight += 1
+            waiter.set_result(None)
+
+    def stats(self) -> dict[str, int | float | None]:
+        return {
+            "concurrency": self.concurrency,
+            "max_concurrency": self.max_concurrency,
+            "in_flight": self.in_flight,
+            "queued": sum(not waiter.done() for _, _, waiter, _ in self._queue),
+            "calls": self.calls,
+            "rate_limited": self.rate_limited,
+            "queue_wait_ms_total": round(self.wait_seconds_total * 1000, 3),
+            "queue_wait_ms_max": round(self.wait_seconds_max * 1000, 3),
+            "queue_wait_ms_avg": (
+                round(self.wait_seconds_total * 1000 / self.calls, 3)
+                if self.calls
+                else 0.0
+            ),
+        }
+
+
+class LLMLimiter:
+    """
+    Process-level limiter of model calls, one lane per model name, shared by
+    every run so concurrent sequences do not trigger provider rate limits.
+    """
+
+    def __init__(
+        self,
+        limits: dict[str, ModelLimits] | None = None,
+        rate_limit_retries: int = LLM_RATE_LIMIT_RETRIES,
+    ):
+        self._limits = parse_model_limits(LLM_LIMITS) if limits is None else limits
+        self._rate_limit_retries = rate_limit_retries
+        self._lanes: dict[str, ModelLane] = {}
+
+    def lane(self, model: str) -> ModelLane:
+        if model not in self._lanes:
+            limits = self._limits.get(model, self._limits.get("*", {}))
+            self._lanes[model] = ModelLane(limits)
+        return self._lanes[model]
+
+    async def call(
+        self,
+        model: str,
+        priority: int,
+        estimated_tokens: int,
+        invoke: Callable[[], Awaitable[T]],
+    ) -> T:
+        """
+        Runs a model call in its turn. Rate-limited calls are retried after
+        the lane's backoff, keeping their priority.
+        """
+        lane = self.lane(model)
+        attempt = 0
+        while True:
+            waited = await lane.acquire(priority, estimated_tokens)
+            record_llm_call(waited)
+            try:
+                result = await invoke()
+            except Exception as e:
+                rate_limited = is_rate_limit_error(e)
+                lane.release(
+                    estimated_tokens,
+                    estimated_tokens,
+                    rate_limited,
+                    retry_after_seconds(e) if rate_limited else 0.0,
+                )
+                if rate_limited and attempt < self._rate_limit_retries:
+                    attempt += 1
+                    continue
+                raise
+            except BaseException:
+                lane.release(estimated_tokens, estimated_tokens)
+                raise
+
+            used_tokens = estimated_tokens
+            if isinstance(result, AIMessage) and result.usage_metadata:
+                used_tokens = result.usage_metadata["total_tokens"]
+            lane.release(estimated_tokens, used_tokens)
+            return result
+
+    def wrap(self, model: str, chat_model: BaseChatModel) -> "RateLimitedChatModel":
+        return RateLimitedChatModel(model_key=model, wrapped=chat_model, limiter=self)
+
+    def stats(self) -> dict[str, dict[str, int | float | None]]:
+        return {model: lane.stats() for model, lane in self._lanes.items()}
+
+
+class RateLimitedChatModel(BaseChatModel):
+    """
+    Chat model sending its async calls through the limiter, and those of the
+    runnables bind_tools() and with_structured_output() derive from it, so the
+    ReAct graph's every model turn is limited. Sync calls are not limited.
+    """
+
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+
+    model_key: str
+    # The chat model, or what bind_tools/with_structured_output made of it
+    wrapped: Any
+    limiter: LLMLimiter
+
+    @property
+    def _llm_type(self) -> str:
+        return "rate_limited"
+
+    def _generate(
+        self,
+        messages: list[BaseMessage],
+        stop: list[str] | None = None,
+        run_manager: CallbackManagerForLLMRun | None = None,
+        **kwargs: Any,
+    ) -> ChatResult:
+        raise NotImplementedError("Call invoke() or ainvoke()")
+
+    def invoke(  # type: ignore[override]
+        self, input: Any, config: RunnableConfig | None = None, **kwargs: Any
+    ) -> Any:
+        return self.wrapped.invoke(input, config, **kwargs)
+
+    async def ainvoke(  # type: ignore[override]
+        self, input: Any, config: RunnableConfig | None = None, **kwargs: Any
+    ) -> Any:
+        config = ensure_config(config)
+        priority = config["configurable"].get(LLM_PRIORITY_CONFIG_KEY, 0)
+        return await self.limiter.call(
+            self.model_key,
+            priority,
+            estimate_tokens(input),
+            lambda: self.wrapped.ainvoke(input, config, **kwargs),
+        )
+
+    def bind_tools(self, tools: Sequence[Any], **kwargs: Any) -> Runnable:
+        return self.model_copy(
+            update={"wrapped": self.wrapped.bind_tools(tools, **kwargs)}
+        )
+
+    def with_structured_output(  # type: ignore[override]
+        self, schema: Any, **kwargs: Any
+    ) -> Runnable:
+        return self.model_copy(
+            update={"wrapped": self.wrapped.with_structured_output(schema, **kwargs)}
+        )
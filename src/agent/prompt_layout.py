@@ -0,0 +1,36 @@
+from string import Formatter
+
+from src.agent.types import Prompt
+
+
+def _first_variable_offset(template: str) -> int | None:
+    """
+    Position of the first variable in the raw template, None without any.
+    """
+    offset = 0
+    for literal, field_name, format_spec, conversion in Formatter().parse(template):
+        # Literals come back unescaped, {{ and }} take two characters
+        offset += len(literal) + literal.count("{") + literal.count("}")
+        if field_name is not None:
+            return offset
+    return None
+
+
+def split_prompt(prompt: Prompt) -> tuple[Prompt, Prompt]:
+    """
+    Splits a prompt into its longest static prefix and the rest, both in
+    order. The prefix runs up to the first variable, keeping the lines of the
+    first templated message before it, so it is the same on every request and
+    can be served from the provider's prompt cache. Messages after the first
+    variable stay where they are, static or not.
+    """
+    for index, (role, template) in enumerate(prompt):
+        offset = _first_variable_offset(template)
+        if offset is None:
+            continue
+        cut = template.rfind("\n", 0, offset) + 1
+        static = list(prompt[:index])
+        if template[:cut].strip():
+            static.append((role, template[:cut]))
+        return static, [(role, template[cut:]), *prompt[index + 1 :]]
+    return list(prompt), []
@@ -0,0 +1,192 @@
+import asyncio
+import json
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from typing import Any
+
+from langchain_core.messages import BaseMessage
+
+from src.agent.constants import (
+    LLM_RESPONSE_CACHE_BACKEND,
+    LLM_RESPONSE_CACHE_MAX_ENTRIES,
+    LLM_RESPONSE_CACHE_PATH,
+)
+from src.cache.hashing import stable_hash
+from src.cache.lru_cache import LRUCache
+
+
+class ResponseCacheBackend(ABC):
+    """
+    Storage for cached structured responses. Values are JSON-serializable.
+    """
+
+    @abstractmethod
+    async def get(self, key: str) -> Any | None: ...
+
+    @abstractmethod
+    async def set(self, key: str, value: Any, ttl_seconds: float) -> None: ...
+
+    @abstractmethod
+    def stats(self) -> dict[str, Any]: ...
+
+
+class InMemoryResponseCache(ResponseCacheBackend):
+    def __init__(self, max_entries: int = LLM_RESPONSE_CACHE_MAX_ENTRIES):
+        self._cache: LRUCache[str, Any] = LRUCache(max_entries)
+
+    async def get(self, key: str) -> Any | None:
+        return self._cache.get(key)
+
+    async def set(self, key: str, value: Any, ttl_seconds: float) -> None:
+        self._cache.put(key, value, ttl_seconds)
+
+    def stats(self) -> dict[str, Any]:
+        return {"backend": "memory", **self._cache.stats()}
+
+
+class SQLiteResponseCache(ResponseCacheBackend):
+    """
+    On-disk cache shared by every process on the host. Expired rows are
+    ignored on read and purged on write; beyond max_entries the least
+    recently read rows are evicted. Queries run in a worker thread.
+    """
+
+    def __init__(
+        self,
+        path: str = LLM_RESPONSE_CACHE_PATH,
+        max_entries: int = LLM_RESPONSE_CACHE_MAX_ENTRIES,
+    ):
+        self._max_entries = max_entries
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS llm_responses ("
+            "key TEXT PRIMARY KEY, value TEXT NOT NULL, "
+            "expires_at REAL NOT NULL, accessed_at REAL NOT NULL)"
+        )
+        self._connection.commit()
+        self.hits = 0
+        self.misses = 0
+
+    async def get(self, key: str) -> Any | None:
+        value = await asyncio.to_thread(self._get, key)
+        if value is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return json.loads(value)
+
+    async def set(self, key: str, value: Any, ttl_seconds: float) -> None:
+        await asyncio.to_thread(self._set, key, json.dumps(value), ttl_seconds)
+
+    def _get(self, key: str) -> str | None:
+        now = time.time()
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT value FROM llm_responses WHERE key = ? AND expires_at > ?",
+                (key, now),
+            ).fetchone()
+            if row is None:
+                return None
+            self._connection.execute(
+                "UPDATE llm_responses SET accessed_at = ? WHERE key = ?", (now, key)
+            )
+            self._connection.commit()
+        value: str = row[0]
+        return value
+
+    def _set(self, key: str, value: str, ttl_seconds: float) -> None:
+        now = time.time()
+        with self._lock:
+            self._connection.execute(
+                "INSERT OR REPLACE INTO llm_responses VALUES (?, ?, ?, ?)",
+                (key, value, now + ttl_seconds, now),
+            )
+            self._connection.execute(
+                "DELETE FROM llm_responses WHERE expires_at <= ?", (now,)
+            )
+            self._connection.execute(
+                "DELETE FROM llm_responses WHERE key IN ("
+                "SELECT key FROM llm_responses ORDER BY accessed_at DESC "
+                "LIMIT -1 OFFSET ?)",
+                (self._max_entries,),
+            )
+            self._connection.commit()
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            (size,) = self._connection.execute(
+                "SELECT COUNT(*) FROM llm_responses"
+            ).fetchone()
+        lookups = self.hits + self.misses
+        return {
+            "backend": "sqlite",
+            "size": size,
+            "max_size": self._max_entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
+
+
+def create_response_cache_backend(
+    backend: str = LLM_RESPONSE_CACHE_BACKEND,
+) -> ResponseCacheBackend:
+    if backend == "memory":
+        return InMemoryResponseCache()
+    if backend == "sqlite":
+        return SQLiteResponseCache()
+    raise ValueError(f"Unknown LLM response cache backend {backend}")
+
+
+class LLMResponseCache:
+    """
+    Content-addressed cache of structured agent responses, keyed by model,
+    formatted messages, tool set and output schema. Agents opt in through
+    "response_cache" in their config; hit rates are tracked per agent.
+    """
+
+    def __init__(self, backend: ResponseCacheBackend | None = None):
+        self._backend = backend or create_response_cache_backend()
+        self._agent_stats: dict[str, dict[str, int]] = {}
+
+    @staticmethod
+    def make_key(
+        model: str,
+        messages: list[BaseMessage],
+        tool_names: list[str],
+        output_schema: str,
+        tools_fingerprint: str,
+    ) -> str:
+        return stable_hash(
+            {
+                "model": model,
+                "messages": [(message.type, message.content) for message in messages],
+                "tools": sorted(tool_names),
+                "tools_fingerprint": tools_fingerprint,
+                "output_schema": output_schema,
+            }
+        )
+
+    async def get(self, agent_id: str, key: str) -> Any | None:
+        value = await self._backend.get(key)
+        agent_stats = self._agent_stats.setdefault(agent_id, {"hits": 0, "misses": 0})
+        agent_stats["hits" if value is not None else "misses"] += 1
+        return value
+
+    async def set(self, key: str, value: Any, ttl_seconds: float) -> None:
+        await self._backend.set(key, value, ttl_seconds)
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            **self._backend.stats(),
+            "agents": {
+                agent_id: {
+                    **counts,
+                    "hit_rate": counts["hits"] / (counts["hits"] + counts["misses"]),
+                }
+                for agent_id, counts in self._agent_stats.items()
+            },
+        }
@@ -1,5 +1,9 @@
 from typing import List, Literal, NotRequired, TypedDict
 
+# How an agent runs: a ReAct loop over its tools and sub-agents, or a single
+# structured-output model call for agents with neither
+AgentPath = Literal["react", "direct"]
+
 
 # Dependency specifies a key, default value, and override flag
 class Dependency(TypedDict):
@@ -12,6 +16,11 @@ class Dependency(TypedDict):
 Prompt = List[tuple[Literal["system", "user"], str]]
 
 
+# Opting an agent into the response cache; only for deterministic agents
+class ResponseCacheConfig(TypedDict):
+    ttl_seconds: NotRequired[float]
+
+
 # Agent definition includes various configurations
 class Agent(TypedDict):
     id: str
@@ -22,3 +31,5 @@ class Agent(TypedDict):
     sub_agents: List[str]
     dependencies: List[Dependency]
     output_schema: str  # JSON schema as a string
+    version: NotRequired[str]
+    response_cache: NotRequired[ResponseCacheConfig]
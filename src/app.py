@@ -1,53 +1,77 @@
-import asyncio
 import json
 import traceback
 from http import HTTPStatus
 from typing import Any
 
-import nest_asyncio
-from dotenv import load_dotenv
-from langsmith import Client as LangSmithClient
-from starlette.routing import Request
-
-from src.data.secrets_manager import SecretsManager
-from src.sequence.sequence_runner import SequenceRunner
 from src.types import SequenceRunnerPayload, SequenceRunnerResponse
 
+# Only light modules are imported here: the LangChain, LangGraph, MCP, boto3
+# and LangSmith stacks load with the runtime on the first invocation, see
+# benchmarks/import_profile.py and tests/test_import_budget.py
+
+
+async def async_lambda_handler(
+    event: dict[str, Any], _context: Any
+) -> SequenceRunnerResponse:
+    from src.runtime.runtime_context import get_runtime_context
+    from src.sequence.sequence_runner import SequenceRunner
 
-async def async_lambda_handler(event: Request, _context: Any) -> SequenceRunnerResponse:
-    load_dotenv()
-    secretsManager = SecretsManager()
-    secretsManager.update_env_with_secrets()
+    runtime = get_runtime_context()
+    setup_timing = runtime.prepare_invocation(load_secrets=False)
+    print(json.dumps({"event": "runtime_setup", **setup_timing}))
     payload: SequenceRunnerPayload = json.loads(event.get("body"))
 
     sequence_id = payload["sequence_id"]
     client_id = payload["client_id"]
     product_id = payload["product_id"]
     initial_state = payload.get("initial_state")
+    run_id = payload.get("run_id")
 
-    langsmith_client = LangSmithClient()
+    sequence_runner = SequenceRunner(
+        sequence_id,
+        client_id,
+        product_id,
+        initial_state,
+        runtime=runtime,
+        run_id=run_id,
+    )
     try:
-        sequence_runner = SequenceRunner(
-            sequence_id, client_id, product_id, initial_state
-        )
-        await sequence_runner.load_configurations()
+        startup_report = await sequence_runner.startup(load_secrets=True)
+        print(json.dumps({"event": "startup", **startup_report}))
         final_graph_state = await sequence_runner.run_sequence_async()
+        if sequence_runner.resumed_steps:
+            print(
+                json.dumps(
+                    {
+                        "event": "run_resumed",
+                        "run_id": run_id,
+                        "resumed_steps": sequence_runner.resumed_steps,
+                    }
+                )
+            )
+        body: dict[str, Any] = final_graph_state
+        if payload.get("include_metrics"):
+            body = {"state": final_graph_state, "metrics": sequence_runner.run_summary}
         response: SequenceRunnerResponse = {
             "statusCode": HTTPStatus.OK,
-            "body": json.dumps(final_graph_state),
+            "body": json.dumps(body),
         }
     except Exception as e:
         print(traceback.format_exc())
+        body = {"message": str(e)}
+        if payload.get("include_metrics") and sequence_runner.run_summary:
+            body["metrics"] = sequence_runner.run_summary
         response = {
             "statusCode": HTTPStatus.INTERNAL_SERVER_ERROR,
-            "body": json.dumps({"message": str(e)}),
+            "body": json.dumps(body),
         }
-    langsmith_client.flush()
+    runtime.flush_tracing()
 
     return response
 
 
-def lambda_handler(event: Request, _context: Any) -> SequenceRunnerResponse:
-    nest_asyncio.apply()
+def lambda_handler(event: dict[str, Any], _context: Any) -> SequenceRunnerResponse:
+    from src.runtime.loop_thread import get_loop_thread
 
-    return asyncio.run(async_lambda_handler(event, _context))
+    # One loop per container, so pooled MCP sessions outlive a single invocation
+    return get_loop_thread().run(async_lambda_handler(event, _context))
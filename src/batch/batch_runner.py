@@ -0,0 +1,195 @@
+import asyncio
+import json
+import math
+import time
+from typing import Any, AsyncIterator, Iterable, Iterator, cast
+
+from src.batch.constants import BATCH_CONCURRENCY, LATENCY_PERCENTILES
+from src.batch.types import BatchItemResult, BatchSummary
+from src.runtime.runtime_context import RuntimeContext
+from src.sequence.sequence_config_loader import SequenceConfigLoader
+from src.sequence.sequence_runner import SequenceRunner
+from src.types import SequenceRunnerPayload
+
+
+def percentile(values: list[float], q: float) -> float:
+    """
+    Nearest-rank percentile, q in [0, 100].
+    """
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(math.ceil(q / 100 * len(ordered)), 1)
+    return ordered[rank - 1]
+
+
+class PayloadError(ValueError):
+    """
+    A batch item that could not be read as a payload.
+    """
+
+
+def _parse_record(record: Any) -> SequenceRunnerPayload | PayloadError:
+    try:
+        if isinstance(record, str):
+            record = json.loads(record)
+        if isinstance(record, dict) and isinstance(record.get("body"), str):
+            record = json.loads(record["body"])
+    except json.JSONDecodeError as e:
+        return PayloadError(f"Invalid JSON: {e}")
+    if not isinstance(record, dict):
+        return PayloadError(f"Payload must be an object, not {type(record).__name__}")
+    # Keys are not validated here: a payload missing keys fails its own item
+    # when it runs
+    return cast(SequenceRunnerPayload, record)
+
+
+def load_payloads(path: str) -> Iterator[SequenceRunnerPayload | PayloadError]:
+    """
+    Reads payloads from a JSONL file, or from a file holding one JSON list.
+    Lambda events ({"body": "<payload json>"}) are unwrapped, so recorded
+    events can be replayed as they are. An item that is not a payload is
+    yielded as a PayloadError, which fails that item only.
+    """
+    with open(path) as f:
+        first = f.read(1)
+        while first.isspace():
+            first = f.read(1)
+        f.seek(0)
+
+        records: Iterable[Any] = (
+            json.load(f) if first == "[" else (line for line in f if line.strip())
+        )
+        for record in records:
+            yield _parse_record(record)
+
+
+class BatchRunner:
+    """
+    Runs many payloads with bounded concurrency. Every run in the batch shares
+    one runtime context: one MCP session pool, one set of cached model clients
+    and agents, and one snapshot of the configuration.
+    """
+
+    def __init__(
+        self,
+        concurrency: int = BATCH_CONCURRENCY,
+        runtime: RuntimeContext | None = None,
+    ):
+        if concurrency < 1:
+            raise ValueError("Batch concurrency must be at least 1")
+        self.concurrency = concurrency
+        # Runs share the pool's multiplexed MCP servers, MCP_POOL_SIZE of
+        # them, however many are in flight
+        self.runtime = runtime or RuntimeContext(
+            config_loader=SequenceConfigLoader().snapshot()
+        )
+        self._latencies_ms: list[float] = []
+        self._failed = 0
+        self._wall_seconds = 0.0
+
+    async def run(
+        self, payloads: Iterable[SequenceRunnerPayload | PayloadError]
+    ) -> AsyncIterator[BatchItemResult]:
+        """
+        Yields one result per payload, in completion order. A failing payload
+        produces an error result instead of failing the batch, while an error
+        reading the payloads is raised once the runs in flight are done.
+        """
+        started = time.perf_counter()
+        pending = iter(enumerate(payloads))
+        results: asyncio.Queue[BatchItemResult | None] = asyncio.Queue()
+
+        async def worker() -> None:
+            try:
+                for index, payload in pending:
+                    await results.put(await self._run_one(index, payload))
+            finally:
+                # Also when reading the payloads failed, or the consumer
+                # would wait for this worker forever
+                results.put_nowait(None)
+
+        workers = [asyncio.create_task(worker()) for _ in range(self.concurrency)]
+        try:
+            finished_workers = 0
+            while finished_workers < len(workers):
+                result = await results.get()
+                if result is None:
+                    finished_workers += 1
+                    continue
+                yield result
+            for task in workers:
+                # Raises the error of a worker that stopped early
+                await task
+        finally:
+            for task in workers:
+                task.cancel()
+            await asyncio.gather(*workers, return_exceptions=True)
+            self._wall_seconds += time.perf_counter() - started
+
+    async def _run_one(
+        self, index: int, payload: SequenceRunnerPayload | PayloadError
+    ) -> BatchItemResult:
+        started = time.perf_counter()
+        try:
+            if isinstance(payload, PayloadError):
+                raise payload
+            sequence_runner = SequenceRunner(
+                payload["sequence_id"],
+                payload["client_id"],
+                payload["product_id"],
+                payload.get("initial_state"),
+                runtime=self.runtime,
+                run_id=payload.get("run_id"),
+            )
+            await sequence_runner.load_configurations()
+            final_state = await sequence_runner.run_sequence_async()
+        except Exception as e:
+            self._failed += 1
+            return {
+                "index": index,
+                "sequence_id": str(
+                    None
+                    if isinstance(payload, PayloadError)
+                    else payload.get("sequence_id")
+                ),
+                "status": "error",
+                "latency_ms": self._record_latency(started),
+                "error": f"{type(e).__name__}: {e}",
+            }
+
+        result: BatchItemResult = {
+            "index": index,
+            "sequence_id": payload["sequence_id"],
+            "status": "ok",
+            "latency_ms": self._record_latency(started),
+            "final_state": final_state,
+        }
+        if payload.get("include_metrics") and sequence_runner.run_summary:
+            result["metrics"] = sequence_runner.run_summary
+        return result
+
+    def _record_latency(self, started: float) -> float:
+        latency_ms = round((time.perf_counter() - started) * 1000, 3)
+        self._latencies_ms.append(latency_ms)
+        return latency_ms
+
+    def summary(self) -> BatchSummary:
+        total = len(self._latencies_ms)
+        return {
+            "total": total,
+            "succeeded": total - self._failed,
+            "failed": self._failed,
+            "concurrency": self.concurrency,
+            "wall_seconds": round(self._wall_seconds, 3),
+            "runs_per_second": (
+                round(total / self._wall_seconds, 3) if self._wall_seconds else 0.0
+            ),
+            "latency_ms": {
+                f"p{q}": percentile(self._latencies_ms, q) for q in LATENCY_PERCENTILES
+            },
+            "caches": self.runtime.cache_stats(),
+        }
+
+    async def close(self) -> None:
+        await self.runtime.mcp_pool.close()
@@ -0,0 +1,6 @@
+import os
+
+# Sequence runs in flight at once during a batch
+BATCH_CONCURRENCY = int(os.getenv("BATCH_CONCURRENCY", "8"))
+
+LATENCY_PERCENTILES = (50, 90, 95, 99)
@@ -0,0 +1,29 @@
+from typing import Any, Literal, NotRequired, TypedDict
+
+from src.metrics.types import RunSummary
+from src.state.session_state import SessionState
+
+
+# Outcome of one payload in a batch, streamed back as soon as it finishes
+class BatchItemResult(TypedDict):
+    index: int
+    sequence_id: str
+    status: Literal["ok", "error"]
+    latency_ms: float
+    final_state: NotRequired[SessionState]
+    error: NotRequired[str]
+    # Only for payloads with include_metrics
+    metrics: NotRequired[RunSummary]
+
+
+# Throughput and latency distribution of a finished batch
+class BatchSummary(TypedDict):
+    total: int
+    succeeded: int
+    failed: int
+    concurrency: int
+    wall_seconds: float
+    runs_per_second: float
+    latency_ms: dict[str, float]
+    # See RuntimeContext.cache_stats()
+    caches: dict[str, dict[str, Any]]
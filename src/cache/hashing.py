@@ -0,0 +1,11 @@
+import hashlib
+import json
+from typing import Any
+
+
+def stable_hash(value: Any) -> str:
+    """
+    Content hash of a JSON-like value that does not depend on key order.
+    """
+    encoded = json.dumps(value, sort_keys=True, default=str, separators=(",", ":"))
+    return hashlib.sha256(encoded.encode()).hexdigest()
@@ -0,0 +1,8 @@
+import os
+
+# How long fetched secrets are trusted before a warm container re-reads them
+SECRETS_TTL_SECONDS = float(os.getenv("SECRETS_TTL_SECONDS", "900"))
+
+# Import-time budget of src.app, the Lambda handler's module. Heavy stacks load
+# on the first invocation instead, see tests/test_import_budget.py
+APP_IMPORT_BUDGET_MS = float(os.getenv("APP_IMPORT_BUDGET_MS", "250"))
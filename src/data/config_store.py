@@ -0,0 +1,159 @@
+import asyncio
+import json
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from typing import Any, Literal, Mapping, TypedDict
+
+from src.cache.hashing import stable_hash
+from src.data.constants import CONFIG_STORE_BACKEND, CONFIG_STORE_PATH
+
+ConfigKind = Literal["sequence", "client", "agent"]
+
+
+# A stored config with its version, used as an etag for revalidation
+class VersionedConfig(TypedDict):
+    value: Any
+    version: str
+
+
+def config_version(value: Any) -> str:
+    """
+    A config's declared "version", or its content hash when it has none.
+    """
+    version = value.get("version") if isinstance(value, dict) else None
+    if isinstance(version, str):
+        return version
+    return stable_hash(value)
+
+
+class ConfigStore(ABC):
+    """
+    Storage for sequence, client and agent configs. Reading only a version is
+    meant to be cheaper than reading the config itself.
+    """
+
+    @abstractmethod
+    async def get(self, kind: ConfigKind, key: str) -> VersionedConfig | None: ...
+
+    @abstractmethod
+    async def get_version(self, kind: ConfigKind, key: str) -> str | None: ...
+
+    @abstractmethod
+    async def put(self, kind: ConfigKind, key: str, value: Any) -> str: ...
+
+
+class InMemoryConfigStore(ConfigStore):
+    def __init__(
+        self,
+        sequences: Mapping[str, Any] | None = None,
+        client_configs: Mapping[str, Any] | None = None,
+        agents: Mapping[str, Any] | None = None,
+    ):
+        if sequences is None or client_configs is None or agents is None:
+            from src.data.mock_db import AGENTS, CLIENT_CONFIGS, SEQUENCES
+
+            sequences = SEQUENCES if sequences is None else sequences
+            client_configs = (
+                CLIENT_CONFIGS if client_configs is None else client_configs
+            )
+            agents = AGENTS if agents is None else agents
+
+        self._configs: dict[tuple[ConfigKind, str], VersionedConfig] = {}
+        configs_by_kind: tuple[tuple[ConfigKind, Mapping[str, Any]], ...] = (
+            ("sequence", sequences),
+            ("client", client_configs),
+            ("agent", agents),
+        )
+        for kind, configs in configs_by_kind:
+            for key, value in configs.items():
+                self._configs[(kind, key)] = {
+                    "value": value,
+                    "version": config_version(value),
+                }
+
+    async def get(self, kind: ConfigKind, key: str) -> VersionedConfig | None:
+        return self._configs.get((kind, key))
+
+    async def get_version(self, kind: ConfigKind, key: str) -> str | None:
+        config = self._configs.get((kind, key))
+        return None if config is None else config["version"]
+
+    async def put(self, kind: ConfigKind, key: str, value: Any) -> str:
+        version = config_version(value)
+        self._configs[(kind, key)] = {"value": value, "version": version}
+        return version
+
+
+class SQLiteConfigStore(ConfigStore):
+    """
+    Local stand-in for the configuration database, seeded from
+    src.data.mock_db when empty. Queries run in a worker thread.
+    """
+
+    def __init__(self, path: str = CONFIG_STORE_PATH, seed: bool = True):
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS configs ("
+            "kind TEXT NOT NULL, key TEXT NOT NULL, value TEXT NOT NULL, "
+            "version TEXT NOT NULL, updated_at REAL NOT NULL, "
+            "PRIMARY KEY (kind, key))"
+        )
+        self._connection.commit()
+        if (
+            seed
+            and self._connection.execute("SELECT 1 FROM configs").fetchone() is None
+        ):
+            from src.data.mock_db import AGENTS, CLIENT_CONFIGS, SEQUENCES
+
+            for kind, configs in (
+                ("sequence", SEQUENCES),
+                ("client", CLIENT_CONFIGS),
+                ("agent", AGENTS),
+            ):
+                for key, value in configs.items():
+                    self._put(kind, key, value)
+
+    async def get(self, kind: ConfigKind, key: str) -> VersionedConfig | None:
+        row = await asyncio.to_thread(
+            self._query, "SELECT value, version FROM configs", kind, key
+        )
+        if row is None:
+            return None
+        return {"value": json.loads(row[0]), "version": row[1]}
+
+    async def get_version(self, kind: ConfigKind, key: str) -> str | None:
+        row = await asyncio.to_thread(
+            self._query, "SELECT version FROM configs", kind, key
+        )
+        return None if row is None else row[0]
+
+    async def put(self, kind: ConfigKind, key: str, value: Any) -> str:
+        return await asyncio.to_thread(self._put, kind, key, value)
+
+    def _query(self, select: str, kind: str, key: str) -> tuple[str, ...] | None:
+        with self._lock:
+            row: tuple[str, ...] | None = self._connection.execute(
+                f"{select} WHERE kind = ? AND key = ?", (kind, key)
+            ).fetchone()
+        return row
+
+    def _put(self, kind: str, key: str, value: Any) -> str:
+        version = config_version(value)
+        with self._lock:
+            self._connection.execute(
+                "INSERT OR REPLACE INTO configs VALUES (?, ?, ?, ?, ?)",
+                (kind, key, json.dumps(value), version, time.time()),
+            )
+            self._connection.commit()
+        return version
+
+
+def create_config_store(backend: str = CONFIG_STORE_BACKEND) -> ConfigStore:
+    if backend == "memory":
+        return InMemoryConfigStore()
+    if backend == "sqlite":
+        return SQLiteConfigStore()
+    raise ValueError(f"Unknown config store backend {backend}")
@@ -2,7 +2,11 @@ import json
 from typing import Any
 
 from src.agent.types import Agent
-from src.data.constants import SYSTEM_PROMPT_BASE, SYSTEM_PROMPT_JOURNEY_INSTRUCTIONS
+from src.data.constants import (
+    SYSTEM_PROMPT_BASE,
+    SYSTEM_PROMPT_JOURNEY_INSTRUCTIONS,
+    SYSTEM_PROMPT_TONE,
+)
 from src.sequence.types import Sequence
 
 SEQUENCES: dict[str, Sequence] = {
@@ -60,6 +64,8 @@ SEQUENCES: dict[str, Sequence] = {
                 },
             },
         ],
+        # Journey instructions only change with the client's configuration
+        "tool_cache": {"demo-get_journey_instruction": {"ttl_seconds": 300}},
     },
     "agent-as-tool-seq": {
         "id": "agent-as-tool-seq",
@@ -100,6 +106,8 @@ AGENTS: dict[str, Agent] = {
         "dependencies": [
             {"key": "incoming_message", "default_value": None, "override": False}
         ],
+        # Deterministic classifier, identical messages get identical answers
+        "response_cache": {"ttl_seconds": 86400},
         "output_schema": json.dumps(
             {
                 "type": "object",
@@ -118,7 +126,9 @@ AGENTS: dict[str, Agent] = {
         "prompt": [
             (
                 "system",
-                SYSTEM_PROMPT_BASE + SYSTEM_PROMPT_JOURNEY_INSTRUCTIONS,
+                SYSTEM_PROMPT_BASE
+                + SYSTEM_PROMPT_JOURNEY_INSTRUCTIONS
+                + SYSTEM_PROMPT_TONE,
             ),
             ("user", "{incoming_message}"),
         ],
@@ -182,6 +192,7 @@ AGENTS: dict[str, Agent] = {
         ],
         "tools": [],
         "sub_agents": [],
+        "response_cache": {"ttl_seconds": 86400},
         "output_schema": json.dumps(
             {
                 "type": "object",
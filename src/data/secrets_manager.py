@@ -1,16 +1,20 @@
 import json
 import os
-
-import boto3
-from botocore.exceptions import ClientError
+import time
 
 
 class SecretsManager:
-    def __init__(self) -> None:
+    def __init__(self, ttl_seconds: float | None = None) -> None:
         self.secrets: dict[str, str] = {}
+        self._ttl_seconds = ttl_seconds
+        self._loaded_at: float | None = None
         self._import_all_secrets()
 
     def _import_all_secrets(self) -> None:
+        # boto3 is only needed here, keep it off the import path of the handler
+        import boto3
+        from botocore.exceptions import ClientError
+
         secret_name = f"{os.getenv('ENV')}/agent-platform-sequence-runner"
         region_name = os.getenv("AWS_DEFAULT_REGION")
 
@@ -23,10 +27,45 @@ class SecretsManager:
             raise e
 
         secret_values = json.loads(get_secret_value_response["SecretString"])
+        self.secrets.clear()
         self.secrets.update(secret_values)
+        self._loaded_at = time.monotonic()
+
+    def is_stale(self) -> bool:
+        if self._loaded_at is None:
+            return True
+        if self._ttl_seconds is None:
+            return False
+        return time.monotonic() - self._loaded_at >= self._ttl_seconds
+
+    def refresh_if_stale(self) -> bool:
+        """
+        Re-fetches the secrets when the TTL has expired or they were invalidated.
+        Returns True when a fetch happened.
+        """
+        if not self.is_stale():
+            return False
+        self._import_all_secrets()
+        return True
+
+    def invalidate(self) -> None:
+        """
+        Forces the next refresh_if_stale() call to fetch the secrets again,
+        e.g. after a rotation.
+        """
+        self._loaded_at = None
 
-    def update_env_with_secrets(self) -> None:
+    def update_env_with_secrets(self) -> set[str]:
+        """
+        Exports the secrets, returning the names whose value changed.
+        """
+        changed = {
+            name
+            for name, value in self.secrets.items()
+            if os.environ.get(name) != value
+        }
         os.environ.update(self.secrets)
+        return changed
 
     def get_secret(self, secret_name: str) -> str:
         if secret_name not in self.secrets:
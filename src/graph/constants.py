@@ -0,0 +1,21 @@
+import os
+
+# Compiled graphs kept per container, keyed by sequence, client config and tools
+GRAPH_CACHE_MAX_SIZE = int(os.getenv("GRAPH_CACHE_MAX_SIZE", "64"))
+
+# RunnableConfig["configurable"] key carrying the borrowed session's tools by name
+MCP_TOOLS_CONFIG_KEY = "mcp_tools"
+MCP_TOOLS_FINGERPRINT_CONFIG_KEY = "mcp_tools_fingerprint"
+
+# RunnableConfig["configurable"] key carrying the RunCheckpoint of runs with a run_id
+RUN_CHECKPOINT_CONFIG_KEY = "run_checkpoint"
+
+# RunnableConfig["configurable"] key carrying the RunMetrics of the current run
+RUN_METRICS_CONFIG_KEY = "run_metrics"
+
+# RunnableConfig["configurable"] key carrying the RunProgress the routers read
+RUN_PROGRESS_CONFIG_KEY = "run_progress"
+
+# RunnableConfig["configurable"] key carrying the event loop the run executes on,
+# for sync tool entry points to hand their work back to
+RUN_LOOP_CONFIG_KEY = "run_loop"
@@ -1,15 +1,26 @@
 import json
 from json import JSONDecodeError
-from typing import Any, Awaitable, Callable
+from typing import Any, Callable, Hashable
 
+from langchain_core.runnables import RunnableConfig
 from langchain_core.tools import BaseTool
 from langgraph.constants import END, START
 from langgraph.graph import StateGraph
+from langgraph.utils.runnable import RunnableCallable
 
 from src.agent.agent_factory import AgentFactory
-from src.sequence.step_utils import check_skip_conditions, get_step_context_static
-from src.sequence.types import Sequence, StepBase
-from src.state.session_state import SessionState
+from src.graph.constants import (
+    MCP_TOOLS_CONFIG_KEY,
+    RUN_CHECKPOINT_CONFIG_KEY,
+    RUN_METRICS_CONFIG_KEY,
+    RUN_PROGRESS_CONFIG_KEY,
+)
+from src.graph.run_progress import RunProgress
+from src.metrics.run_metrics import RunMetrics, json_size
+from src.sequence.sequence_compiler import CompiledStep, SequencePlan
+from src.sequence.step_utils import get_step_context_static
+from src.state.session_state import SessionState, session_state_schema
+from src.state.step_checkpoints import RunCheckpoint
 from src.tools.tool_invoker import ToolInvoker
 
 
@@ -24,66 +35,109 @@ class GraphBuilder:
         self._agents = agent_factory
         self._client_config = client_config
 
-    def build(self, sequence: Sequence, mcp_tools: list[BaseTool]) -> StateGraph:
-        graph = StateGraph(SessionState)
-        previous = START
+    def build(self, plan: SequencePlan) -> StateGraph:
+        """
+        One node per step, each followed by a conditional edge to the steps
+        it unblocks. Steps whose skip conditions hold are routed around, and
+        a step whose terminate conditions hold routes straight to END.
+        """
+        graph = StateGraph(
+            session_state_schema(plan["sequence"].get("state_reducers", {}))
+        )
+        step_ids = [compiled_step["step"]["id"] for compiled_step in plan["steps"]]
+        destinations = [*step_ids, END]
 
-        for step in sequence["steps"]:
-            node_fn = self._make_node(step, mcp_tools)
-            graph.add_node(step["id"], node_fn)
-            graph.add_edge(previous, step["id"])
-            previous = step["id"]
+        graph.add_conditional_edges(START, self._make_router(None), destinations)
+        for compiled_step, step_id in zip(plan["steps"], step_ids):
+            graph.add_node(step_id, self._make_node(compiled_step))
+            graph.add_conditional_edges(
+                step_id, self._make_router(step_id), destinations
+            )
 
-        graph.add_edge(previous, END)
         return graph
 
-    def _make_node(
-        self, step: StepBase, mcp_tools: list[BaseTool]
-    ) -> Callable[[SessionState], Awaitable[SessionState]]:
-        async def node(state: SessionState) -> SessionState:
-            # Check skip conditions
-            if check_skip_conditions(step, state):
-                return state
-
-            # Tool step
-            if step["type"] == "tool":
-                tool_obj = next((t for t in mcp_tools if t.name == step["id"]), None)
-                if not tool_obj:
-                    raise ValueError(f"Tool {step['id']} not found")
-                ctx = get_step_context_static(
-                    step.get("arguments", {}), state, self._client_config
-                )
-                raw = await self._invoker.invoke(tool_obj, ctx)
-
-                try:
-                    result = json.loads(raw)
-                except (TypeError, JSONDecodeError):
-                    result = raw
-
-            # Agent step
-            elif step["type"] == "agent":
-                agent, msgs = self._agents.create_agent(
-                    step["id"], mcp_tools, state, step.get("arguments", {})
-                )
-                # ToDo: Failed API call handling
-                resp = await agent.ainvoke({"messages": msgs})
-                structured = resp["structured_response"]
-                result = (
-                    structured.dict() if hasattr(structured, "dict") else structured
-                )
-
-            else:
-                raise ValueError(f"Unknown step type: {step['type']}")
-
-            # Write back into state
-            out_key = step.get("output_key")
-            if out_key:
-                state[out_key] = result
-            elif isinstance(result, dict):
-                state.update(result)
-            else:
-                state[f"{step['id']}_result"] = result
-
-            return state
-
-        return node
+    @staticmethod
+    def _make_router(
+        step_id: str | None,
+    ) -> Callable[[SessionState, RunnableConfig], list[Hashable]]:
+        def route(_state: SessionState, config: RunnableConfig) -> list[Hashable]:
+            progress: RunProgress = config["configurable"][RUN_PROGRESS_CONFIG_KEY]
+            return list(progress.next_steps(step_id))
+
+        return route
+
+    def _make_node(self, compiled_step: CompiledStep) -> RunnableCallable:
+        step_id = compiled_step["step"]["id"]
+
+        async def node(state: SessionState, config: RunnableConfig) -> SessionState:
+            configurable = config["configurable"]
+            run_metrics: RunMetrics = configurable[RUN_METRICS_CONFIG_KEY]
+            progress: RunProgress = configurable[RUN_PROGRESS_CONFIG_KEY]
+            checkpoint: RunCheckpoint | None = configurable.get(
+                RUN_CHECKPOINT_CONFIG_KEY
+            )
+
+            with run_metrics.step(compiled_step) as step_metrics:
+                # Steps completed by an earlier attempt of this run replay their output
+                if checkpoint is not None and step_id in checkpoint.completed:
+                    step_metrics["outcome"] = "resumed"
+                    delta: SessionState = checkpoint.completed[step_id]
+                else:
+                    if "policy" in compiled_step:
+                        delta = await compiled_step["policy"].run(
+                            lambda: self._run_step(compiled_step, state, config),
+                            step_metrics,
+                        )
+                    else:
+                        delta = await self._run_step(compiled_step, state, config)
+                    if checkpoint is not None:
+                        await checkpoint.record(step_id, delta)
+                    step_metrics["output_bytes"] = json_size(delta)
+
+                progress.complete(step_id, delta)
+                return delta
+
+        # What add_node would wrap the coroutine in, typed for mypy
+        return RunnableCallable(None, node, name=step_id, trace=False)
+
+    async def _run_step(
+        self, compiled_step: CompiledStep, state: SessionState, config: RunnableConfig
+    ) -> SessionState:
+        step = compiled_step["step"]
+
+        # The graph may be cached, so session-bound tools come with the call
+        tools_by_name: dict[str, BaseTool] = config["configurable"][
+            MCP_TOOLS_CONFIG_KEY
+        ]
+
+        # Tool step, its existence was checked when the plan compiled
+        if step["type"] == "tool":
+            tool_obj = tools_by_name[step["id"]]
+            ctx = get_step_context_static(
+                compiled_step["arguments"], state, self._client_config
+            )
+            raw = await self._invoker.invoke_cached(
+                tool_obj, ctx, compiled_step.get("cache_policy")
+            )
+
+            try:
+                result = json.loads(raw)
+            except (TypeError, JSONDecodeError):
+                result = raw
+
+        # Agent step
+        elif step["type"] == "agent":
+            result = await self._agents.ainvoke_agent(
+                step["id"], state, compiled_step["arguments"], config
+            )
+
+        else:
+            raise ValueError(f"Unknown step type: {step['type']}")
+
+        # Return only what this step writes, the graph merges it into state
+        out_key = step.get("output_key")
+        if out_key:
+            return {out_key: result}
+        elif isinstance(result, dict):
+            return result
+        return {f"{step['id']}_result": result}
@@ -0,0 +1,55 @@
+from typing import Any, Callable, TypedDict
+
+from langgraph.graph.graph import CompiledGraph
+
+from src.agent.types import Agent
+from src.cache.hashing import stable_hash
+from src.cache.lru_cache import LRUCache
+from src.graph.constants import GRAPH_CACHE_MAX_SIZE
+from src.sequence.sequence_compiler import SequencePlan
+from src.sequence.types import Sequence
+
+GraphCacheKey = tuple[str, str, str, str, str]
+
+
+# A validated plan together with the graph compiled from it
+class CompiledSequence(TypedDict):
+    plan: SequencePlan
+    graph: CompiledGraph
+
+
+class CompiledGraphCache:
+    """
+    LRU cache of compiled sequence plans and graphs. Cached graphs must not
+    close over per-request data; the initial state and borrowed MCP tools
+    are passed in at invocation time instead.
+    """
+
+    def __init__(self, max_size: int = GRAPH_CACHE_MAX_SIZE):
+        self._cache: LRUCache[GraphCacheKey, CompiledSequence] = LRUCache(max_size)
+
+    @staticmethod
+    def make_key(
+        sequence: Sequence,
+        client_config: dict[str, Any],
+        agents_config: dict[str, Agent],
+        tools_fingerprint: str,
+    ) -> GraphCacheKey:
+        return (
+            sequence["id"],
+            sequence["version"] if "version" in sequence else stable_hash(sequence),
+            stable_hash(client_config),
+            stable_hash(agents_config),
+            tools_fingerprint,
+        )
+
+    def get_or_build(
+        self, key: GraphCacheKey, build: Callable[[], CompiledSequence]
+    ) -> CompiledSequence:
+        return self._cache.get_or_create(key, build)
+
+    def invalidate(self, key: GraphCacheKey | None = None) -> None:
+        self._cache.invalidate(key)
+
+    def stats(self) -> dict[str, int | float]:
+        return self._cache.stats()
@@ -0,0 +1,86 @@
+from langgraph.constants import END
+
+from src.metrics.run_metrics import RunMetrics
+from src.sequence.sequence_compiler import CompiledStep, SequencePlan
+from src.state.session_state import SessionState, make_state_reducer
+
+
+class RunProgress:
+    """
+    Scheduling state of one run, read by the graph's routers. A step is
+    routed to once all of its dependencies settled, ran or were skipped,
+    unless its skip conditions hold; skipped steps settle without running.
+
+    The progress keeps its own copy of the state, updated as each step
+    finishes, since the graph only applies writes at the end of a superstep
+    and conditions may read what a step of the same superstep wrote.
+    """
+
+    def __init__(
+        self, plan: SequencePlan, initial_state: SessionState, run_metrics: RunMetrics
+    ):
+        self._steps: dict[str, CompiledStep] = {}
+        self._dependents: dict[str, list[str]] = {}
+        self._roots: list[str] = []
+        for compiled_step in plan["steps"]:
+            step_id = compiled_step["step"]["id"]
+            self._steps[step_id] = compiled_step
+            self._dependents[step_id] = []
+            if not compiled_step["depends_on"]:
+                self._roots.append(step_id)
+            for dep in compiled_step["depends_on"]:
+                self._dependents[dep].append(step_id)
+
+        self._reduce = make_state_reducer(plan["sequence"].get("state_reducers", {}))
+        self.state = self._reduce({}, initial_state)
+        self._run_metrics = run_metrics
+        self._routed: set[str] = set()
+        self.settled: set[str] = set()
+        self.skipped: list[str] = []
+        self.terminated_by: str | None = None
+
+    def complete(self, step_id: str, delta: SessionState) -> None:
+        """
+        Settles a step that ran or was resumed, ending the run when its
+        terminate conditions hold on the updated state.
+        """
+        self.state = self._reduce(self.state, delta)
+        self.settled.add(step_id)
+        terminate_when = self._steps[step_id].get("terminate_when")
+        if (
+            self.terminated_by is None
+            and terminate_when is not None
+            and terminate_when.matches(self.state)
+        ):
+            self.terminated_by = step_id
+            self._run_metrics.terminated_by = step_id
+
+    def next_steps(self, step_id: str | None) -> list[str]:
+        """
+        Steps to run after the given one settled, or the first steps when
+        None. Skipped steps settle on the way, so their dependents are
+        considered in the same pass.
+        """
+        if self.terminated_by is not None:
+            return [END]
+
+        ready: list[str] = []
+        pending = list(self._roots if step_id is None else self._dependents[step_id])
+        while pending:
+            candidate = pending.pop(0)
+            compiled_step = self._steps[candidate]
+            if candidate in self._routed or not self.settled.issuperset(
+                compiled_step["depends_on"]
+            ):
+                continue
+            self._routed.add(candidate)
+
+            skip_when = compiled_step.get("skip_when")
+            if skip_when is not None and skip_when.matches(self.state):
+                self.settled.add(candidate)
+                self.skipped.append(candidate)
+                self._run_metrics.skipped(compiled_step)
+                pending.extend(self._dependents[candidate])
+            else:
+                ready.append(candidate)
+        return ready
@@ -0,0 +1,7 @@
+import os
+
+# Comma-separated sinks receiving step and run metrics: memory, log, prometheus
+METRICS_SINKS = os.getenv("METRICS_SINKS", "log")
+
+# Most recent step and run records kept by the in-memory sink
+METRICS_MEMORY_MAX_RECORDS = int(os.getenv("METRICS_MEMORY_MAX_RECORDS", "10000"))
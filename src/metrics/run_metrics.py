@@ -0,0 +1,187 @@
+import json
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Iterator
+
+from langchain_core.callbacks import UsageMetadataCallbackHandler
+from langchain_core.tracers.context import register_configure_hook
+
+from src.agent.types import AgentPath
+from src.metrics.sinks import MetricsSink
+from src.metrics.types import RunSummary, StepMetrics
+from src.sequence.sequence_compiler import CompiledStep
+
+# Metrics of the step running in the current task, for tool calls to report to
+_current_step: ContextVar[StepMetrics | None] = ContextVar(
+    "current_step_metrics", default=None
+)
+
+# Token usage of the step running in the current task. Registered once, as
+# LangChain never unregisters configure hooks and walks them all on every
+# callback setup
+_step_usage: ContextVar[UsageMetadataCallbackHandler | None] = ContextVar(
+    "step_usage_callback", default=None
+)
+register_configure_hook(_step_usage, inheritable=True)
+
+
+def record_tool_call(elapsed_seconds: float) -> None:
+    """
+    Adds a tool round trip to the running step, also when an agent's tool
+    made the call. Calls made outside of a step are not recorded.
+    """
+    metrics = _current_step.get()
+    if metrics is not None:
+        metrics["tool_calls"] += 1
+        metrics["tool_ms"] += round(elapsed_seconds * 1000, 3)
+
+
+def record_llm_call(queue_wait_seconds: float) -> None:
+    """
+    Adds a model call to the running step, with how long it waited for the
+    shared LLM limiter to let it through.
+    """
+    metrics = _current_step.get()
+    if metrics is not None:
+        metrics["llm_calls"] += 1
+        metrics["llm_queue_wait_ms"] += round(queue_wait_seconds * 1000, 3)
+
+
+def record_agent_path(path: AgentPath) -> None:
+    """
+    Records how the running step's agent ran, sub-agents are not recorded.
+    """
+    metrics = _current_step.get()
+    if metrics is not None:
+        metrics["agent_path"] = path
+
+
+def json_size(value: Any) -> int:
+    return len(json.dumps(value, default=str).encode())
+
+
+class RunMetrics:
+    """
+    Collects the metrics of one run's steps and forwards them to the sinks,
+    handed to the graph nodes through the config.
+    """
+
+    def __init__(self, sequence_id: str, run_id: str | None, sinks: list[MetricsSink]):
+        self.sequence_id = sequence_id
+        self.run_id = run_id
+        self.steps: list[StepMetrics] = []
+        self._sinks = sinks
+        self._started = time.perf_counter()
+        self._completed_at: dict[str, float] = {}
+        self.terminated_by: str | None = None
+
+    @contextmanager
+    def step(self, compiled_step: CompiledStep) -> Iterator[StepMetrics]:
+        """
+        Measures the step run inside the block. The caller sets the outcome
+        of steps that do not execute, and the size of what the step wrote.
+        """
+        step = compiled_step["step"]
+        started = time.perf_counter()
+        metrics = self._new_step_metrics(compiled_step, started)
+
+        usage = UsageMetadataCallbackHandler()
+        token = _current_step.set(metrics)
+        usage_token = _step_usage.set(usage)
+        try:
+            yield metrics
+        except BaseException:
+            metrics["outcome"] = "failed"
+            raise
+        finally:
+            _step_usage.reset(usage_token)
+            _current_step.reset(token)
+            for model_usage in usage.usage_metadata.values():
+                metrics["prompt_tokens"] += model_usage["input_tokens"]
+                metrics["completion_tokens"] += model_usage["output_tokens"]
+                metrics["cached_tokens"] += model_usage.get(
+                    "input_token_details", {}
+                ).get("cache_read", 0)
+            finished = time.perf_counter()
+            self._completed_at[step["id"]] = finished
+            metrics["wall_ms"] = round((finished - started) * 1000, 3)
+            self._record(metrics)
+
+    def skipped(self, compiled_step: CompiledStep) -> None:
+        """
+        Records a step the graph routed around, so it has no cost.
+        """
+        now = time.perf_counter()
+        metrics = self._new_step_metrics(compiled_step, now)
+        metrics["outcome"] = "skipped"
+        self._completed_at[compiled_step["step"]["id"]] = now
+        self._record(metrics)
+
+    def _new_step_metrics(
+        self, compiled_step: CompiledStep, started: float
+    ) -> StepMetrics:
+        step = compiled_step["step"]
+        ready = max(
+            (
+                self._completed_at.get(dep, self._started)
+                for dep in compiled_step["depends_on"]
+            ),
+            default=self._started,
+        )
+        metrics: StepMetrics = {
+            "sequence_id": self.sequence_id,
+            "step": step["id"],
+            "step_type": step["type"],
+            "outcome": "executed",
+            "wall_ms": 0.0,
+            "queue_wait_ms": round(max(started - ready, 0.0) * 1000, 3),
+            "prompt_tokens": 0,
+            "completion_tokens": 0,
+            "cached_tokens": 0,
+            "llm_calls": 0,
+            "llm_queue_wait_ms": 0.0,
+            "tool_calls": 0,
+            "tool_ms": 0.0,
+            "output_bytes": 0,
+            "retries": 0,
+            "timeouts": 0,
+            "hedges": 0,
+            "hedges_won": 0,
+        }
+        if self.run_id is not None:
+            metrics["run_id"] = self.run_id
+        return metrics
+
+    def _record(self, metrics: StepMetrics) -> None:
+        self.steps.append(metrics)
+        for sink in self._sinks:
+            sink.record_step(metrics)
+
+    def finish(self) -> RunSummary:
+        summary: RunSummary = {
+            "sequence_id": self.sequence_id,
+            "status": (
+                "error"
+                if any(step["outcome"] == "failed" for step in self.steps)
+                else "ok"
+            ),
+            "wall_ms": round((time.perf_counter() - self._started) * 1000, 3),
+            "prompt_tokens": sum(step["prompt_tokens"] for step in self.steps),
+            "completion_tokens": sum(step["completion_tokens"] for step in self.steps),
+            "cached_tokens": sum(step["cached_tokens"] for step in self.steps),
+            "llm_calls": sum(step["llm_calls"] for step in self.steps),
+            "llm_queue_wait_ms": round(
+                sum(step["llm_queue_wait_ms"] for step in self.steps), 3
+            ),
+            "tool_calls": sum(step["tool_calls"] for step in self.steps),
+            "tool_ms": round(sum(step["tool_ms"] for step in self.steps), 3),
+            "steps": self.steps,
+        }
+        if self.run_id is not None:
+            summary["run_id"] = self.run_id
+        if self.terminated_by is not None:
+            summary["terminated_by"] = self.terminated_by
+        for sink in self._sinks:
+            sink.record_run(summary)
+        return summary
@@ -0,0 +1,154 @@
+import json
+import sys
+from abc import ABC, abstractmethod
+from collections import defaultdict, deque
+from typing import TextIO
+
+from src.metrics.constants import METRICS_MEMORY_MAX_RECORDS, METRICS_SINKS
+from src.metrics.types import RunSummary, StepMetrics
+
+
+class MetricsSink(ABC):
+    """
+    Receives every step's metrics as the step completes, and each run's
+    summary once the run ends.
+    """
+
+    @abstractmethod
+    def record_step(self, metrics: StepMetrics) -> None: ...
+
+    @abstractmethod
+    def record_run(self, summary: RunSummary) -> None: ...
+
+
+class InMemoryMetricsSink(MetricsSink):
+    def __init__(self, max_records: int = METRICS_MEMORY_MAX_RECORDS):
+        self.steps: deque[StepMetrics] = deque(maxlen=max_records)
+        self.runs: deque[RunSummary] = deque(maxlen=max_records)
+
+    def record_step(self, metrics: StepMetrics) -> None:
+        self.steps.append(metrics)
+
+    def record_run(self, summary: RunSummary) -> None:
+        self.runs.append(summary)
+
+
+class JSONLogMetricsSink(MetricsSink):
+    """
+    One JSON line per step and per run. Written to stderr by default, so it
+    never mixes with results written to stdout.
+    """
+
+    def __init__(self, stream: TextIO | None = None):
+        self._stream = stream
+
+    def record_step(self, metrics: StepMetrics) -> None:
+        self._write({"event": "step_metrics", **metrics})
+
+    def record_run(self, summary: RunSummary) -> None:
+        # Steps were already logged one by one
+        totals = {key: value for key, value in summary.items() if key != "steps"}
+        self._write({"event": "run_metrics", **totals})
+
+    def _write(self, record: dict) -> None:
+        print(json.dumps(record), file=self._stream or sys.stderr, flush=True)
+
+
+class PrometheusMetricsSink(MetricsSink):
+    """
+    Aggregates metrics into counters rendered in the Prometheus text
+    exposition format, for a scrape endpoint to serve.
+    """
+
+    def __init__(self) -> None:
+        # metric name -> labels -> value
+        self._counters: dict[str, dict[tuple[tuple[str, str], ...], float]] = (
+            defaultdict(lambda: defaultdict(float))
+        )
+
+    def record_step(self, metrics: StepMetrics) -> None:
+        labels = (("sequence", metrics["sequence_id"]), ("step", metrics["step"]))
+        self._add(
+            "sequence_step_runs_total", labels + (("outcome", metrics["outcome"]),)
+        )
+        self._add("sequence_step_wall_seconds_sum", labels, metrics["wall_ms"] / 1000)
+        self._add("sequence_step_wall_seconds_count", labels)
+        if "agent_path" in metrics:
+            self._add(
+                "sequence_step_agent_runs_total",
+                labels + (("path", metrics["agent_path"]),),
+            )
+        self._add(
+            "sequence_step_queue_wait_seconds_sum",
+            labels,
+            metrics["queue_wait_ms"] / 1000,
+        )
+        self._add("sequence_step_queue_wait_seconds_count", labels)
+        for kind in ("prompt", "completion", "cached"):
+            self._add(
+                "sequence_step_tokens_total",
+                labels + (("kind", kind),),
+                metrics[f"{kind}_tokens"],  # type: ignore[literal-required]
+            )
+        self._add("sequence_step_llm_calls_total", labels, metrics["llm_calls"])
+        self._add(
+            "sequence_step_llm_queue_wait_seconds_sum",
+            labels,
+            metrics["llm_queue_wait_ms"] / 1000,
+        )
+        self._add("sequence_step_tool_calls_total", labels, metrics["tool_calls"])
+        self._add("sequence_step_tool_seconds_sum", labels, metrics["tool_ms"] / 1000)
+        self._add("sequence_step_output_bytes_total", labels, metrics["output_bytes"])
+        for event in ("retries", "timeouts", "hedges", "hedges_won"):
+            self._add(
+                "sequence_step_policy_events_total",
+                labels + (("event", event),),
+                metrics[event],  # type: ignore[literal-required]
+            )
+
+    def record_run(self, summary: RunSummary) -> None:
+        labels = (("sequence", summary["sequence_id"]),)
+        self._add("sequence_runs_total", labels + (("status", summary["status"]),))
+        self._add("sequence_run_wall_seconds_sum", labels, summary["wall_ms"] / 1000)
+        self._add("sequence_run_wall_seconds_count", labels)
+
+    def render(self) -> str:
+        # Summaries are exposed as <family>_sum and <family>_count samples
+        families: dict[str, list[str]] = defaultdict(list)
+        for name in sorted(self._counters):
+            families[name.removesuffix("_sum").removesuffix("_count")].append(name)
+
+        lines: list[str] = []
+        for family, names in sorted(families.items()):
+            kind = "counter" if names == [family] else "summary"
+            lines.append(f"# TYPE {family} {kind}")
+            for name in names:
+                for labels, value in sorted(self._counters[name].items()):
+                    rendered = ",".join(
+                        f'{key}="{self._escape(label)}"' for key, label in labels
+                    )
+                    lines.append(f"{name}{{{rendered}}} {value:g}")
+        return "\n".join(lines) + "\n"
+
+    def _add(
+        self, name: str, labels: tuple[tuple[str, str], ...], value: float = 1
+    ) -> None:
+        self._counters[name][labels] += value
+
+    @staticmethod
+    def _escape(label: str) -> str:
+        return label.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def create_metrics_sinks(names: str = METRICS_SINKS) -> list[MetricsSink]:
+    sinks: list[MetricsSink] = []
+    for name in filter(None, (name.strip() for name in names.split(","))):
+        if name == "memory":
+            sinks.append(InMemoryMetricsSink())
+        elif name == "log":
+            sinks.append(JSONLogMetricsSink())
+        elif name == "prometheus":
+            sinks.append(PrometheusMetricsSink())
+        else:
+            raise ValueError(f"Unknown metrics sink {name}")
+    return sinks
@@ -0,0 +1,54 @@
+from typing import Literal, NotRequired, TypedDict
+
+from src.agent.types import AgentPath
+
+# "resumed" steps replayed a checkpoint of an earlier attempt of the run,
+# "skipped" steps were routed around and never ran
+StepOutcome = Literal["executed", "skipped", "resumed", "failed"]
+
+
+# What one step cost: time, tokens, tool round trips and state written
+class StepMetrics(TypedDict):
+    sequence_id: str
+    run_id: NotRequired[str]
+    step: str
+    step_type: str
+    outcome: StepOutcome
+    # Agent steps only, set when the agent ran rather than being resumed
+    agent_path: NotRequired[AgentPath]
+    wall_ms: float
+    # Time between the step's dependencies completing and the step starting
+    queue_wait_ms: float
+    prompt_tokens: int
+    completion_tokens: int
+    cached_tokens: int
+    llm_calls: int
+    # Time model calls waited for the shared LLM limiter
+    llm_queue_wait_ms: float
+    tool_calls: int
+    tool_ms: float
+    output_bytes: int
+    # Outcomes of the step's policy: retried attempts, attempts cut by the
+    # timeout, duplicates fired by hedging and those answering first
+    retries: int
+    timeouts: int
+    hedges: int
+    hedges_won: int
+
+
+# Per-run totals over every step, attached to responses on request
+class RunSummary(TypedDict):
+    sequence_id: str
+    run_id: NotRequired[str]
+    status: Literal["ok", "error"]
+    wall_ms: float
+    prompt_tokens: int
+    completion_tokens: int
+    cached_tokens: int
+    llm_calls: int
+    llm_queue_wait_ms: float
+    tool_calls: int
+    tool_ms: float
+    # Step whose terminate_conditions ended the run early
+    terminated_by: NotRequired[str]
+    steps: list[StepMetrics]
@@ -0,0 +1,55 @@
+import asyncio
+import threading
+from concurrent.futures import Future
+from typing import Any, Coroutine, TypeVar
+
+T = TypeVar("T")
+
+
+class LoopThread:
+    """
+    An event loop running forever in a daemon thread, for sync code to run
+    coroutines on. The loop outlives each call, so resources bound to it,
+    like pooled MCP sessions, are reused by later calls.
+    """
+
+    def __init__(self, name: str = "event-loop") -> None:
+        self.loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(
+            target=self.loop.run_forever, name=name, daemon=True
+        )
+        self._thread.start()
+
+    def run(self, coroutine: Coroutine[Any, Any, T]) -> T:
+        return run_on_loop(self.loop, coroutine)
+
+
+def run_on_loop(
+    loop: asyncio.AbstractEventLoop, coroutine: Coroutine[Any, Any, T]
+) -> T:
+    """
+    Runs a coroutine on a loop running in another thread and waits for its
+    result. Waiting from a thread running an event loop would stall it, so
+    that raises instead of nesting loops.
+    """
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        future: Future[T] = asyncio.run_coroutine_threadsafe(coroutine, loop)
+        return future.result()
+    coroutine.close()
+    raise RuntimeError(
+        "Blocking call from a running event loop, use the async API instead"
+    )
+
+
+_loop_thread: LoopThread | None = None
+_loop_thread_lock = threading.Lock()
+
+
+def get_loop_thread() -> LoopThread:
+    global _loop_thread
+    with _loop_thread_lock:
+        if _loop_thread is None:
+            _loop_thread = LoopThread()
+    return _loop_thread
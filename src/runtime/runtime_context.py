@@ -0,0 +1,177 @@
+import asyncio
+import time
+from typing import TYPE_CHECKING, Any, Callable
+
+from langchain_core.language_models import BaseChatModel
+from mcp import StdioServerParameters
+
+from src.agent.agent_cache import AgentCache, default_model_factory
+from src.agent.llm_limiter import LLMLimiter
+from src.agent.response_cache import LLMResponseCache
+from src.constants import SECRETS_TTL_SECONDS
+from src.data.secrets_manager import SecretsManager
+from src.graph.graph_cache import CompiledGraphCache
+from src.metrics.sinks import MetricsSink, create_metrics_sinks
+from src.sequence.sequence_config_loader import SequenceConfigLoader
+from src.state.step_checkpoints import (
+    StepCheckpointStore,
+    create_step_checkpoint_store,
+)
+from src.tools.constants import MCP_POOL_SIZE, get_server_parameters
+from src.tools.mcp_session_pool import MCPSessionPool
+from src.tools.tool_invoker import ToolInvoker
+from src.tools.tool_result_cache import ToolResultCache
+
+if TYPE_CHECKING:
+    from langsmith import Client as LangSmithClient
+
+
+class RuntimeContext:
+    """
+    Process-level resources shared by every invocation a warm container serves.
+    Created once per container by get_runtime_context().
+    """
+
+    def __init__(
+        self,
+        secrets_ttl_seconds: float | None = SECRETS_TTL_SECONDS,
+        mcp_pool_size: int = MCP_POOL_SIZE,
+        config_loader: SequenceConfigLoader | None = None,
+        checkpoint_store: StepCheckpointStore | None = None,
+        metrics_sinks: list[MetricsSink] | None = None,
+        model_factory: Callable[[str], BaseChatModel] = default_model_factory,
+        mcp_server_parameters: Callable[
+            [], StdioServerParameters
+        ] = get_server_parameters,
+    ):
+        started = time.perf_counter()
+        self.config_loader = config_loader or SequenceConfigLoader()
+        self.mcp_pool = MCPSessionPool(mcp_pool_size, mcp_server_parameters)
+        self.graph_cache = CompiledGraphCache()
+        self.llm_limiter = LLMLimiter()
+        self.agent_cache = AgentCache(
+            model_factory=model_factory, limiter=self.llm_limiter
+        )
+        self.response_cache = LLMResponseCache()
+        self.tool_result_cache = ToolResultCache()
+        self.tool_invoker = ToolInvoker(self.tool_result_cache)
+        self.checkpoint_store = checkpoint_store or create_step_checkpoint_store()
+        self.metrics_sinks = (
+            create_metrics_sinks() if metrics_sinks is None else metrics_sinks
+        )
+        self.invocation_count = 0
+
+        self._secrets_ttl_seconds = secrets_ttl_seconds
+        self._secrets_manager: SecretsManager | None = None
+        self._langsmith_client: "LangSmithClient | None" = None
+        self._init_seconds = time.perf_counter() - started
+
+    @property
+    def langsmith_client(self) -> "LangSmithClient":
+        if self._langsmith_client is None:
+            from langsmith import Client as LangSmithClient
+
+            self._langsmith_client = LangSmithClient()
+        return self._langsmith_client
+
+    def flush_tracing(self) -> None:
+        """
+        Sends pending traces before the container is frozen. Without tracing
+        enabled there is nothing to send, so no client is created.
+        """
+        from langsmith.utils import tracing_is_enabled
+
+        if tracing_is_enabled():
+            self.langsmith_client.flush()
+
+    @property
+    def secrets_manager(self) -> SecretsManager:
+        secrets_manager, changed = self._load_secrets()
+        self._drop_stale_credentials(changed)
+        return secrets_manager
+
+    async def refresh_secrets(self) -> None:
+        """
+        Makes sure secrets are fresh, fetching them in a worker thread since
+        the boto3 client blocks.
+        """
+        _, changed = await asyncio.to_thread(self._load_secrets)
+        # Back on the loop, which the pool belongs to
+        self._drop_stale_credentials(changed)
+
+    def _load_secrets(self) -> tuple[SecretsManager, set[str]]:
+        """
+        Fetches missing or stale secrets into the environment, with the names
+        of the secrets whose value changed.
+        """
+        if self._secrets_manager is None:
+            self._secrets_manager = SecretsManager(self._secrets_ttl_seconds)
+        elif not self._secrets_manager.refresh_if_stale():
+            return self._secrets_manager, set()
+        return self._secrets_manager, self._secrets_manager.update_env_with_secrets()
+
+    def _drop_stale_credentials(self, changed: set[str]) -> None:
+        """
+        Model clients and MCP server processes took their credentials from
+        the environment when they were created, so after a rotation they are
+        replaced rather than left on the old values.
+        """
+        if changed:
+            self.agent_cache.invalidate()
+            self.mcp_pool.recycle()
+
+    def prepare_invocation(self, load_secrets: bool = True) -> dict[str, Any]:
+        """
+        Makes sure secrets are fresh, unless the caller loads them as part of
+        the runner's startup, and returns the setup timing for this invocation
+        with the cache statistics of the invocations before it.
+        """
+        started = time.perf_counter()
+        cold_start = self.invocation_count == 0
+        self.invocation_count += 1
+        if load_secrets:
+            _ = self.secrets_manager
+
+        setup_seconds = time.perf_counter() - started
+        if cold_start:
+            setup_seconds += self._init_seconds
+        return {
+            "cold_start": cold_start,
+            "invocation": self.invocation_count,
+            "setup_ms": round(setup_seconds * 1000, 3),
+            "caches": self.cache_stats(),
+        }
+
+    def cache_stats(self) -> dict[str, dict[str, Any]]:
+        """
+        Hits, misses and sizes of the process-level caches, and the agent
+        setup time their hits saved.
+        """
+        return {
+            "agents": self.agent_cache.stats(),
+            "graphs": self.graph_cache.stats(),
+            "llm_responses": self.response_cache.stats(),
+            "tool_results": self.tool_result_cache.stats(),
+        }
+
+    def invalidate_secrets(self) -> None:
+        if self._secrets_manager is not None:
+            self._secrets_manager.invalidate()
+
+
+_runtime_context: RuntimeContext | None = None
+
+
+def get_runtime_context() -> RuntimeContext:
+    global _runtime_context
+    if _runtime_context is None:
+        _runtime_context = RuntimeContext()
+    return _runtime_context
+
+
+def reset_runtime_context() -> None:
+    """
+    Drops the process-level context so the next invocation rebuilds everything.
+    """
+    global _runtime_context
+    _runtime_context = None
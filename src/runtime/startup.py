@@ -0,0 +1,93 @@
+import asyncio
+import time
+from typing import Awaitable, Callable, Iterable, TypedDict
+
+
+# When a stage ran, in ms since the pipeline started
+class StageTiming(TypedDict):
+    after: list[str]
+    started_ms: float
+    duration_ms: float
+    finished_ms: float
+
+
+class StartupReport(TypedDict):
+    total_ms: float
+    stages: dict[str, StageTiming]
+    # The chain of stages that determined total_ms, first stage first
+    critical_path: list[str]
+
+
+class StartupPipeline:
+    """
+    Named async stages, each started as soon as the stages it runs after are
+    done, so independent stages overlap. A stage can only run after stages
+    added before it, which rules out cycles. The first failing stage cancels
+    the others and its error is raised.
+    """
+
+    def __init__(self) -> None:
+        self._stages: dict[str, tuple[Callable[[], Awaitable[None]], list[str]]] = {}
+
+    def add(
+        self, name: str, run: Callable[[], Awaitable[None]], after: Iterable[str] = ()
+    ) -> None:
+        dependencies = list(after)
+        if name in self._stages:
+            raise ValueError(f"Startup stage {name} is already defined")
+        for dependency in dependencies:
+            if dependency not in self._stages:
+                raise ValueError(
+                    f"Startup stage {name} runs after unknown stage {dependency}"
+                )
+        self._stages[name] = (run, dependencies)
+
+    async def run(self) -> StartupReport:
+        started = time.perf_counter()
+        timings: dict[str, StageTiming] = {}
+        tasks: dict[str, asyncio.Task[None]] = {}
+
+        async def run_stage(
+            name: str, run: Callable[[], Awaitable[None]], after: list[str]
+        ) -> None:
+            for dependency in after:
+                await tasks[dependency]
+            stage_started = time.perf_counter()
+            await run()
+            finished = time.perf_counter()
+            timings[name] = {
+                "after": after,
+                "started_ms": round((stage_started - started) * 1000, 3),
+                "duration_ms": round((finished - stage_started) * 1000, 3),
+                "finished_ms": round((finished - started) * 1000, 3),
+            }
+
+        for name, (run, after) in self._stages.items():
+            tasks[name] = asyncio.create_task(run_stage(name, run, after))
+        try:
+            await asyncio.gather(*tasks.values())
+        finally:
+            for task in tasks.values():
+                task.cancel()
+            # Also retrieves the errors of stages failing after the first one
+            await asyncio.gather(*tasks.values(), return_exceptions=True)
+
+        return {
+            "total_ms": round((time.perf_counter() - started) * 1000, 3),
+            "stages": timings,
+            "critical_path": critical_path(timings),
+        }
+
+
+def critical_path(timings: dict[str, StageTiming]) -> list[str]:
+    """
+    Walks back from the last stage to finish through the dependency each
+    stage waited for the longest, i.e. the one that finished last.
+    """
+    if not timings:
+        return []
+    path = [max(timings, key=lambda name: timings[name]["finished_ms"])]
+    while timings[path[-1]]["after"]:
+        after = timings[path[-1]]["after"]
+        path.append(max(after, key=lambda name: timings[name]["finished_ms"]))
+    return path[::-1]
@@ -0,0 +1,12 @@
+import os
+
+# Error classes retried by step policies without their own retry_on: timeouts,
+# dropped connections, rate limits and provider-side failures
+STEP_RETRY_ON = os.getenv(
+    "STEP_RETRY_ON",
+    "TimeoutError,ConnectionError,APIConnectionError,APITimeoutError,"
+    "RateLimitError,InternalServerError",
+).split(",")
+
+# Latest successful attempts per step kept for hedging delays
+STEP_LATENCY_WINDOW = int(os.getenv("STEP_LATENCY_WINDOW", "200"))
@@ -0,0 +1,340 @@
+from typing import Any, NotRequired, TypedDict
+
+from langchain_core.tools import BaseTool
+
+from src.agent.constants import MAX_SUB_AGENT_DEPTH
+from src.agent.types import Agent
+from src.sequence.step_arguments import (
+    ArgumentError,
+    StepArguments,
+    compile_arguments,
+)
+from src.sequence.step_conditions import ConditionSet
+from src.sequence.step_dependencies import (
+    build_dependency_graph,
+    prompt_variables,
+    root_key,
+    step_reads,
+    step_writes,
+)
+from src.sequence.step_policies import StepRunPolicy, step_policy
+from src.sequence.types import Sequence, StepBase, ToolCachePolicy
+from src.state.session_state import KEY_REDUCERS, SessionState
+
+
+class SequenceValidationError(ValueError):
+    def __init__(self, sequence_id: str, errors: list[str]):
+        self.errors = errors
+        super().__init__(f"Sequence {sequence_id} is invalid: " + "; ".join(errors))
+
+
+# A step with its agent config resolved and its graph edges decided
+class CompiledStep(TypedDict):
+    step: StepBase
+    agent: NotRequired[Agent]
+    reads: set[str]
+    writes: set[str]
+    depends_on: list[str]
+    # Argument expressions, parsed once rather than on every run
+    arguments: StepArguments
+    # Tool steps only, the step's cache policy or the sequence-level one
+    cache_policy: NotRequired[ToolCachePolicy]
+    # Parsed skip_conditions and terminate_conditions, routed on by the graph
+    skip_when: NotRequired[ConditionSet]
+    terminate_when: NotRequired[ConditionSet]
+    # Timeout, retries and hedging of the step, when the sequence or step has any
+    policy: NotRequired[StepRunPolicy]
+
+
+# Validated, state-independent execution plan for one sequence
+class SequencePlan(TypedDict):
+    sequence: Sequence
+    steps: list[CompiledStep]
+    # Every agent reachable from the steps, including nested sub-agents
+    agents: dict[str, Agent]
+    # Keys the initial state has to provide for the plan to run
+    required_inputs: list[str]
+
+
+class SequenceCompiler:
+    """
+    Resolves every step's tool, agent and sub-agent tree up front and checks
+    that all references can be satisfied, so a broken sequence is rejected
+    before any LLM call is paid for.
+    """
+
+    def __init__(self, agents_config: dict[str, Agent], client_config: dict[str, Any]):
+        self._agents_config = agents_config
+        self._client_config = client_config
+
+    def compile(
+        self, sequence: Sequence, tools_by_name: dict[str, BaseTool]
+    ) -> SequencePlan:
+        errors: list[str] = []
+        agents: dict[str, Agent] = {}
+        declared_inputs = sequence.get("inputs")
+        available = {"client_id", *self._client_config, *(declared_inputs or [])}
+        required_inputs: set[str] = set()
+        seen_ids: set[str] = set()
+        reads: dict[str, set[str]] = {}
+        writes: dict[str, set[str]] = {}
+        arguments: dict[str, StepArguments] = {}
+
+        for step in sequence["steps"]:
+            step_id = step["id"]
+            if step_id in seen_ids:
+                errors.append(f"Duplicate step id {step_id}")
+            seen_ids.add(step_id)
+
+            needed = self._resolve_step(
+                step, available, tools_by_name, agents, arguments, errors
+            )
+            if needed is None:
+                continue
+
+            for key in sorted(needed - available):
+                if declared_inputs is None:
+                    required_inputs.add(key)
+                else:
+                    errors.append(
+                        f"Step {step_id}: {key} is neither a sequence input "
+                        "nor written by an earlier step"
+                    )
+
+            reads[step_id] = step_reads(step, agents.__getitem__, tools_by_name)
+            writes[step_id] = step_writes(step, agents.__getitem__)
+            available |= writes[step_id]
+
+        self._check_cache_policies(sequence, tools_by_name, errors)
+        self._check_state_reducers(sequence, errors)
+        self._check_conditions(sequence, errors)
+        self._check_policies(sequence, errors)
+
+        dependencies: dict[str, list[str]] = {}
+        if not errors:
+            try:
+                dependencies = self._plan_dependencies(sequence, reads, writes)
+            except ValueError as e:
+                errors.append(str(e))
+        if errors:
+            # Agents shared by several steps report the same problem only once
+            raise SequenceValidationError(sequence["id"], list(dict.fromkeys(errors)))
+
+        return {
+            "sequence": sequence,
+            "steps": [
+                self._compile_step(
+                    step, sequence, agents, arguments, reads, writes, dependencies
+                )
+                for step in sequence["steps"]
+            ],
+            "agents": agents,
+            "required_inputs": sorted(required_inputs),
+        }
+
+    @staticmethod
+    def check_inputs(plan: SequencePlan, state: SessionState) -> None:
+        missing = [key for key in plan["required_inputs"] if key not in state]
+        if missing:
+            raise SequenceValidationError(
+                plan["sequence"]["id"],
+                [f"initial state is missing {key}" for key in missing],
+            )
+
+    @staticmethod
+    def _check_cache_policies(
+        sequence: Sequence, tools_by_name: dict[str, BaseTool], errors: list[str]
+    ) -> None:
+        for step in sequence["steps"]:
+            if "cache" in step and step["type"] != "tool":
+                errors.append(f"Step {step['id']}: only tool steps can be cached")
+        for tool_name in sequence.get("tool_cache", {}):
+            if tool_name not in tools_by_name:
+                errors.append(f"tool_cache: tool {tool_name} not found")
+
+    @staticmethod
+    def _check_state_reducers(sequence: Sequence, errors: list[str]) -> None:
+        for key, reducer in sequence.get("state_reducers", {}).items():
+            if reducer not in KEY_REDUCERS:
+                errors.append(f"state_reducers: unknown reducer {reducer} for {key}")
+
+    @staticmethod
+    def _check_conditions(sequence: Sequence, errors: list[str]) -> None:
+        for step in sequence["steps"]:
+            try:
+                ConditionSet(
+                    step["id"], "skip_conditions", step.get("skip_conditions", {})
+                )
+                ConditionSet(
+                    step["id"],
+                    "terminate_conditions",
+                    step.get("terminate_conditions", {}),
+                )
+            except ValueError as e:
+                errors.append(str(e))
+
+    @staticmethod
+    def _check_policies(sequence: Sequence, errors: list[str]) -> None:
+        for step in sequence["steps"]:
+            try:
+                StepRunPolicy(step["id"], step_policy(sequence, step))
+            except ValueError as e:
+                errors.append(str(e))
+
+    @staticmethod
+    def _compile_step(
+        step: StepBase,
+        sequence: Sequence,
+        agents: dict[str, Agent],
+        arguments: dict[str, StepArguments],
+        reads: dict[str, set[str]],
+        writes: dict[str, set[str]],
+        dependencies: dict[str, list[str]],
+    ) -> CompiledStep:
+        compiled: CompiledStep = {
+            "step": step,
+            "arguments": arguments[step["id"]],
+            "reads": reads[step["id"]],
+            "writes": writes[step["id"]],
+            "depends_on": dependencies[step["id"]],
+        }
+        if step["type"] == "agent":
+            compiled["agent"] = agents[step["id"]]
+        cache_policy = step.get("cache") or sequence.get("tool_cache", {}).get(
+            step["id"]
+        )
+        if step["type"] == "tool" and cache_policy is not None:
+            compiled["cache_policy"] = cache_policy
+        if step.get("skip_conditions"):
+            compiled["skip_when"] = ConditionSet(
+                step["id"], "skip_conditions", step["skip_conditions"]
+            )
+        if step.get("terminate_conditions"):
+            compiled["terminate_when"] = ConditionSet(
+                step["id"], "terminate_conditions", step["terminate_conditions"]
+            )
+        policy = step_policy(sequence, step)
+        if policy:
+            compiled["policy"] = StepRunPolicy(step["id"], policy)
+        return compiled
+
+    @staticmethod
+    def _plan_dependencies(
+        sequence: Sequence,
+        reads: dict[str, set[str]],
+        writes: dict[str, set[str]],
+    ) -> dict[str, list[str]]:
+        if sequence.get("execution_mode", "sequential") == "parallel":
+            return build_dependency_graph(sequence, reads, writes)
+
+        step_ids = [step["id"] for step in sequence["steps"]]
+        return {
+            step_id: step_ids[index - 1 : index]
+            for index, step_id in enumerate(step_ids)
+        }
+
+    def _resolve_step(
+        self,
+        step: StepBase,
+        available: set[str],
+        tools_by_name: dict[str, BaseTool],
+        agents: dict[str, Agent],
+        arguments: dict[str, StepArguments],
+        errors: list[str],
+    ) -> set[str] | None:
+        """
+        Parses a step's arguments, resolves its tool or agent tree and returns
+        the state keys it needs, or None when something it refers to does not
+        exist.
+        """
+        step_id = step["id"]
+        try:
+            arguments[step_id] = compile_arguments(step)
+        except ArgumentError as e:
+            errors.append(str(e))
+            return None
+        needed = {
+            argument.required_key
+            for argument in arguments[step_id].values()
+            if argument.required_key is not None
+        }
+
+        if step["type"] == "tool":
+            if step_id not in tools_by_name:
+                errors.append(f"Step {step_id}: tool {step_id} not found")
+                return None
+        elif step["type"] == "agent":
+            if not self._resolve_agent(step_id, tools_by_name, agents, errors):
+                return None
+            needed |= self._missing_prompt_keys(
+                step_id, available | set(arguments[step_id]), set()
+            )
+        else:
+            errors.append(f"Step {step_id}: unknown step type {step['type']}")
+            return None
+        return needed
+
+    def _resolve_agent(
+        self,
+        agent_id: str,
+        tools_by_name: dict[str, BaseTool],
+        agents: dict[str, Agent],
+        errors: list[str],
+        path: tuple[str, ...] = (),
+    ) -> bool:
+        """
+        Walks an agent's sub-agent tree, rejecting missing agents and tools,
+        cycles and trees nested deeper than MAX_SUB_AGENT_DEPTH.
+        """
+        if agent_id in path:
+            errors.append(f"Agent cycle: {' -> '.join([*path, agent_id])}")
+            return False
+        if len(path) > MAX_SUB_AGENT_DEPTH:
+            errors.append(
+                f"Agent {path[0]}: sub-agents nested deeper than "
+                f"{MAX_SUB_AGENT_DEPTH} levels"
+            )
+            return False
+        agent = self._agents_config.get(agent_id)
+        if agent is None:
+            errors.append(f"Agent {agent_id} not found")
+            return False
+        agents[agent_id] = agent
+
+        resolved = True
+        for tool_name in agent.get("tools", []):
+            if tool_name not in tools_by_name:
+                errors.append(f"Agent {agent_id}: tool {tool_name} not found")
+                resolved = False
+        for sub_agent_id in agent.get("sub_agents", []):
+            resolved &= self._resolve_agent(
+                sub_agent_id, tools_by_name, agents, errors, (*path, agent_id)
+            )
+        return resolved
+
+    def _missing_prompt_keys(
+        self, agent_id: str, provided: set[str], visited: set[str]
+    ) -> set[str]:
+        """
+        Prompt variables of an agent and its sub-agents that neither the
+        context nor a dependency default can fill. Sub-agents may also get
+        their declared dependencies from the calling model.
+        """
+        if agent_id in visited:
+            return set()
+        visited.add(agent_id)
+
+        agent = self._agents_config[agent_id]
+        defaults = {
+            root_key(dep["key"])
+            for dep in agent.get("dependencies", [])
+            if dep.get("default_value") is not None
+        }
+        missing = prompt_variables(agent) - provided - defaults
+        for sub_agent_id in agent.get("sub_agents", []):
+            sub_agent = self._agents_config[sub_agent_id]
+            sub_provided = provided | {
+                root_key(dep["key"]) for dep in sub_agent.get("dependencies", [])
+            }
+            missing |= self._missing_prompt_keys(sub_agent_id, sub_provided, visited)
+        return missing
@@ -1,24 +1,99 @@
+import time
 from typing import Any
 
 from src.agent.types import Agent
-from src.data.mock_db import AGENTS, CLIENT_CONFIGS, SEQUENCES
+from src.cache.lru_cache import LRUCache
+from src.data.config_store import (
+    ConfigKind,
+    ConfigStore,
+    VersionedConfig,
+    create_config_store,
+)
+from src.data.constants import CONFIG_CACHE_MAX_ENTRIES, CONFIG_CACHE_TTL_SECONDS
 from src.sequence.types import Sequence
 
+# A cached config, None when the store has none, and when it was last checked
+_CacheEntry = tuple[VersionedConfig | None, float]
+
 
 class SequenceConfigLoader:
-    def __init__(self) -> None:
-        self._seqs = SEQUENCES
-        self._clients = CLIENT_CONFIGS
-        self._agents = AGENTS
+    """
+    Reads configs through an in-process cache over a ConfigStore. Cached
+    configs are served without any read for ttl_seconds, then revalidated by
+    version and only fetched again when it changed. A ttl of None never
+    revalidates.
+    """
+
+    def __init__(
+        self,
+        store: ConfigStore | None = None,
+        ttl_seconds: float | None = CONFIG_CACHE_TTL_SECONDS,
+        max_entries: int = CONFIG_CACHE_MAX_ENTRIES,
+    ) -> None:
+        self.store = store or create_config_store()
+        self._ttl_seconds = ttl_seconds
+        self._cache: LRUCache[tuple[ConfigKind, str], _CacheEntry] = LRUCache(
+            max_entries
+        )
+        self.revalidations = 0
+        self.reads = 0
 
-    def load_sequence(self, sequence_id: str) -> Sequence:
-        seq = self._seqs.get(sequence_id)
+    async def load_sequence(self, sequence_id: str) -> Sequence:
+        seq: Sequence | None = await self._load("sequence", sequence_id)
         if not seq:
             raise ValueError(f"Sequence {sequence_id} not found")
         return seq
 
-    def load_client_config(self, client_id: str) -> dict[str, Any]:
-        return self._clients.get(client_id, {})
+    async def load_client_config(self, client_id: str) -> dict[str, Any]:
+        return await self._load("client", client_id) or {}
+
+    async def load_agents(self, sequence: Sequence) -> dict[str, Agent]:
+        """
+        Loads the agents the sequence's agent steps use, with their sub-agents.
+        Missing agents are left out for the compiler to report.
+        """
+        agents: dict[str, Agent] = {}
+        pending = [step["id"] for step in sequence["steps"] if step["type"] == "agent"]
+        while pending:
+            agent_id = pending.pop()
+            if agent_id in agents:
+                continue
+            agent = await self._load("agent", agent_id)
+            if agent is not None:
+                agents[agent_id] = agent
+                pending.extend(agent.get("sub_agents", []))
+        return agents
+
+    def snapshot(self) -> "SequenceConfigLoader":
+        """
+        Returns a loader over the same store that pins each config once read
+        and never revalidates, so a long batch is not affected by config
+        changes made while it runs.
+        """
+        return SequenceConfigLoader(self.store, ttl_seconds=None)
+
+    def stats(self) -> dict[str, int | float]:
+        return {
+            **self._cache.stats(),
+            "revalidations": self.revalidations,
+            "reads": self.reads,
+        }
+
+    async def _load(self, kind: ConfigKind, key: str) -> Any:
+        now = time.monotonic()
+        cached = self._cache.get((kind, key))
+        if cached is not None:
+            config, checked_at = cached
+            if self._ttl_seconds is None or now - checked_at < self._ttl_seconds:
+                return None if config is None else config["value"]
+
+            self.revalidations += 1
+            version = await self.store.get_version(kind, key)
+            if version == (None if config is None else config["version"]):
+                self._cache.put((kind, key), (config, now))
+                return None if config is None else config["value"]
 
-    def load_all_agents(self) -> dict[str, Agent]:
-        return self._agents.copy()
+        self.reads += 1
+        config = await self.store.get(kind, key)
+        self._cache.put((kind, key), (config, now))
+        return None if config is None else config["value"]
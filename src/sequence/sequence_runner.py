@@ -1,18 +1,35 @@
-from typing import Any
+import asyncio
+from typing import Any, AsyncIterator
 
-from langchain_mcp_adapters.tools import load_mcp_tools
+from langchain_core.messages import AIMessage
+from langchain_core.runnables import RunnableConfig
 from langgraph.graph.graph import CompiledGraph
-from mcp import ClientSession
-from mcp.client.stdio import stdio_client
 
 from src.agent.agent_factory import AgentFactory
+from src.agent.constants import LLM_PRIORITY_CONFIG_KEY
 from src.agent.types import Agent
+from src.graph.constants import (
+    MCP_TOOLS_CONFIG_KEY,
+    MCP_TOOLS_FINGERPRINT_CONFIG_KEY,
+    RUN_CHECKPOINT_CONFIG_KEY,
+    RUN_LOOP_CONFIG_KEY,
+    RUN_METRICS_CONFIG_KEY,
+    RUN_PROGRESS_CONFIG_KEY,
+)
 from src.graph.graph_builder import GraphBuilder
-from src.sequence.sequence_config_loader import SequenceConfigLoader
+from src.graph.graph_cache import CompiledSequence, GraphCacheKey
+from src.graph.run_progress import RunProgress
+from src.metrics.run_metrics import RunMetrics
+from src.metrics.types import RunSummary
+from src.runtime.runtime_context import RuntimeContext, get_runtime_context
+from src.runtime.startup import StartupPipeline, StartupReport
+from src.sequence.sequence_compiler import SequenceCompiler, SequencePlan
 from src.sequence.types import Sequence
-from src.state.session_state import SessionState
-from src.tools.constants import SERVER_PARAMETERS
-from src.tools.tool_invoker import ToolInvoker
+from src.state.session_state import SessionState, make_state_reducer
+from src.state.step_checkpoints import RunCheckpoint
+from src.tools.constants import TOOL_CACHE_POLICIES_CONFIG_KEY
+from src.tools.mcp_session_pool import PooledMCPServer
+from src.types import SequenceStreamEvent
 
 
 class SequenceRunner:
@@ -22,6 +39,8 @@ class SequenceRunner:
         client_id: str,
         product_id: str,
         initial_state: SessionState | None = None,
+        runtime: RuntimeContext | None = None,
+        run_id: str | None = None,
     ):
         if initial_state is None:
             initial_state = {}
@@ -30,55 +49,241 @@ class SequenceRunner:
         self.product_id = product_id
         self.initial_state = initial_state
         self.final_state: SessionState | None = None
+        # Checkpoints are only kept for runs the caller can retry by id
+        self.run_id = run_id
+        self.resumed_steps: list[str] = []
+        self.run_summary: RunSummary | None = None
+        self.startup_report: StartupReport | None = None
 
-        # injected collaborators
-        self.config_loader = SequenceConfigLoader()
-        self.tool_invoker = ToolInvoker()
+        # injected collaborators, shared across runs through the runtime context
+        self.runtime = runtime or get_runtime_context()
+        self.config_loader = self.runtime.config_loader
+        self.tool_invoker = self.runtime.tool_invoker
         self.agent_factory: AgentFactory | None = None
         self.graph_builder: GraphBuilder | None = None
 
         self.sequence: Sequence | None = None
         self.client_config: dict[str, Any] | None = None
         self.all_agents: dict[str, Agent] | None = None
+        self.plan: SequencePlan | None = None
+        # The graph cache key of the loaded configurations, by tools fingerprint
+        self._graph_key: tuple[str, GraphCacheKey] | None = None
 
     async def load_configurations(self) -> None:
         """
-        Loads sequence, client_config, and agents from the DB.
+        Loads the sequence, client_config, and the agents it uses from the config store.
         Must be called before run_sequence_async().
         """
-        self.sequence = self.config_loader.load_sequence(self.sequence_id)
-        self.client_config = self.config_loader.load_client_config(self.client_id)
-        self.all_agents = self.config_loader.load_all_agents()
+        self.sequence = await self.config_loader.load_sequence(self.sequence_id)
+        self.client_config = await self.config_loader.load_client_config(self.client_id)
+        self.all_agents = await self.config_loader.load_agents(self.sequence)
+        self._graph_key = None
 
-        self.agent_factory = AgentFactory(self.all_agents, self.client_config)
+        self.agent_factory = AgentFactory(
+            self.all_agents,
+            self.client_config,
+            self.runtime.agent_cache,
+            self.runtime.response_cache,
+            self.tool_invoker,
+        )
         self.graph_builder = GraphBuilder(
             self.tool_invoker, self.agent_factory, self.client_config
         )
 
+    async def startup(self, load_secrets: bool = False) -> StartupReport:
+        """
+        Loads the configurations like load_configurations(), and on a cold
+        container also starts the MCP servers, creates the model clients and
+        compiles the graph, as concurrent stages. Each stage starts once the
+        stages it needs are done, see self.startup_report for their timings
+        and critical path. Once the servers run the container is warm: only
+        the configurations load, and models are created for new agents only.
+        A graph not compiled yet is compiled by the run.
+        """
+        secrets = ["secrets"] if load_secrets else []
+        warm = self.runtime.mcp_pool.started
+        pipeline = StartupPipeline()
+        if load_secrets:
+            pipeline.add("secrets", self.runtime.refresh_secrets)
+        pipeline.add("configs", self.load_configurations)
+        if not warm:
+            # The server processes inherit the secrets from the environment
+            pipeline.add("mcp", self._start_mcp, after=secrets)
+        pipeline.add("models", self._warm_models, after=["configs", *secrets])
+        if not warm:
+            pipeline.add("graph", self._warm_graph, after=["configs", "mcp"])
+        self.startup_report = await pipeline.run()
+        return self.startup_report
+
     async def run_sequence_async(self) -> SessionState:
         """
-        Builds the graph for the previously-loaded sequence, compiles it,
-        then invokes it with the initial_state.
+        Compiles the previously-loaded sequence into a validated plan and a
+        graph, then invokes it with the initial_state. Compiled sequences are
+        reused across runs through the runtime's graph cache.
         """
         if not self.sequence or not self.graph_builder:
             raise RuntimeError("Must call load_configurations() first")
 
+        # Borrow a live MCP session & its cached tools from the pool
+        async with self.runtime.mcp_pool.acquire() as mcp_server:
+            graph, config, run_metrics = await self._prepare_run(mcp_server)
+
+            # Kick off the sequence
+            try:
+                self.final_state = await graph.ainvoke(
+                    self.initial_state, config=config
+                )
+            finally:
+                self.run_summary = run_metrics.finish()
+
+            return self.final_state
+
+    async def stream_sequence_async(self) -> AsyncIterator[SequenceStreamEvent]:
+        """
+        Runs the previously-loaded sequence like run_sequence_async(), but
+        yields each step's state delta as soon as the step completes, and the
+        token chunks of agents whose model streams, then the final state.
+        """
+        if not self.sequence or not self.graph_builder:
+            raise RuntimeError("Must call load_configurations() first")
+
+        async with self.runtime.mcp_pool.acquire() as mcp_server:
+            graph, config, run_metrics = await self._prepare_run(mcp_server)
+
+            # The graph's reducer, applied to a state of our own
+            reduce_state = make_state_reducer(self.sequence.get("state_reducers", {}))
+            state = reduce_state({}, self.initial_state)
+            stream: AsyncIterator[Any] = graph.astream(
+                self.initial_state, config=config, stream_mode=["updates", "messages"]
+            )
+            try:
+                async for mode, chunk in stream:
+                    if mode == "updates":
+                        for step_id, delta in chunk.items():
+                            # Skipped steps write nothing
+                            delta = delta or {}
+                            state = reduce_state(state, delta)
+                            yield {"event": "step", "step": step_id, "delta": delta}
+                        continue
+
+                    # Only the text agents produce, not tool results or tool calls
+                    message, metadata = chunk
+                    if (
+                        isinstance(message, AIMessage)
+                        and isinstance(message.content, str)
+                        and message.content
+                    ):
+                        yield {
+                            "event": "token",
+                            # Agent graphs run namespaced under their step's node
+                            "step": metadata["checkpoint_ns"].split(":")[0],
+                            "content": message.content,
+                        }
+            finally:
+                self.run_summary = run_metrics.finish()
+
+            self.final_state = state
+            yield {"event": "end", "state": state}
+
+    async def _prepare_run(
+        self, mcp_server: PooledMCPServer
+    ) -> tuple[CompiledGraph, RunnableConfig, RunMetrics]:
+        """
+        Compiles the sequence, checks the initial state against the plan and
+        builds the per-run config: the borrowed session's tools, the tool
+        cache policies, the run's metrics recorder, the progress the graph
+        routes on, its priority for model calls, the loop it runs on and, for
+        runs with a run_id, their checkpoints.
+        """
+        if self.sequence is None:
+            raise RuntimeError("Must call load_configurations() first")
+
         # Guarantee to include client_id in the initial state
         self.initial_state.setdefault("client_id", self.client_id)
 
-        # Open MCP session & load raw tools
-        async with (
-            stdio_client(SERVER_PARAMETERS) as (r, w),
-            ClientSession(r, w) as session,
-        ):
-            await session.initialize()
-            mcp_tools = await load_mcp_tools(session)
+        compiled = self._compile(mcp_server)
+        self.plan = compiled["plan"]
 
-            # Assemble & compile the graph
-            graph = self.graph_builder.build(self.sequence, mcp_tools)
-            compiled: CompiledGraph = graph.compile()
+        # Reject missing inputs before any step runs
+        SequenceCompiler.check_inputs(self.plan, self.initial_state)
 
-            # Kick off the sequence
-            self.final_state = await compiled.ainvoke(self.initial_state)
+        run_metrics = RunMetrics(
+            self.sequence["id"], self.run_id, self.runtime.metrics_sinks
+        )
+        configurable: dict[str, Any] = {
+            MCP_TOOLS_CONFIG_KEY: mcp_server.tools_by_name,
+            MCP_TOOLS_FINGERPRINT_CONFIG_KEY: mcp_server.tools_fingerprint,
+            TOOL_CACHE_POLICIES_CONFIG_KEY: self.sequence.get("tool_cache", {}),
+            RUN_METRICS_CONFIG_KEY: run_metrics,
+            RUN_PROGRESS_CONFIG_KEY: RunProgress(
+                self.plan, self.initial_state, run_metrics
+            ),
+            LLM_PRIORITY_CONFIG_KEY: self.sequence.get("priority", 0),
+            RUN_LOOP_CONFIG_KEY: asyncio.get_running_loop(),
+        }
+        if self.run_id is not None:
+            checkpoint = await RunCheckpoint.resume(
+                self.runtime.checkpoint_store,
+                (self.client_id, self.sequence["id"], self.run_id),
+            )
+            self.resumed_steps = list(checkpoint.completed)
+            configurable[RUN_CHECKPOINT_CONFIG_KEY] = checkpoint
 
-            return self.final_state
+        return compiled["graph"], {"configurable": configurable}, run_metrics
+
+    async def _warm_models(self) -> None:
+        if self.all_agents is None:
+            raise RuntimeError("Must call load_configurations() first")
+        agent_cache = self.runtime.agent_cache
+        models = {
+            agent["model"]
+            for agent in self.all_agents.values()
+            if not agent_cache.has_model(agent["model"])
+        }
+        if not models:
+            return
+
+        def create_models() -> None:
+            for model in models:
+                agent_cache.get_model(model)
+
+        # The first client imports the provider's SDK and sets up its HTTP
+        # clients, all blocking
+        await asyncio.to_thread(create_models)
+
+    async def _start_mcp(self) -> None:
+        # A failing stage cancels this one, but the start carries on so the
+        # servers are up for the next run; on failure the pool stops them
+        start = asyncio.ensure_future(self.runtime.mcp_pool.start())
+        start.add_done_callback(lambda task: task.cancelled() or task.exception())
+        await asyncio.shield(start)
+
+    async def _warm_graph(self) -> None:
+        # Compiled against a session's tools, then reused by the run
+        async with self.runtime.mcp_pool.acquire() as mcp_server:
+            self._compile(mcp_server)
+
+    def _compile(self, mcp_server: PooledMCPServer) -> CompiledSequence:
+        if (
+            self.sequence is None
+            or self.graph_builder is None
+            or self.client_config is None
+            or self.all_agents is None
+        ):
+            raise RuntimeError("Must call load_configurations() first")
+        sequence = self.sequence
+        graph_builder = self.graph_builder
+        compiler = SequenceCompiler(self.all_agents, self.client_config)
+
+        def build() -> CompiledSequence:
+            plan = compiler.compile(sequence, mcp_server.tools_by_name)
+            return {"plan": plan, "graph": graph_builder.build(plan).compile()}
+
+        fingerprint = mcp_server.tools_fingerprint
+        if self._graph_key is None or self._graph_key[0] != fingerprint:
+            # Hashes the configurations, so computed once per runner
+            cache_key = self.runtime.graph_cache.make_key(
+                sequence, self.client_config, self.all_agents, fingerprint
+            )
+            self._graph_key = (fingerprint, cache_key)
+        return self.runtime.graph_cache.get_or_build(self._graph_key[1], build)
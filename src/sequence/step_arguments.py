@@ -0,0 +1,129 @@
+import re
+from typing import Any, Mapping
+
+from src.sequence.types import ArgumentValue, StepBase
+
+# "incoming_message[content]", "reply.body", "items[0].name"
+_ROOT_PATTERN = re.compile(r"[^.\[\]]+")
+_SEGMENT_PATTERN = re.compile(r"\.([^.\[\]]+)|\[([^\[\]]+)\]")
+
+
+class ArgumentError(ValueError):
+    def __init__(self, step_id: str, argument: str, message: str):
+        self.step_id = step_id
+        self.argument = argument
+        super().__init__(f"Step {step_id}: argument {argument}: {message}")
+
+
+class StatePath:
+    """
+    A parsed state path. Both a.b and a[b] read key b of a mapping, and
+    integer segments also index lists, so a[0] and a.0 read a list's first
+    item. Values are returned as they are stored, never stringified.
+    """
+
+    __slots__ = ("expression", "root", "_segments")
+
+    def __init__(self, expression: str):
+        root = _ROOT_PATTERN.match(expression)
+        if root is None:
+            raise ValueError(f"invalid path {expression!r}")
+        segments: list[tuple[str, int | None]] = []
+        position = root.end()
+        while position < len(expression):
+            segment = _SEGMENT_PATTERN.match(expression, position)
+            if segment is None:
+                raise ValueError(f"invalid path {expression!r} at {position}")
+            key = segment.group(1) or segment.group(2)
+            index = int(key) if key.lstrip("-").isdigit() else None
+            segments.append((key, index))
+            position = segment.end()
+
+        self.expression = expression
+        self.root = root.group(0)
+        self._segments = tuple(segments)
+
+    def get(self, *layers: Mapping[str, Any]) -> Any:
+        """
+        Reads the path from the first layer holding its root key. Raises a
+        LookupError naming the first segment that could not be found.
+        """
+        for layer in layers:
+            if self.root in layer:
+                value = layer[self.root]
+                break
+        else:
+            raise KeyError(self.root)
+
+        for key, index in self._segments:
+            if isinstance(value, Mapping) and key in value:
+                value = value[key]
+            elif isinstance(value, Mapping) and index in value:
+                value = value[index]
+            elif isinstance(value, (list, tuple)) and index is not None:
+                if not -len(value) <= index < len(value):
+                    raise IndexError(key)
+                value = value[index]
+            else:
+                raise KeyError(key)
+        return value
+
+
+class StepArgument:
+    """
+    One argument of a step, parsed when the sequence compiles. Static values
+    are passed through, dynamic ones are read from the state by path, falling
+    back to their default when one is declared.
+    """
+
+    __slots__ = ("step_id", "name", "path", "_value", "_default", "_has_default")
+
+    def __init__(self, step_id: str, name: str, value: ArgumentValue):
+        self.step_id = step_id
+        self.name = name
+        self.path: StatePath | None = None
+        self._value = value["value"]
+        self._has_default = "default" in value
+        self._default = value.get("default")
+
+        if value["type"] == "dynamic":
+            try:
+                self.path = StatePath(value["value"])
+            except ValueError as e:
+                raise ArgumentError(step_id, name, str(e))
+        elif value["type"] != "static":
+            raise ArgumentError(step_id, name, f"unknown type {value['type']}")
+
+    @property
+    def required_key(self) -> str | None:
+        """
+        State key the argument cannot run without, None when it has a default.
+        """
+        if self.path is None or self._has_default:
+            return None
+        return self.path.root
+
+    def resolve(self, *layers: Mapping[str, Any]) -> Any:
+        if self.path is None:
+            return self._value
+        try:
+            return self.path.get(*layers)
+        except LookupError as e:
+            if self._has_default:
+                return self._default
+            raise ArgumentError(
+                self.step_id,
+                self.name,
+                f"{self.path.expression} not found, {e.args[0]!r} is missing",
+            )
+
+
+# Arguments of a step by name, as compiled
+StepArguments = dict[str, StepArgument]
+
+
+def compile_arguments(step: StepBase) -> StepArguments:
+    return {
+        name: StepArgument(step["id"], name, value)
+        for name, value in step.get("arguments", {}).items()
+    }
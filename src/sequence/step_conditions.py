@@ -0,0 +1,86 @@
+import operator
+from typing import Any, Callable, Mapping
+
+from src.sequence.step_arguments import StatePath
+from src.sequence.types import StepConditions
+
+# Checks a state value, given whether its path was found at all
+Predicate = Callable[[Any, bool], bool]
+
+_COMPARISONS: dict[str, Callable[[Any, Any], Any]] = {
+    "eq": operator.eq,
+    "ne": operator.ne,
+    "gt": operator.gt,
+    "gte": operator.ge,
+    "lt": operator.lt,
+    "lte": operator.le,
+}
+
+
+def _comparison(compare: Callable[[Any, Any], Any], operand: Any) -> Predicate:
+    def check(value: Any, _found: bool) -> bool:
+        try:
+            return bool(compare(value, operand))
+        except TypeError:
+            # e.g. a missing value compared with a number
+            return False
+
+    return check
+
+
+def compile_condition(condition: Any) -> Predicate:
+    """
+    Turns a plain value into an equality check and a {"op": ...} condition
+    into its operator. Missing paths read as None, except for "exists".
+    """
+    if not isinstance(condition, dict) or "op" not in condition:
+        return lambda value, _found: bool(value == condition)
+
+    op = condition["op"]
+    operand = condition.get("value")
+    if op in _COMPARISONS:
+        return _comparison(_COMPARISONS[op], operand)
+    if op in ("in", "not_in"):
+        if not isinstance(operand, list):
+            raise ValueError(f"{op} takes a list")
+        members = operand
+        if op == "in":
+            return lambda value, found: found and value in members
+        return lambda value, found: not (found and value in members)
+    if op == "exists":
+        expected = True if operand is None else operand
+        if not isinstance(expected, bool):
+            raise ValueError("exists takes true or false")
+        return lambda value, found: (found and value is not None) == expected
+    if op == "not":
+        negated = compile_condition(operand)
+        return lambda value, found: not negated(value, found)
+    raise ValueError(f"unknown operator {op}")
+
+
+class ConditionSet:
+    """
+    A step's skip or terminate conditions, parsed when the sequence
+    compiles. Met when any of its conditions holds.
+    """
+
+    __slots__ = ("_checks",)
+
+    def __init__(self, step_id: str, field: str, conditions: StepConditions):
+        checks: list[tuple[StatePath, Predicate]] = []
+        for path, condition in conditions.items():
+            try:
+                checks.append((StatePath(path), compile_condition(condition)))
+            except ValueError as e:
+                raise ValueError(f"Step {step_id}: {field} {path}: {e}")
+        self._checks = tuple(checks)
+
+    def matches(self, state: Mapping[str, Any]) -> bool:
+        for path, check in self._checks:
+            try:
+                value, found = path.get(state), True
+            except LookupError:
+                value, found = None, False
+            if check(value, found):
+                return True
+        return False
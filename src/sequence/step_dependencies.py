@@ -0,0 +1,140 @@
+import json
+import re
+from string import Formatter
+from typing import Any, Callable
+
+from langchain_core.tools import BaseTool
+
+from src.agent.types import Agent
+from src.sequence.types import Sequence, StepBase
+
+# "incoming_message[content]" reads "incoming_message", "reply.body" reads "reply"
+_ROOT_KEY_PATTERN = re.compile(r"^[^\[.]+")
+
+
+def root_key(path: str) -> str:
+    match = _ROOT_KEY_PATTERN.match(path)
+    return match.group(0) if match else path
+
+
+def prompt_variables(agent: Agent) -> set[str]:
+    variables = set()
+    for _, template in agent["prompt"]:
+        for _, field_name, _, _ in Formatter().parse(template):
+            if field_name:
+                variables.add(root_key(field_name))
+    return variables
+
+
+def agent_reads(
+    agent_id: str,
+    get_agent: Callable[[str], Agent],
+    tools_by_name: dict[str, BaseTool],
+    _visited: set[str] | None = None,
+) -> set[str]:
+    """
+    State keys an agent can consume: its declared dependencies, its prompt
+    variables and the arguments of every tool it (or a sub-agent) may call,
+    since wrapped tools are fed from the step context.
+    """
+    visited = _visited if _visited is not None else set()
+    if agent_id in visited:
+        return set()
+    visited.add(agent_id)
+
+    agent = get_agent(agent_id)
+    reads = {root_key(dep["key"]) for dep in agent.get("dependencies", [])}
+    reads |= prompt_variables(agent)
+    for tool_name in agent.get("tools", []):
+        if tool_name in tools_by_name:
+            reads |= set(tools_by_name[tool_name].args.keys())
+    for sub_agent_id in agent.get("sub_agents", []):
+        reads |= agent_reads(sub_agent_id, get_agent, tools_by_name, visited)
+    return reads
+
+
+def step_reads(
+    step: StepBase,
+    get_agent: Callable[[str], Agent],
+    tools_by_name: dict[str, BaseTool],
+) -> set[str]:
+    arguments = step.get("arguments", {})
+    reads = {
+        root_key(value["value"])
+        for value in arguments.values()
+        if value["type"] == "dynamic"
+    }
+    reads |= {root_key(path) for path in step.get("skip_conditions", {})}
+    reads |= {root_key(path) for path in step.get("terminate_conditions", {})}
+
+    if step["type"] == "tool":
+        step_tool = tools_by_name.get(step["id"])
+        if step_tool is not None:
+            reads |= {key for key in step_tool.args.keys() if key not in arguments}
+    elif step["type"] == "agent":
+        reads |= agent_reads(step["id"], get_agent, tools_by_name)
+    return reads
+
+
+def step_writes(step: StepBase, get_agent: Callable[[str], Agent]) -> set[str]:
+    out_key = step.get("output_key")
+    if out_key:
+        return {out_key}
+    if step["type"] == "agent":
+        # Structured agent responses are merged into the state key by key
+        schema: dict[str, Any] = json.loads(get_agent(step["id"])["output_schema"])
+        properties = schema.get("properties", {})
+        if properties:
+            return set(properties.keys())
+    return {f"{step['id']}_result"}
+
+
+def build_dependency_graph(
+    sequence: Sequence,
+    reads: dict[str, set[str]],
+    writes: dict[str, set[str]],
+) -> dict[str, list[str]]:
+    """
+    Maps every step id to the ids of the earlier steps it must wait for.
+    A step depends on an earlier one when it reads what the earlier step
+    writes, writes what it reads, or writes the same key, or when it lists
+    it in depends_on. Transitively implied edges are dropped.
+    """
+    steps = sequence["steps"]
+    step_ids = [step["id"] for step in steps]
+
+    direct: dict[str, set[str]] = {}
+    for index, step in enumerate(steps):
+        step_id = step["id"]
+        deps: set[str] = set()
+        for explicit in step.get("depends_on", []):
+            if explicit not in step_ids[:index]:
+                raise ValueError(
+                    f"Step {step_id} depends on {explicit}, which is not earlier"
+                )
+            deps.add(explicit)
+        for earlier_id in step_ids[:index]:
+            if (
+                reads[step_id] & writes[earlier_id]
+                or writes[step_id] & reads[earlier_id]
+                or writes[step_id] & writes[earlier_id]
+            ):
+                deps.add(earlier_id)
+        direct[step_id] = deps
+
+    # Ancestors in sequence order, used for the transitive reduction
+    ancestors: dict[str, set[str]] = {}
+    for step_id in step_ids:
+        ancestors[step_id] = set(direct[step_id])
+        for dep in direct[step_id]:
+            ancestors[step_id] |= ancestors[dep]
+
+    return {
+        step_id: [
+            dep
+            for dep in step_ids
+            if dep in direct[step_id]
+            and not any(dep in ancestors[other] for other in direct[step_id])
+        ]
+        for step_id in step_ids
+    }
@@ -0,0 +1,124 @@
+import asyncio
+import math
+import random
+import time
+from collections import deque
+from typing import Awaitable, Callable, TypeVar
+
+from src.metrics.types import StepMetrics
+from src.sequence.constants import STEP_LATENCY_WINDOW, STEP_RETRY_ON
+from src.sequence.types import HedgePolicy, Sequence, StepBase, StepPolicy
+
+T = TypeVar("T")
+
+
+def step_policy(sequence: Sequence, step: StepBase) -> StepPolicy:
+    """
+    The sequence-level step_policy with the step's own policy keys on top.
+    """
+    return {**sequence.get("step_policy", {}), **step.get("policy", {})}
+
+
+class StepRunPolicy:
+    """
+    A step's timeout, retry and hedging policy, parsed when the sequence
+    compiles. Kept with the compiled plan, so the latencies hedging delays
+    are based on carry over to later runs of the sequence.
+    """
+
+    def __init__(self, step_id: str, policy: StepPolicy):
+        self.step_id = step_id
+        self._timeout = policy.get("timeout_seconds")
+        self._max_retries = policy.get("max_retries", 0)
+        self._backoff_base = policy.get("backoff_base_seconds", 0.5)
+        self._backoff_max = policy.get("backoff_max_seconds", 10.0)
+        self._retry_on = set(policy.get("retry_on", STEP_RETRY_ON))
+        self._hedge: HedgePolicy | None = policy.get("hedge")
+        self._latencies: deque[float] = deque(maxlen=STEP_LATENCY_WINDOW)
+
+        if self._timeout is not None and self._timeout <= 0:
+            raise ValueError(f"Step {step_id}: policy timeout_seconds must be > 0")
+        if self._max_retries < 0:
+            raise ValueError(f"Step {step_id}: policy max_retries must be >= 0")
+        if self._hedge is not None and not 0 < self._hedge.get("percentile", 95) < 100:
+            raise ValueError(f"Step {step_id}: hedge percentile must be in (0, 100)")
+
+    async def run(self, attempt: Callable[[], Awaitable[T]], metrics: StepMetrics) -> T:
+        retry = 0
+        while True:
+            started = time.perf_counter()
+            try:
+                result = await self._run_attempt(attempt, metrics)
+            except Exception as e:
+                if retry >= self._max_retries or not self._is_retryable(e):
+                    raise
+                delay = min(self._backoff_base * 2**retry, self._backoff_max)
+                retry += 1
+                metrics["retries"] += 1
+                # Full jitter, so retries of concurrent runs spread out
+                await asyncio.sleep(random.uniform(0, delay))
+                continue
+            self._latencies.append(time.perf_counter() - started)
+            return result
+
+    def hedge_delay(self) -> float | None:
+        """
+        Seconds after which a duplicate attempt is fired, None for no hedging.
+        """
+        if self._hedge is None:
+            return None
+        if len(self._latencies) < self._hedge.get("min_samples", 20):
+            return self._hedge.get("delay_seconds")
+        latencies = sorted(self._latencies)
+        rank = math.ceil(self._hedge.get("percentile", 95) / 100 * len(latencies))
+        return latencies[rank - 1]
+
+    async def _run_attempt(
+        self, attempt: Callable[[], Awaitable[T]], metrics: StepMetrics
+    ) -> T:
+        delay = self.hedge_delay()
+        deadline = asyncio.timeout(self._timeout)
+        try:
+            async with deadline:
+                if delay is None:
+                    return await attempt()
+                return await self._hedged(attempt, delay, metrics)
+        except TimeoutError:
+            if not deadline.expired():
+                # Raised by the attempt itself, e.g. a client timeout
+                raise
+            metrics["timeouts"] += 1
+            raise TimeoutError(f"Step {self.step_id} timed out after {self._timeout}s")
+
+    @staticmethod
+    async def _hedged(
+        attempt: Callable[[], Awaitable[T]], delay: float, metrics: StepMetrics
+    ) -> T:
+        primary = asyncio.ensure_future(attempt())
+        pending = {primary}
+        errors: list[BaseException] = []
+        try:
+            done, pending = await asyncio.wait(pending, timeout=delay)
+            if not done:
+                metrics["hedges"] += 1
+                pending.add(asyncio.ensure_future(attempt()))
+            while True:
+                for task in done:
+                    error = task.exception()
+                    if error is None:
+                        if task is not primary:
+                            metrics["hedges_won"] += 1
+                        return task.result()
+                    errors.append(error)
+                if not pending:
+                    raise errors[0]
+                done, pending = await asyncio.wait(
+                    pending, return_when=asyncio.FIRST_COMPLETED
+                )
+        finally:
+            # The slower attempt, or both when the step timed out
+            for task in pending:
+                task.cancel()
+
+    def _is_retryable(self, error: Exception) -> bool:
+        return any(cls.__name__ in self._retry_on for cls in type(error).__mro__)
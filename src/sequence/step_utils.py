@@ -1,23 +1,18 @@
 from typing import Any
 
-from src.sequence.types import Arguments, StepBase
-from src.state.session_state import SessionState
-
-
-def check_skip_conditions(step: StepBase, state: SessionState) -> bool:
-    for key, value in step.get("skip_conditions", {}).items():
-        if state.get(key) == value:
-            return True
-    return False
+from src.sequence.step_arguments import StepArguments
+from src.state.session_state import SessionState, StepContext, layered_context
 
 
 def get_step_context_static(
-    arguments: Arguments, state: SessionState, client_cfg: dict[str, Any]
-) -> dict:
-    overrides = {}
-    for key, value in arguments.items():
-        if value["type"] == "dynamic":
-            overrides[key] = f"{{{value['value']}}}".format_map(state)
-        elif value["type"] == "static":
-            overrides[key] = value["value"]
-    return {**client_cfg, **state, **overrides}
+    arguments: StepArguments, state: SessionState, client_cfg: dict[str, Any]
+) -> StepContext:
+    """
+    The step's arguments layered over the state, layered over the client
+    config, as a read-only view rather than a merged copy.
+    """
+    overrides = {
+        name: argument.resolve(state, client_cfg)
+        for name, argument in arguments.items()
+    }
+    return layered_context(overrides, state, client_cfg)
@@ -1,17 +1,66 @@
-from typing import Dict, List, Literal, NotRequired, TypedDict
+from typing import Any, Dict, List, Literal, NotRequired, TypedDict
 
 
-# Argument value can be dynamic or static
+# Argument value can be dynamic or static. Dynamic values are state paths like
+# "incoming_message[content]" or "items[0].name", static ones any JSON value
 class ArgumentValue(TypedDict):
     type: Literal["dynamic", "static"]
-    value: str
+    value: Any
+    # Dynamic only, used when the path is missing from the state
+    default: NotRequired[Any]
 
 
 # Arguments are a mapping from argument names to their values
 Arguments = Dict[str, ArgumentValue]
 
-# Skip conditions are a mapping from condition keys to boolean values
-SkipConditions = Dict[str, bool]
+# Operators of a condition, e.g. {"op": "in", "value": ["a", "b"]}
+ConditionOperator = Literal[
+    "eq", "ne", "gt", "gte", "lt", "lte", "in", "not_in", "exists", "not"
+]
+
+
+class Condition(TypedDict):
+    op: ConditionOperator
+    # "exists" takes a bool (default true), "not" a nested condition
+    value: NotRequired[Any]
+
+
+# Conditions by state path, met when any of them holds. A plain value is
+# compared for equality, a Condition applies its operator
+StepConditions = Dict[str, Any]
+
+
+# Memoization of an idempotent tool's results, keyed on its filtered arguments
+class ToolCachePolicy(TypedDict):
+    ttl_seconds: float
+    # Results larger than this (JSON-encoded) are not cached
+    max_entry_bytes: NotRequired[int]
+    # "client" (default) keeps one cache per client_id, "global" shares it
+    namespace: NotRequired[Literal["client", "global"]]
+
+
+# Firing a duplicate of a slow attempt, the first response wins. Only for
+# steps that are safe to run twice
+class HedgePolicy(TypedDict):
+    # Latency percentile of the step's past attempts to fire the duplicate at
+    percentile: NotRequired[float]
+    # Delay used until min_samples attempts were observed, no hedging if absent
+    delay_seconds: NotRequired[float]
+    min_samples: NotRequired[int]
+
+
+# How a step's attempts are bounded and retried when they fail or hang
+class StepPolicy(TypedDict):
+    # Each attempt, hedge included, is cancelled after this long
+    timeout_seconds: NotRequired[float]
+    # Attempts after the first one, for retryable errors and timeouts
+    max_retries: NotRequired[int]
+    # Retry n waits a random delay up to min(base * 2**n, max)
+    backoff_base_seconds: NotRequired[float]
+    backoff_max_seconds: NotRequired[float]
+    # Error class names to retry, matched against the error's class hierarchy
+    retry_on: NotRequired[List[str]]
+    hedge: NotRequired[HedgePolicy]
 
 
 # Step can be either an agent or a tool
@@ -19,11 +68,42 @@ class StepBase(TypedDict):
     type: Literal["agent", "tool"]
     id: str
     arguments: NotRequired[Arguments]
-    skip_conditions: NotRequired[SkipConditions]
+    # Checked before the step is scheduled, a skipped step never runs
+    skip_conditions: NotRequired[StepConditions]
+    # Checked on the state after the step, ends the sequence when met
+    terminate_conditions: NotRequired[StepConditions]
     output_key: NotRequired[str]
+    # Explicit upstream step ids, for dependencies inference cannot see
+    depends_on: NotRequired[List[str]]
+    # Tool steps only, overrides the sequence-level tool_cache entry
+    cache: NotRequired[ToolCachePolicy]
+    # Overrides keys of the sequence-level step_policy
+    policy: NotRequired[StepPolicy]
+
+
+# How a step's write to a state key combines with the key's current value:
+# "replace" (default), "append" to a list, "merge" into a dict, "add" numbers
+StateReducerName = Literal["replace", "append", "merge", "add"]
+
+
+# "sequential" chains steps in list order, "parallel" runs independent steps
+# concurrently based on the keys each step reads and writes
+ExecutionMode = Literal["sequential", "parallel"]
 
 
 # Sequence consists of an ID and a list of steps
 class Sequence(TypedDict):
     id: str
     steps: List[StepBase]
+    version: NotRequired[str]
+    execution_mode: NotRequired[ExecutionMode]
+    # Keys the initial state must provide, checked when the sequence compiles
+    inputs: NotRequired[List[str]]
+    # Cacheable tools by name, wherever they are called from (steps or agents)
+    tool_cache: NotRequired[Dict[str, ToolCachePolicy]]
+    # Reducers of state keys that do not simply take the latest write
+    state_reducers: NotRequired[Dict[str, StateReducerName]]
+    # Policy of every step, completed by the steps' own policy
+    step_policy: NotRequired[StepPolicy]
+    # Model calls of higher priority sequences are let through first, default 0
+    priority: NotRequired[int]
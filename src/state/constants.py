@@ -0,0 +1,14 @@
+import os
+
+# Per-step checkpoints of runs started with a run_id, used to resume retries
+STEP_CHECKPOINT_BACKEND = os.getenv("STEP_CHECKPOINT_BACKEND", "memory")
+STEP_CHECKPOINT_PATH = os.getenv(
+    "STEP_CHECKPOINT_PATH", "/tmp/step_checkpoints.sqlite3"
+)
+STEP_CHECKPOINT_RETENTION_SECONDS = float(
+    os.getenv("STEP_CHECKPOINT_RETENTION_SECONDS", "86400")
+)
+# Expired checkpoints are purged by a save at most once per interval
+STEP_CHECKPOINT_PURGE_INTERVAL_SECONDS = float(
+    os.getenv("STEP_CHECKPOINT_PURGE_INTERVAL_SECONDS", "60")
+)
@@ -1,3 +1,69 @@
-from typing import Any, Dict
+from collections import ChainMap
+from types import MappingProxyType
+from typing import Annotated, Any, Callable, Dict, Mapping
+
+from src.sequence.types import StateReducerName
 
 SessionState = Dict[str, Any]
+
+# Read-only view of a step's inputs, layered over the state instead of a copy
+StepContext = Mapping[str, Any]
+
+StateReducer = Callable[[SessionState, SessionState], SessionState]
+
+
+def _append(current: Any, update: Any) -> list[Any]:
+    items = update if isinstance(update, list) else [update]
+    return [*(current or []), *items]
+
+
+def _merge(current: Any, update: Any) -> dict[str, Any]:
+    return {**(current or {}), **update}
+
+
+def _add(current: Any, update: Any) -> Any:
+    return update if current is None else current + update
+
+
+# Combine a key's current value with a step's write; absent keys are None
+KEY_REDUCERS: dict[str, Callable[[Any, Any], Any]] = {
+    "replace": lambda _current, update: update,
+    "append": _append,
+    "merge": _merge,
+    "add": _add,
+}
+
+
+def make_state_reducer(reducers: Mapping[str, StateReducerName]) -> StateReducer:
+    """
+    Root reducer for the graph state: nodes return only the keys they wrote,
+    which are applied with the key's reducer, "replace" by default. LangGraph
+    hands the same state object to every step of a superstep, so it is never
+    written in place: writes go to a shallow copy, values are shared.
+    """
+    key_reducers = {key: KEY_REDUCERS[name] for key, name in reducers.items()}
+
+    def reduce(current: SessionState, update: SessionState) -> SessionState:
+        state = {**current}
+        for key, value in update.items():
+            reducer = key_reducers.get(key)
+            state[key] = value if reducer is None else reducer(state.get(key), value)
+        return state
+
+    return reduce
+
+
+def session_state_schema(reducers: Mapping[str, StateReducerName]) -> Any:
+    """
+    State schema for the graph, merging node updates instead of replacing state.
+    """
+    return Annotated[dict, make_state_reducer(reducers)]
+
+
+def layered_context(*layers: Mapping[str, Any]) -> StepContext:
+    """
+    Read-only view looking keys up in the given layers, the first one holding
+    a key wins. Building it costs O(layers) whatever the size of the state.
+    """
+    # ChainMap only writes to its first layer, and the proxy never writes
+    return MappingProxyType(ChainMap(*layers))  # type: ignore[arg-type]
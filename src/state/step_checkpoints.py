@@ -0,0 +1,161 @@
+import asyncio
+import json
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+
+from src.state.constants import (
+    STEP_CHECKPOINT_BACKEND,
+    STEP_CHECKPOINT_PATH,
+    STEP_CHECKPOINT_PURGE_INTERVAL_SECONDS,
+    STEP_CHECKPOINT_RETENTION_SECONDS,
+)
+from src.state.session_state import SessionState
+
+# (client_id, sequence_id, run_id): run ids are chosen by callers, so they
+# are only unique per client
+RunKey = tuple[str, str, str]
+
+
+class StepCheckpointStore(ABC):
+    """
+    Storage for the state each completed step wrote, per client, sequence and
+    run id. Checkpoints older than the retention window are ignored, and saves
+    purge them at most once per purge interval.
+    """
+
+    @abstractmethod
+    async def load(self, run: RunKey) -> dict[str, SessionState]: ...
+
+    @abstractmethod
+    async def save(self, run: RunKey, step_id: str, delta: SessionState) -> None: ...
+
+
+class InMemoryStepCheckpointStore(StepCheckpointStore):
+    def __init__(
+        self,
+        retention_seconds: float = STEP_CHECKPOINT_RETENTION_SECONDS,
+        purge_interval_seconds: float = STEP_CHECKPOINT_PURGE_INTERVAL_SECONDS,
+    ):
+        self._retention_seconds = retention_seconds
+        self._purge_interval_seconds = purge_interval_seconds
+        self._next_purge = 0.0
+        # run -> step_id -> (delta, created_at)
+        self._runs: dict[RunKey, dict[str, tuple[SessionState, float]]] = {}
+
+    async def load(self, run: RunKey) -> dict[str, SessionState]:
+        cutoff = time.time() - self._retention_seconds
+        return {
+            step_id: delta
+            for step_id, (delta, created_at) in self._runs.get(run, {}).items()
+            if created_at > cutoff
+        }
+
+    async def save(self, run: RunKey, step_id: str, delta: SessionState) -> None:
+        now = time.time()
+        if now >= self._next_purge:
+            self._next_purge = now + self._purge_interval_seconds
+            self._purge(now - self._retention_seconds)
+        self._runs.setdefault(run, {})[step_id] = (delta, now)
+
+    def _purge(self, cutoff: float) -> None:
+        for key in [
+            key
+            for key, steps in self._runs.items()
+            if max(created_at for _, created_at in steps.values()) <= cutoff
+        ]:
+            del self._runs[key]
+
+
+class SQLiteStepCheckpointStore(StepCheckpointStore):
+    """
+    Local stand-in for a durable store, so a retry handled by another process
+    on the host can resume. Queries run in a worker thread.
+    """
+
+    def __init__(
+        self,
+        path: str = STEP_CHECKPOINT_PATH,
+        retention_seconds: float = STEP_CHECKPOINT_RETENTION_SECONDS,
+        purge_interval_seconds: float = STEP_CHECKPOINT_PURGE_INTERVAL_SECONDS,
+    ):
+        self._retention_seconds = retention_seconds
+        self._purge_interval_seconds = purge_interval_seconds
+        self._next_purge = 0.0
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS run_step_checkpoints ("
+            "client_id TEXT NOT NULL, sequence_id TEXT NOT NULL, "
+            "run_id TEXT NOT NULL, step_id TEXT NOT NULL, delta TEXT NOT NULL, "
+            "created_at REAL NOT NULL, "
+            "PRIMARY KEY (client_id, sequence_id, run_id, step_id))"
+        )
+        self._connection.commit()
+
+    async def load(self, run: RunKey) -> dict[str, SessionState]:
+        rows = await asyncio.to_thread(self._load, run)
+        return {step_id: json.loads(delta) for step_id, delta in rows}
+
+    async def save(self, run: RunKey, step_id: str, delta: SessionState) -> None:
+        await asyncio.to_thread(
+            self._save, run, step_id, json.dumps(delta, default=str)
+        )
+
+    def _load(self, run: RunKey) -> list[tuple[str, str]]:
+        with self._lock:
+            return self._connection.execute(
+                "SELECT step_id, delta FROM run_step_checkpoints WHERE client_id = ? "
+                "AND sequence_id = ? AND run_id = ? AND created_at > ?",
+                (*run, time.time() - self._retention_seconds),
+            ).fetchall()
+
+    def _save(self, run: RunKey, step_id: str, delta: str) -> None:
+        now = time.time()
+        with self._lock:
+            self._connection.execute(
+                "INSERT OR REPLACE INTO run_step_checkpoints VALUES (?, ?, ?, ?, ?, ?)",
+                (*run, step_id, delta, now),
+            )
+            if now >= self._next_purge:
+                self._next_purge = now + self._purge_interval_seconds
+                self._connection.execute(
+                    "DELETE FROM run_step_checkpoints WHERE created_at <= ?",
+                    (now - self._retention_seconds,),
+                )
+            self._connection.commit()
+
+
+def create_step_checkpoint_store(
+    backend: str = STEP_CHECKPOINT_BACKEND,
+) -> StepCheckpointStore:
+    if backend == "memory":
+        return InMemoryStepCheckpointStore()
+    if backend == "sqlite":
+        return SQLiteStepCheckpointStore()
+    raise ValueError(f"Unknown step checkpoint backend {backend}")
+
+
+class RunCheckpoint:
+    """
+    Checkpoints of one run, handed to the graph nodes through the config.
+    Steps found in `completed` replay their recorded state instead of running.
+    """
+
+    def __init__(
+        self,
+        store: StepCheckpointStore,
+        run: RunKey,
+        completed: dict[str, SessionState],
+    ):
+        self._store = store
+        self.run = run
+        self.completed = completed
+
+    @classmethod
+    async def resume(cls, store: StepCheckpointStore, run: RunKey) -> "RunCheckpoint":
+        return cls(store, run, await store.load(run))
+
+    async def record(self, step_id: str, delta: SessionState) -> None:
+        await self._store.save(self.run, step_id, delta)
@@ -0,0 +1,90 @@
+import json
+import traceback
+from http import HTTPStatus
+from typing import AsyncIterator
+
+from starlette.applications import Starlette
+from starlette.responses import PlainTextResponse, StreamingResponse
+from starlette.routing import Request, Route
+
+from src.metrics.sinks import PrometheusMetricsSink
+from src.runtime.runtime_context import get_runtime_context
+from src.sequence.sequence_runner import SequenceRunner
+from src.types import SequenceRunnerPayload, SequenceStreamEvent
+
+
+def encode_stream_event(event: SequenceStreamEvent, sse: bool) -> str:
+    data = json.dumps(event)
+    if sse:
+        return f"event: {event['event']}\ndata: {data}\n\n"
+    return data + "\n"
+
+
+async def stream_handler(request: Request) -> StreamingResponse:
+    """
+    Streams a run as NDJSON, or as server-sent events when the client accepts
+    text/event-stream: one event per completed step, agent token chunks as
+    they arrive, then the final state or the error that ended the run, and
+    the run's metrics when the payload asks for them.
+    """
+    runtime = get_runtime_context()
+    setup_timing = runtime.prepare_invocation(load_secrets=False)
+    print(json.dumps({"event": "runtime_setup", **setup_timing}))
+    payload: SequenceRunnerPayload = await request.json()
+    sse = "text/event-stream" in request.headers.get("accept", "")
+
+    sequence_runner = SequenceRunner(
+        payload["sequence_id"],
+        payload["client_id"],
+        payload["product_id"],
+        payload.get("initial_state"),
+        runtime=runtime,
+        run_id=payload.get("run_id"),
+    )
+
+    async def body() -> AsyncIterator[str]:
+        try:
+            startup_report = await sequence_runner.startup(load_secrets=True)
+            print(json.dumps({"event": "startup", **startup_report}))
+            async for event in sequence_runner.stream_sequence_async():
+                yield encode_stream_event(event, sse)
+        except Exception as e:
+            print(traceback.format_exc())
+            yield encode_stream_event({"event": "error", "message": str(e)}, sse)
+        if payload.get("include_metrics") and sequence_runner.run_summary:
+            yield encode_stream_event(
+                {"event": "metrics", "metrics": sequence_runner.run_summary}, sse
+            )
+        runtime.flush_tracing()
+
+    return StreamingResponse(
+        body(), media_type="text/event-stream" if sse else "application/x-ndjson"
+    )
+
+
+async def metrics_handler(_request: Request) -> PlainTextResponse:
+    """
+    Prometheus scrape endpoint, served when METRICS_SINKS includes prometheus.
+    """
+    sinks = [
+        sink
+        for sink in get_runtime_context().metrics_sinks
+        if isinstance(sink, PrometheusMetricsSink)
+    ]
+    if not sinks:
+        return PlainTextResponse("", status_code=HTTPStatus.NOT_FOUND)
+    return PlainTextResponse(
+        "".join(sink.render() for sink in sinks),
+        media_type="text/plain; version=0.0.4",
+    )
+
+
+# Served by an ASGI server (e.g. uvicorn src.streaming_app:streaming_app), since
+# the Lambda handler can only return the final response. Kept out of src.app so
+# the Lambda path never imports starlette
+streaming_app = Starlette(
+    routes=[
+        Route("/process/stream", stream_handler, methods=["POST"]),
+        Route("/metrics", metrics_handler, methods=["GET"]),
+    ]
+)
@@ -3,11 +3,35 @@ import sys
 
 from mcp import StdioServerParameters
 
-env = os.environ.copy()
-env["PYTHONPATH"] = (
-    os.environ.get("LAMBDA_TASK_ROOT", "") + ":" + env.get("PYTHONPATH", "")
+# Number of MCP server processes kept alive per container. Concurrent runs
+# share them, so one is enough unless tool calls saturate a single process
+MCP_POOL_SIZE = int(os.getenv("MCP_POOL_SIZE", "1"))
+# A borrowed session idle for longer than this is pinged before use
+MCP_HEALTH_CHECK_INTERVAL_SECONDS = float(
+    os.getenv("MCP_HEALTH_CHECK_INTERVAL_SECONDS", "30")
 )
-
-SERVER_PARAMETERS = StdioServerParameters(
-    command=f"{sys.executable}", args=["mcp-server/server.py"], env=env
+MCP_HEALTH_CHECK_TIMEOUT_SECONDS = float(
+    os.getenv("MCP_HEALTH_CHECK_TIMEOUT_SECONDS", "5")
 )
+
+
+def get_server_parameters() -> StdioServerParameters:
+    """
+    Built on demand so the server process inherits secrets that were loaded
+    into the environment after import time.
+    """
+    env = os.environ.copy()
+    env["PYTHONPATH"] = (
+        os.environ.get("LAMBDA_TASK_ROOT", "") + ":" + env.get("PYTHONPATH", "")
+    )
+    return StdioServerParameters(
+        command=f"{sys.executable}", args=["mcp-server/server.py"], env=env
+    )
+
+
+# Memoized results of tools marked cacheable by a sequence
+TOOL_CACHE_MAX_ENTRIES = int(os.getenv("TOOL_CACHE_MAX_ENTRIES", "5000"))
+TOOL_CACHE_MAX_ENTRY_BYTES = int(os.getenv("TOOL_CACHE_MAX_ENTRY_BYTES", "65536"))
+
+# RunnableConfig["configurable"] key carrying the sequence's tool cache policies
+TOOL_CACHE_POLICIES_CONFIG_KEY = "tool_cache_policies"
@@ -0,0 +1,306 @@
+import asyncio
+import hashlib
+import json
+import time
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Callable
+
+import anyio
+from langchain_core.tools import BaseTool
+from langchain_mcp_adapters.tools import load_mcp_tools
+from mcp import ClientSession, StdioServerParameters
+from mcp.client.stdio import stdio_client
+from mcp.shared.exceptions import McpError
+from mcp.types import ServerNotification, ToolListChangedNotification
+
+from src.tools.constants import (
+    MCP_HEALTH_CHECK_INTERVAL_SECONDS,
+    MCP_HEALTH_CHECK_TIMEOUT_SECONDS,
+    MCP_POOL_SIZE,
+    get_server_parameters,
+)
+
+# Errors of the session or the process behind it, rather than of a tool call
+TRANSPORT_ERRORS = (
+    McpError,
+    OSError,
+    anyio.BrokenResourceError,
+    anyio.ClosedResourceError,
+    anyio.EndOfStream,
+)
+
+
+def is_transport_error(error: BaseException) -> bool:
+    if isinstance(error, BaseExceptionGroup):
+        return any(is_transport_error(e) for e in error.exceptions)
+    return isinstance(error, TRANSPORT_ERRORS)
+
+
+def fingerprint_tools(tools: list[BaseTool]) -> str:
+    """
+    Stable hash of the tool names, descriptions and argument schemas.
+    """
+    digest = hashlib.sha256()
+    for mcp_tool in sorted(tools, key=lambda t: t.name):
+        schema = mcp_tool.args_schema
+        if not isinstance(schema, dict):
+            schema = mcp_tool.args
+        digest.update(
+            json.dumps(
+                [mcp_tool.name, mcp_tool.description, schema],
+                sort_keys=True,
+                default=str,
+            ).encode()
+        )
+    return digest.hexdigest()
+
+
+class PooledMCPServer:
+    """
+    A long-lived MCP server process together with its client session and the
+    tool list discovered on it. The stdio transport is owned by a background
+    task, since its context managers must be entered and exited by one task.
+    The session multiplexes requests, so several runs can borrow it at once.
+    """
+
+    def __init__(
+        self,
+        index: int,
+        server_parameters_factory: Callable[[], StdioServerParameters],
+    ):
+        self.index = index
+        self.session: ClientSession | None = None
+        self.tools: list[BaseTool] = []
+        self.tools_by_name: dict[str, BaseTool] = {}
+        self.tools_fingerprint = ""
+        self.restarts = 0
+        self.borrowers = 0
+
+        self._server_parameters_factory = server_parameters_factory
+        self._task: asyncio.Task[None] | None = None
+        self._ready = asyncio.Event()
+        self._stop = asyncio.Event()
+        self._error: BaseException | None = None
+        self._tools_stale = False
+        self._last_healthy_at = 0.0
+        # One borrower at a time checks the health, the others wait for it
+        self._health_lock = asyncio.Lock()
+
+    @property
+    def is_running(self) -> bool:
+        return (
+            self._task is not None
+            and not self._task.done()
+            and self.session is not None
+        )
+
+    async def start(self) -> None:
+        self._ready = asyncio.Event()
+        self._stop = asyncio.Event()
+        self._error = None
+        self._task = asyncio.create_task(self._serve())
+        await self._ready.wait()
+        if not self.is_running:
+            raise RuntimeError(
+                f"MCP server #{self.index} failed to start: {self._error!r}"
+            )
+
+    async def stop(self) -> None:
+        self._stop.set()
+        if self._task is not None:
+            try:
+                await self._task
+            except Exception:
+                # A crashed server has nothing left to clean up
+                pass
+        self._task = None
+        self.session = None
+
+    async def restart(self) -> None:
+        await self.stop()
+        self.restarts += 1
+        await self.start()
+
+    async def ensure_healthy(self) -> None:
+        """
+        Restarts a crashed process, pings a session that has been idle for a
+        while and reloads the tool list once the server reported a change.
+        A restart fails the calls other borrowers have in flight, which a
+        session failing the ping would not answer anyway.
+        """
+        async with self._health_lock:
+            if not self.is_running:
+                await self.restart()
+            elif (
+                time.monotonic() - self._last_healthy_at
+                > MCP_HEALTH_CHECK_INTERVAL_SECONDS
+            ):
+                try:
+                    await asyncio.wait_for(
+                        self._require_session().send_ping(),
+                        MCP_HEALTH_CHECK_TIMEOUT_SECONDS,
+                    )
+                except Exception:
+                    await self.restart()
+
+            if self._tools_stale:
+                await self._load_tools()
+            self._last_healthy_at = time.monotonic()
+
+    def mark_suspect(self) -> None:
+        """
+        Forces a health check before the next borrower uses this server.
+        """
+        self._last_healthy_at = 0.0
+
+    async def _serve(self) -> None:
+        try:
+            async with (
+                stdio_client(self._server_parameters_factory()) as (r, w),
+                ClientSession(r, w, message_handler=self._on_message) as session,
+            ):
+                await session.initialize()
+                self.session = session
+                await self._load_tools()
+                self._last_healthy_at = time.monotonic()
+                self._ready.set()
+                await self._stop.wait()
+        except Exception as e:
+            self._error = e
+        finally:
+            self.session = None
+            self._ready.set()
+
+    async def _load_tools(self) -> None:
+        self.tools = await load_mcp_tools(self._require_session())
+        self.tools_by_name = {mcp_tool.name: mcp_tool for mcp_tool in self.tools}
+        self.tools_fingerprint = fingerprint_tools(self.tools)
+        self._tools_stale = False
+
+    async def _on_message(self, message: Any) -> None:
+        if isinstance(message, ServerNotification) and isinstance(
+            message.root, ToolListChangedNotification
+        ):
+            self._tools_stale = True
+
+    def _require_session(self) -> ClientSession:
+        if self.session is None:
+            raise RuntimeError(f"MCP server #{self.index} is not running")
+        return self.session
+
+
+class MCPSessionPool:
+    """
+    Keeps a fixed number of MCP server processes alive across sequence runs.
+    Runs borrow a server through acquire() for their whole duration, but not
+    exclusively: each run gets the server with the fewest borrowers, and the
+    runs sharing a server send their tool calls over its one session. More
+    servers spread the tool calls of concurrent runs over more processes.
+    """
+
+    def __init__(
+        self,
+        size: int = MCP_POOL_SIZE,
+        server_parameters_factory: Callable[
+            [], StdioServerParameters
+        ] = get_server_parameters,
+    ):
+        if size < 1:
+            raise ValueError("MCP session pool size must be at least 1")
+        self._size = size
+        self._server_parameters_factory = server_parameters_factory
+        self._servers: list[PooledMCPServer] = []
+        # Recycled servers, stopped once their last borrower is done
+        self._retired: list[PooledMCPServer] = []
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._start_lock: asyncio.Lock | None = None
+
+    @property
+    def servers(self) -> list[PooledMCPServer]:
+        return list(self._servers)
+
+    @property
+    def started(self) -> bool:
+        """
+        Whether the servers were started on the running event loop.
+        """
+        return bool(self._servers) and self._loop is asyncio.get_running_loop()
+
+    async def start(self) -> None:
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            # Servers started on another (finished) event loop died with it
+            self._loop = loop
+            self._servers = []
+            self._retired = []
+            self._start_lock = asyncio.Lock()
+
+        assert self._start_lock is not None
+        async with self._start_lock:
+            if self._servers:
+                return
+            await asyncio.gather(
+                *(
+                    self._stop_retired(server)
+                    for server in list(self._retired)
+                    if not server.borrowers
+                )
+            )
+            servers = [
+                PooledMCPServer(index, self._server_parameters_factory)
+                for index in range(self._size)
+            ]
+            try:
+                await asyncio.gather(*(server.start() for server in servers))
+            except BaseException:
+                # Also stops the servers that did start, or their processes
+                # would outlive the failed or cancelled start
+                await asyncio.gather(
+                    *(server.stop() for server in servers), return_exceptions=True
+                )
+                raise
+            self._servers = servers
+
+    @asynccontextmanager
+    async def acquire(self) -> AsyncIterator[PooledMCPServer]:
+        await self.start()
+        server = min(self._servers, key=lambda server: server.borrowers)
+        server.borrowers += 1
+        try:
+            try:
+                await server.ensure_healthy()
+            except BaseException:
+                server.mark_suspect()
+                raise
+            try:
+                yield server
+            except Exception as e:
+                if is_transport_error(e):
+                    server.mark_suspect()
+                raise
+        finally:
+            server.borrowers -= 1
+            if server in self._retired and not server.borrowers:
+                await self._stop_retired(server)
+
+    def recycle(self) -> None:
+        """
+        Replaces the servers with new processes, started by the next
+        acquire(), e.g. so they pick up rotated secrets from the environment.
+        Runs holding a server keep using it until they are done.
+        """
+        self._retired.extend(self._servers)
+        self._servers = []
+
+    async def _stop_retired(self, server: PooledMCPServer) -> None:
+        if server in self._retired:
+            self._retired.remove(server)
+            await server.stop()
+
+    async def close(self) -> None:
+        await asyncio.gather(
+            *(server.stop() for server in self._servers + self._retired),
+            return_exceptions=True,
+        )
+        self._servers = []
+        self._retired = []
@@ -1,18 +1,67 @@
 import asyncio
-from typing import Any
+import time
+from typing import Any, Mapping
 
 from langchain_core.tools import BaseTool
 
+from src.metrics.run_metrics import record_tool_call
+from src.sequence.types import ToolCachePolicy
+from src.tools.tool_result_cache import ToolResultCache
+
 
 class ToolInvoker:
+    def __init__(self, result_cache: ToolResultCache | None = None):
+        self._result_cache = result_cache
+
+    async def invoke_cached(
+        self,
+        step_tool: BaseTool,
+        tool_context: Mapping[str, Any],
+        cache_policy: ToolCachePolicy | None = None,
+    ) -> Any:
+        """
+        Invokes a tool, serving results of tools with a cache policy from the
+        result cache. Cache keys use the filtered arguments and, unless the
+        policy is global, the client_id of the context. The round trip is
+        added to the metrics of the running step.
+        """
+        started = time.perf_counter()
+        try:
+            return await self._invoke_cached(step_tool, tool_context, cache_policy)
+        finally:
+            record_tool_call(time.perf_counter() - started)
+
+    async def _invoke_cached(
+        self,
+        step_tool: BaseTool,
+        tool_context: Mapping[str, Any],
+        cache_policy: ToolCachePolicy | None,
+    ) -> Any:
+        if cache_policy is None or self._result_cache is None:
+            return await self.invoke(step_tool, tool_context)
+
+        filtered_context = self.filter_context(step_tool, tool_context)
+        namespace = (
+            ""
+            if cache_policy.get("namespace") == "global"
+            else str(tool_context.get("client_id", ""))
+        )
+        key = self._result_cache.make_key(namespace, step_tool.name, filtered_context)
+        return await self._result_cache.get_or_call(
+            key, cache_policy, lambda: self.invoke(step_tool, filtered_context)
+        )
+
+    @staticmethod
+    def filter_context(
+        step_tool: BaseTool, tool_context: Mapping[str, Any]
+    ) -> dict[str, Any]:
+        # Only the keys in step_tool.args_schema, looked up rather than scanning
+        # the whole (layered) context
+        return {key: tool_context[key] for key in step_tool.args if key in tool_context}
+
     @staticmethod
-    async def invoke(step_tool: BaseTool, tool_context: dict) -> Any:
-        # Filter the tool_context to only include keys that are in step_tool.args_schema
-        filtered_context = {
-            key: value
-            for key, value in tool_context.items()
-            if key in step_tool.args.keys()
-        }
+    async def invoke(step_tool: BaseTool, tool_context: Mapping[str, Any]) -> Any:
+        filtered_context = ToolInvoker.filter_context(step_tool, tool_context)
 
         # Async entrypoint
         if callable(getattr(step_tool, "ainvoke", None)):
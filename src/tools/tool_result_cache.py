@@ -0,0 +1,98 @@
+import asyncio
+import json
+from typing import Any, Awaitable, Callable
+
+from src.cache.hashing import stable_hash
+from src.cache.lru_cache import LRUCache
+from src.sequence.types import ToolCachePolicy
+from src.tools.constants import TOOL_CACHE_MAX_ENTRIES, TOOL_CACHE_MAX_ENTRY_BYTES
+
+
+class _InFlightCall:
+    """
+    An upstream call shared by every caller of the same key, and how many of
+    them still wait for it.
+    """
+
+    __slots__ = ("task", "waiters")
+
+    def __init__(self, task: asyncio.Task[Any]):
+        self.task = task
+        self.waiters = 0
+
+
+class ToolResultCache:
+    """
+    Memoizes results of idempotent tools for the TTL of their policy, and
+    coalesces concurrent identical calls into a single upstream request.
+    The request runs in a task of its own, so a cancelled caller, e.g. a
+    timed out step or a losing hedge, leaves it to the other callers. It is
+    only cancelled once none of them waits any more.
+    """
+
+    def __init__(self, max_entries: int = TOOL_CACHE_MAX_ENTRIES):
+        # Results are wrapped in a tuple, so a cached None is still a hit
+        self._cache: LRUCache[str, tuple[Any]] = LRUCache(max_entries)
+        self._in_flight: dict[str, _InFlightCall] = {}
+        self.coalesced = 0
+        self.oversized = 0
+
+    @staticmethod
+    def make_key(namespace: str, tool_name: str, arguments: dict[str, Any]) -> str:
+        return stable_hash([namespace, tool_name, arguments])
+
+    async def get_or_call(
+        self,
+        key: str,
+        policy: ToolCachePolicy,
+        call: Callable[[], Awaitable[Any]],
+    ) -> Any:
+        cached = self._cache.get(key)
+        if cached is not None:
+            return cached[0]
+
+        in_flight = self._in_flight.get(key)
+        if in_flight is None:
+            in_flight = _InFlightCall(
+                asyncio.create_task(self._call_and_store(key, policy, call))
+            )
+            self._in_flight[key] = in_flight
+        else:
+            self.coalesced += 1
+
+        in_flight.waiters += 1
+        try:
+            return await asyncio.shield(in_flight.task)
+        finally:
+            in_flight.waiters -= 1
+            if not in_flight.waiters and not in_flight.task.done():
+                # Later callers start a call of their own
+                self._forget(key, in_flight.task)
+                in_flight.task.cancel()
+
+    async def _call_and_store(
+        self, key: str, policy: ToolCachePolicy, call: Callable[[], Awaitable[Any]]
+    ) -> Any:
+        try:
+            result = await call()
+        finally:
+            self._forget(key, asyncio.current_task())
+
+        max_entry_bytes = policy.get("max_entry_bytes", TOOL_CACHE_MAX_ENTRY_BYTES)
+        if len(json.dumps(result, default=str).encode()) <= max_entry_bytes:
+            self._cache.put(key, (result,), policy["ttl_seconds"])
+        else:
+            self.oversized += 1
+        return result
+
+    def _forget(self, key: str, task: asyncio.Task[Any] | None) -> None:
+        in_flight = self._in_flight.get(key)
+        if in_flight is not None and in_flight.task is task:
+            del self._in_flight[key]
+
+    def stats(self) -> dict[str, int | float]:
+        return {
+            **self._cache.stats(),
+            "coalesced": self.coalesced,
+            "oversized": self.oversized,
+        }
@@ -1,5 +1,7 @@
 from http import HTTPStatus
-from typing import Any, Dict, NotRequired, TypedDict
+from typing import Any, Dict, Literal, NotRequired, TypedDict
+
+from src.metrics.types import RunSummary
 
 
 class SequenceRunnerPayload(TypedDict):
@@ -7,8 +9,24 @@ class SequenceRunnerPayload(TypedDict):
     client_id: str
     product_id: str
     initial_state: NotRequired[Dict[str, Any]]
+    # Retries with the same run_id resume after the last completed step
+    run_id: NotRequired[str]
+    # Attach the run's per-step metrics summary to the response
+    include_metrics: NotRequired[bool]
 
 
 class SequenceRunnerResponse(TypedDict):
     statusCode: HTTPStatus
     body: str
+
+
+# Incremental result of a streamed run: a step's state delta, an agent's token
+# chunk, the final state, the run's metrics, or the error that ended the run
+class SequenceStreamEvent(TypedDict):
+    event: Literal["step", "token", "end", "metrics", "error"]
+    step: NotRequired[str]
+    delta: NotRequired[Dict[str, Any]]
+    content: NotRequired[str]
+    state: NotRequired[Dict[str, Any]]
+    message: NotRequired[str]
+    metrics: NotRequired[RunSummary]
@@ -0,0 +1,39 @@
+import asyncio
+from typing import Iterator
+
+import pytest
+
+from src.runtime.runtime_context import RuntimeContext
+from tests.support import make_runtime
+
+
+def pytest_configure(config: pytest.Config) -> None:
+    config.addinivalue_line(
+        "markers", "runtime(**settings): make_runtime() arguments of the test's runtime"
+    )
+
+
+@pytest.fixture
+def runner() -> Iterator[asyncio.Runner]:
+    # One loop for the test and its fixtures, pooled servers are bound to it
+    with asyncio.Runner() as runner:
+        yield runner
+
+
+@pytest.fixture
+def cold_runtime(
+    request: pytest.FixtureRequest, runner: asyncio.Runner
+) -> Iterator[RuntimeContext]:
+    """
+    A runtime whose MCP servers are not started yet, closed after the test.
+    """
+    marker = request.node.get_closest_marker("runtime")
+    runtime = make_runtime(**(marker.kwargs if marker else {}))
+    yield runtime
+    runner.run(runtime.mcp_pool.close())
+
+
+@pytest.fixture
+def runtime(cold_runtime: RuntimeContext, runner: asyncio.Runner) -> RuntimeContext:
+    runner.run(cold_runtime.mcp_pool.start())
+    return cold_runtime
@@ -0,0 +1,25 @@
+import os
+import sys
+from pathlib import Path
+from typing import Callable
+
+from mcp import StdioServerParameters
+
+FAKE_MCP_SERVER = Path(__file__).with_name("fake_mcp_server.py")
+
+
+def fake_server_parameters(
+    tool_latency_ms: float,
+) -> Callable[[], StdioServerParameters]:
+    """
+    Spawns the fake MCP server, each tool call taking tool_latency_ms.
+    """
+
+    def build() -> StdioServerParameters:
+        env = os.environ.copy()
+        env["BENCH_TOOL_LATENCY_MS"] = str(tool_latency_ms)
+        return StdioServerParameters(
+            command=sys.executable, args=[str(FAKE_MCP_SERVER)], env=env
+        )
+
+    return build
@@ -0,0 +1,84 @@
+import asyncio
+import json
+import os
+from typing import Any
+
+from mcp.server.fastmcp import FastMCP
+
+# Simulated round trip of every tool call, on top of the stdio transport
+TOOL_LATENCY_MS = float(os.getenv("BENCH_TOOL_LATENCY_MS", "0"))
+# Distinct bench-echo-<i> tools, one per tool step of the synthetic sequences
+ECHO_TOOL_COUNT = int(os.getenv("BENCH_ECHO_TOOL_COUNT", "128"))
+
+mcp = FastMCP("benchmark-tools", log_level="WARNING")
+
+
+async def _simulate_latency() -> None:
+    if TOOL_LATENCY_MS:
+        await asyncio.sleep(TOOL_LATENCY_MS / 1000)
+
+
+# Tools of the sequences in src.data.mock_db
+@mcp.tool(name="demo-detect_opt_out")
+async def detect_opt_out(incoming_message: dict[str, Any]) -> bool:
+    await _simulate_latency()
+    return "stop" in str(incoming_message.get("content", "")).lower()
+
+
+@mcp.tool(name="demo-get_journey_instruction")
+async def get_journey_instruction(client_id: str) -> str:
+    await _simulate_latency()
+    return f"Offer {client_id} customers a test drive before discussing price."
+
+
+@mcp.tool(name="demo-append_signature")
+async def append_signature(reply: dict[str, Any]) -> str:
+    await _simulate_latency()
+    return json.dumps({"signed_reply": reply, "signature": "The Benchmark Team"})
+
+
+@mcp.tool(name="demo-send_reply")
+async def send_reply(append_signature_result: str, client_id: str) -> str:
+    await _simulate_latency()
+    return json.dumps({"sent": True, "client_id": client_id})
+
+
+def _register_lookup_tool(name: str) -> None:
+    async def lookup(client_id: str = "") -> str:
+        await _simulate_latency()
+        return json.dumps({"tool": name, "client_id": client_id, "result": "ok"})
+
+    mcp.tool(name=name, description=f"Benchmark stand-in for {name}")(lookup)
+
+
+for _name in (
+    "demo-get_conversation_history",
+    "demo-get_appointment_hours",
+    "demo-get_inventory_information",
+    "demo-schedule_appointment",
+    "demo-get_current_time",
+):
+    _register_lookup_tool(_name)
+
+
+# Tools of the synthetic sequences in benchmarks.workloads
+def _register_echo_tool(index: int) -> None:
+    async def echo(value: Any = None) -> str:
+        await _simulate_latency()
+        return json.dumps({"echo": value, "index": index})
+
+    mcp.tool(name=f"bench-echo-{index}", description="Echoes its value")(echo)
+
+
+for _index in range(ECHO_TOOL_COUNT):
+    _register_echo_tool(_index)
+
+
+@mcp.tool(name="bench-join", description="Joins the branches of a wide sequence")
+async def join(branches: int = 0) -> str:
+    await _simulate_latency()
+    return json.dumps({"joined": branches})
+
+
+if __name__ == "__main__":
+    mcp.run()
@@ -0,0 +1,83 @@
+import copy
+from typing import Any, cast
+
+from benchmarks.harness import build_runtime
+from benchmarks.workloads import BENCH_CLIENT_ID, bench_agent
+from src.agent.types import Agent
+from src.runtime.runtime_context import RuntimeContext
+from src.sequence.sequence_runner import SequenceRunner
+from src.sequence.types import Sequence, StepBase
+from src.state.session_state import SessionState
+
+MESSAGE: SessionState = {
+    "incoming_message": {"content": "Do you have the SUV in stock?"}
+}
+
+
+def make_runtime(
+    model_latency_ms: float = 0, tool_latency_ms: float = 0
+) -> RuntimeContext:
+    """
+    A runtime over scripted models and the fake MCP server, see
+    benchmarks.harness.
+    """
+    runtime, _ = build_runtime(
+        {
+            "model_latency_ms": model_latency_ms,
+            "tool_latency_ms": tool_latency_ms,
+            "prompt_tokens": 200,
+            "completion_tokens": 40,
+            "cached_tokens": 0,
+            "long_length": 4,
+            "wide_width": 4,
+        }
+    )
+    return runtime
+
+
+def echo_step(
+    index: int, value: str = "incoming_message[content]", **step: Any
+) -> StepBase:
+    """
+    A step calling the fake server's bench-echo-<index> tool with the value
+    at the given state path, writing the echo to step_<index>.
+    """
+    echo: dict[str, Any] = {
+        "type": "tool",
+        "id": f"bench-echo-{index}",
+        "arguments": {"value": {"type": "dynamic", "value": value}},
+        "output_key": f"step_{index}",
+    }
+    return cast(StepBase, {**echo, **step})
+
+
+async def put_sequence(
+    runtime: RuntimeContext, sequence: Sequence, agent_ids: list[str] = []
+) -> None:
+    """
+    Stores the sequence, and a scripted agent for each of the agent ids.
+    """
+    store = runtime.config_loader.store
+    await store.put("sequence", sequence["id"], sequence)
+    for agent_id in agent_ids:
+        agent: Agent = bench_agent(agent_id)
+        await store.put("agent", agent_id, agent)
+
+
+async def run_sequence(
+    runtime: RuntimeContext,
+    sequence_id: str,
+    initial_state: SessionState | None = None,
+    run_id: str | None = None,
+    client_id: str = BENCH_CLIENT_ID,
+) -> tuple[SessionState, SequenceRunner]:
+    sequence_runner = SequenceRunner(
+        sequence_id,
+        client_id,
+        "sales_ai",
+        copy.deepcopy(MESSAGE if initial_state is None else initial_state),
+        runtime=runtime,
+        run_id=run_id,
+    )
+    await sequence_runner.startup()
+    return await sequence_runner.run_sequence_async(), sequence_runner
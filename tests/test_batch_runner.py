@@ -0,0 +1,80 @@
+import asyncio
+import json
+from pathlib import Path
+from typing import Any, Iterator
+
+import pytest
+
+from benchmarks.workloads import BENCH_CLIENT_ID
+from src.batch.batch_runner import BatchRunner, PayloadError, load_payloads
+from src.runtime.runtime_context import RuntimeContext
+from src.types import SequenceRunnerPayload
+from tests.support import MESSAGE
+
+PAYLOAD: SequenceRunnerPayload = {
+    "sequence_id": "wide-4",
+    "client_id": BENCH_CLIENT_ID,
+    "product_id": "sales_ai",
+    "initial_state": MESSAGE,
+}
+
+
+def write_lines(path: Path, lines: list[str]) -> str:
+    path.write_text("\n".join(lines) + "\n")
+    return str(path)
+
+
+def collect(
+    runner: asyncio.Runner, batch_runner: BatchRunner, payloads: Any
+) -> list[Any]:
+    async def run() -> list[Any]:
+        return [result async for result in batch_runner.run(payloads)]
+
+    # A batch that loses track of a worker never finishes
+    return runner.run(asyncio.wait_for(run(), timeout=30))
+
+
+def test_bad_lines_become_payload_errors(tmp_path: Path) -> None:
+    path = write_lines(
+        tmp_path / "payloads.jsonl",
+        [
+            json.dumps(PAYLOAD),
+            "{not json",
+            "[1, 2]",
+            json.dumps({"body": json.dumps(PAYLOAD)}),
+            json.dumps({"body": "{not json"}),
+        ],
+    )
+    items = list(load_payloads(path))
+    assert items[0] == PAYLOAD
+    assert items[3] == PAYLOAD
+    assert [type(item) for item in items[1:3] + items[4:]] == [PayloadError] * 3
+    assert "must be an object, not list" in str(items[2])
+
+
+def test_bad_items_fail_alone(
+    runtime: RuntimeContext, runner: asyncio.Runner, tmp_path: Path
+) -> None:
+    path = write_lines(
+        tmp_path / "payloads.jsonl",
+        [json.dumps(PAYLOAD), "{not json", '"text"', json.dumps(PAYLOAD)],
+    )
+    batch_runner = BatchRunner(2, runtime)
+    results = collect(runner, batch_runner, load_payloads(str(path)))
+    statuses = {result["index"]: result["status"] for result in results}
+    assert statuses == {0: "ok", 1: "error", 2: "error", 3: "ok"}
+    summary = batch_runner.summary()
+    assert summary["failed"] == 2
+    # Both runs of the sequence share its compiled graph
+    assert summary["caches"]["graphs"]["size"] == 1
+
+
+def test_failing_payload_source_is_raised(
+    runtime: RuntimeContext, runner: asyncio.Runner
+) -> None:
+    def payloads() -> Iterator[SequenceRunnerPayload]:
+        yield PAYLOAD
+        raise OSError("payload file went away")
+
+    with pytest.raises(OSError, match="went away"):
+        collect(runner, BatchRunner(2, runtime), payloads())
@@ -0,0 +1,89 @@
+import asyncio
+import time
+from typing import Any, Awaitable, Callable
+
+import pytest
+
+from src.runtime.loop_thread import LoopThread, run_on_loop
+from src.runtime.runtime_context import RuntimeContext
+from tests.support import run_sequence
+
+# Longest the loop may go without running a ready callback during runs
+MAX_LOOP_LAG_SECONDS = 0.1
+LAG_PROBE_INTERVAL_SECONDS = 0.005
+CONCURRENT_RUNS = 4
+
+
+async def max_loop_lag(work: Callable[[], Awaitable[Any]]) -> tuple[float, float]:
+    """
+    Runs work while a probe sleeps in short intervals, and returns the
+    probe's longest oversleep with the work's wall time. A loop stalled by
+    blocking code wakes the probe late.
+    """
+    lags: list[float] = []
+
+    async def probe() -> None:
+        while True:
+            started = time.perf_counter()
+            await asyncio.sleep(LAG_PROBE_INTERVAL_SECONDS)
+            lags.append(time.perf_counter() - started - LAG_PROBE_INTERVAL_SECONDS)
+
+    probe_task = asyncio.create_task(probe())
+    started = time.perf_counter()
+    try:
+        await work()
+    finally:
+        probe_task.cancel()
+    return max(lags, default=0.0), time.perf_counter() - started
+
+
+@pytest.mark.runtime(model_latency_ms=100, tool_latency_ms=20)
+def test_concurrent_runs_do_not_block_the_loop(
+    runtime: RuntimeContext, runner: asyncio.Runner
+) -> None:
+    async def run() -> tuple[float, float, float]:
+        # Compiles the plan, not measured here
+        started = time.perf_counter()
+        await run_sequence(runtime, "wide-4")
+        serial_seconds = time.perf_counter() - started
+        started = time.perf_counter()
+        await run_sequence(runtime, "wide-4")
+        serial_seconds = min(serial_seconds, time.perf_counter() - started)
+
+        lag, wall_seconds = await max_loop_lag(
+            lambda: asyncio.gather(
+                *(run_sequence(runtime, "wide-4") for _ in range(CONCURRENT_RUNS))
+            )
+        )
+        return lag, wall_seconds, serial_seconds
+
+    lag, wall_seconds, serial_seconds = runner.run(run())
+    assert (
+        lag < MAX_LOOP_LAG_SECONDS
+    ), f"the event loop stalled for {lag * 1000:.0f} ms during concurrent runs"
+    # Runs and their parallel steps overlap instead of queueing on the loop
+    assert wall_seconds < CONCURRENT_RUNS * serial_seconds / 2
+
+
+def test_loop_thread_runs_coroutines_from_sync_code() -> None:
+    loop_thread = LoopThread("test-loop")
+
+    async def loop_of_call() -> asyncio.AbstractEventLoop:
+        await asyncio.sleep(0)
+        return asyncio.get_running_loop()
+
+    assert loop_thread.run(loop_of_call()) is loop_thread.loop
+    # The loop outlives the call
+    assert loop_thread.run(loop_of_call()) is loop_thread.loop
+
+
+def test_blocking_bridge_refuses_a_running_loop() -> None:
+    loop_thread = LoopThread("test-loop")
+
+    async def call_from_loop() -> None:
+        with pytest.raises(RuntimeError, match="running event loop"):
+            run_on_loop(loop_thread.loop, asyncio.sleep(0))
+        # The same call from a worker thread goes through
+        await asyncio.to_thread(run_on_loop, loop_thread.loop, asyncio.sleep(0))
+
+    asyncio.run(call_from_loop())
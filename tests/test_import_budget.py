@@ -0,0 +1,46 @@
+import json
+import subprocess
+import sys
+
+from benchmarks.import_profile import profile_imports
+from src.constants import APP_IMPORT_BUDGET_MS
+
+# Loaded on the first invocation, never when the handler's module is imported
+DEFERRED_PACKAGES = [
+    "boto3",
+    "jsonschema_pydantic",
+    "langchain",
+    "langchain_core",
+    "langchain_mcp_adapters",
+    "langchain_openai",
+    "langgraph",
+    "langsmith",
+    "mcp",
+    "openai",
+    "starlette",
+]
+
+
+def test_app_import_stays_within_budget() -> None:
+    profile = profile_imports("src.app")
+    assert profile["total_ms"] <= APP_IMPORT_BUDGET_MS, (
+        f"import src.app took {profile['total_ms']:.1f} ms, over the "
+        f"{APP_IMPORT_BUDGET_MS:.0f} ms budget; see "
+        "python -m benchmarks.import_profile src.app"
+    )
+
+
+def test_app_import_defers_heavy_packages() -> None:
+    probe = subprocess.run(
+        [
+            sys.executable,
+            "-c",
+            "import json, sys; import src.app; "
+            "print(json.dumps(sorted({name.split('.')[0] for name in sys.modules})))",
+        ],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    loaded = set(json.loads(probe.stdout))
+    assert not loaded & set(DEFERRED_PACKAGES)
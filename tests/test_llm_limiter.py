@@ -0,0 +1,158 @@
+import asyncio
+import time
+from typing import Any
+
+import pytest
+
+from src.agent import llm_limiter
+from src.agent.llm_limiter import LLMLimiter
+
+
+class RateLimitError(Exception):
+    pass
+
+
+def held_call(release: asyncio.Event, started: list[str], name: str) -> Any:
+    async def invoke() -> str:
+        started.append(name)
+        await release.wait()
+        return name
+
+    return invoke
+
+
+def test_starts_queued_calls_in_priority_then_arrival_order() -> None:
+    limiter = LLMLimiter({"model": {"max_concurrency": 1}})
+
+    async def run() -> None:
+        release = asyncio.Event()
+        started: list[str] = []
+        calls = [
+            asyncio.create_task(
+                limiter.call("model", priority, 1, held_call(release, started, name))
+            )
+            for name, priority in [
+                ("first", 0),
+                ("low", 0),
+                ("high", 5),
+                ("low-later", 0),
+                ("medium", 1),
+            ]
+        ]
+        await asyncio.sleep(0)
+        assert started == ["first"]
+        assert limiter.lane("model").stats()["queued"] == 4
+        release.set()
+        await asyncio.gather(*calls)
+        assert started == ["first", "high", "medium", "low", "low-later"]
+
+    asyncio.run(run())
+
+
+def test_caps_concurrent_calls_per_model() -> None:
+    limiter = LLMLimiter({"capped": {"max_concurrency": 2}})
+    running = {"capped": 0, "free": 0}
+    peak = {"capped": 0, "free": 0}
+
+    def invoke(model: str) -> Any:
+        async def call() -> None:
+            running[model] += 1
+            peak[model] = max(peak[model], running[model])
+            await asyncio.sleep(0.01)
+            running[model] -= 1
+
+        return call
+
+    async def run() -> None:
+        await asyncio.gather(
+            *(
+                limiter.call(model, 0, 1, invoke(model))
+                for model in ("capped", "free")
+                for _ in range(6)
+            )
+        )
+
+    asyncio.run(run())
+    assert peak == {"capped": 2, "free": 6}
+    assert limiter.lane("capped").stats()["calls"] == 6
+    assert limiter.lane("capped").stats()["in_flight"] == 0
+
+
+def test_retries_rate_limited_calls_after_backoff(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setattr(llm_limiter, "LLM_BACKOFF_BASE_SECONDS", 0.05)
+    limiter = LLMLimiter({"model": {"max_concurrency": 4}}, rate_limit_retries=2)
+    attempts: list[float] = []
+
+    async def invoke() -> str:
+        attempts.append(time.monotonic())
+        if len(attempts) < 3:
+            raise RateLimitError()
+        return "ok"
+
+    assert asyncio.run(limiter.call("model", 0, 1, invoke)) == "ok"
+    # Backoff doubles between attempts
+    assert attempts[1] - attempts[0] >= 0.05
+    assert attempts[2] - attempts[1] >= 0.1
+    stats = limiter.lane("model").stats()
+    assert stats["rate_limited"] == 2
+    # Halved twice, then grown back by the successful call
+    assert stats["concurrency"] == 2
+
+
+def test_gives_up_after_rate_limit_retries_and_on_other_errors(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setattr(llm_limiter, "LLM_BACKOFF_BASE_SECONDS", 0.01)
+    limiter = LLMLimiter({}, rate_limit_retries=1)
+    attempts = 0
+
+    async def invoke(error: Exception) -> None:
+        nonlocal attempts
+        attempts += 1
+        raise error
+
+    with pytest.raises(RateLimitError):
+        asyncio.run(limiter.call("model", 0, 1, lambda: invoke(RateLimitError())))
+    assert attempts == 2
+
+    attempts = 0
+    with pytest.raises(ValueError):
+        asyncio.run(limiter.call("model", 0, 1, lambda: invoke(ValueError())))
+    assert attempts == 1
+    assert limiter.lane("model").stats()["in_flight"] == 0
+
+
+def test_cancelled_calls_give_their_slot_back() -> None:
+    limiter = LLMLimiter({"model": {"max_concurrency": 1}})
+
+    async def run() -> None:
+        lane = limiter.lane("model")
+        release = asyncio.Event()
+        started: list[str] = []
+        running = asyncio.create_task(
+            limiter.call("model", 0, 1, held_call(release, started, "running"))
+        )
+        waiting = asyncio.create_task(
+            limiter.call("model", 0, 1, held_call(release, started, "waiting"))
+        )
+        await asyncio.sleep(0)
+        assert lane.stats()["in_flight"] == 1
+        assert lane.stats()["queued"] == 1
+
+        waiting.cancel()
+        await asyncio.gather(waiting, return_exceptions=True)
+        assert lane.stats()["in_flight"] == 1
+        assert lane.stats()["queued"] == 0
+
+        running.cancel()
+        await asyncio.gather(running, return_exceptions=True)
+        assert lane.stats()["in_flight"] == 0
+
+        release.set()
+        next_call = held_call(release, started, "next")
+        assert await asyncio.wait_for(limiter.call("model", 0, 1, next_call), 1)
+        assert started == ["running", "next"]
+
+    asyncio.run(run())
@@ -0,0 +1,150 @@
+import asyncio
+import time
+from typing import Callable
+
+import anyio
+import pytest
+from mcp import StdioServerParameters
+
+from src.tools import mcp_session_pool
+from src.tools.mcp_session_pool import MCPSessionPool, PooledMCPServer
+from tests.fake_mcp import fake_server_parameters
+
+
+class RecordingServer(PooledMCPServer):
+    created: list["RecordingServer"] = []
+
+    def __init__(self, *args, **kwargs) -> None:  # type: ignore[no-untyped-def]
+        super().__init__(*args, **kwargs)
+        RecordingServer.created.append(self)
+
+
+@pytest.fixture
+def recorded_servers(monkeypatch: pytest.MonkeyPatch) -> list[RecordingServer]:
+    RecordingServer.created = []
+    monkeypatch.setattr(mcp_session_pool, "PooledMCPServer", RecordingServer)
+    return RecordingServer.created
+
+
+def second_server_broken() -> Callable[[], StdioServerParameters]:
+    # The first server spawned is the fake one, the second cannot be spawned
+    spawned: list[int] = []
+
+    def build() -> StdioServerParameters:
+        spawned.append(1)
+        if len(spawned) == 1:
+            return fake_server_parameters(0)()
+        return StdioServerParameters(command="/nonexistent/mcp-server")
+
+    return build
+
+
+def test_concurrent_runs_share_a_server() -> None:
+    async def run() -> None:
+        pool = MCPSessionPool(1, fake_server_parameters(tool_latency_ms=200))
+        try:
+            async with pool.acquire() as first, pool.acquire() as second:
+                assert first is second
+                assert first.borrowers == 2
+                echo = first.tools_by_name["bench-echo-0"]
+                started = time.perf_counter()
+                # The session multiplexes the calls of both borrowers
+                await asyncio.gather(
+                    *(echo.ainvoke({"value": index}) for index in range(4))
+                )
+                assert time.perf_counter() - started < 0.6
+            assert first.borrowers == 0
+        finally:
+            await pool.close()
+
+    asyncio.run(run())
+
+
+def test_borrowers_spread_over_servers() -> None:
+    async def run() -> None:
+        pool = MCPSessionPool(2, fake_server_parameters(0))
+        try:
+            async with pool.acquire() as first, pool.acquire() as second:
+                assert first is not second
+        finally:
+            await pool.close()
+
+    asyncio.run(run())
+
+
+def test_failed_start_stops_started_servers(
+    recorded_servers: list[RecordingServer],
+) -> None:
+    async def run() -> None:
+        pool = MCPSessionPool(2, second_server_broken())
+        with pytest.raises(RuntimeError, match="failed to start"):
+            await pool.start()
+        assert len(recorded_servers) == 2
+        # Stopped, not just still starting
+        assert all(server._task is None for server in recorded_servers)
+        assert pool.servers == []
+
+    asyncio.run(run())
+
+
+def test_cancelled_start_stops_servers(
+    recorded_servers: list[RecordingServer],
+) -> None:
+    async def run() -> None:
+        pool = MCPSessionPool(2, fake_server_parameters(0))
+        start = asyncio.create_task(pool.start())
+        await asyncio.sleep(0.05)
+        start.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await start
+        assert all(server._task is None for server in recorded_servers)
+        # A later start begins again
+        async with pool.acquire() as server:
+            assert server.is_running
+        await pool.close()
+
+    asyncio.run(run())
+
+
+def test_recycled_servers_stop_once_released() -> None:
+    async def run() -> None:
+        pool = MCPSessionPool(1, fake_server_parameters(0))
+        try:
+            async with pool.acquire() as old:
+                pool.recycle()
+                assert not pool.started
+                async with pool.acquire() as new:
+                    assert new is not old
+                # Still lent out to this run
+                assert old.is_running
+            assert not old.is_running
+            assert new.is_running
+        finally:
+            await pool.close()
+
+    asyncio.run(run())
+
+
+def test_only_transport_errors_mark_the_server_suspect() -> None:
+    async def run() -> None:
+        pool = MCPSessionPool(1, fake_server_parameters(0))
+        try:
+            await pool.start()
+            (server,) = pool.servers
+            with pytest.raises(ValueError):
+                async with pool.acquire():
+                    raise ValueError("step failed")
+            assert server._last_healthy_at > 0
+
+            with pytest.raises(ExceptionGroup):
+                async with pool.acquire():
+                    raise ExceptionGroup("tools", [anyio.ClosedResourceError()])
+            # The next borrower health-checks it first
+            assert server._last_healthy_at == 0
+            async with pool.acquire() as healthy:
+                assert healthy is server
+                assert server._last_healthy_at > 0
+        finally:
+            await pool.close()
+
+    asyncio.run(run())
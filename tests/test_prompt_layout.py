@@ -0,0 +1,38 @@
+from src.agent.prompt_layout import split_prompt
+from src.agent.types import Prompt
+
+
+def test_static_prefix_ends_at_the_first_variable() -> None:
+    static, dynamic = split_prompt(
+        [
+            ("system", "Be brief."),
+            ("user", "Context {{not a variable}}\nMessage: {incoming_message}"),
+        ]
+    )
+    assert static == [
+        ("system", "Be brief."),
+        ("user", "Context {{not a variable}}\n"),
+    ]
+    assert dynamic == [("user", "Message: {incoming_message}")]
+
+
+def test_messages_after_the_first_variable_keep_their_order() -> None:
+    static, dynamic = split_prompt(
+        [
+            ("system", "Be brief."),
+            ("user", "{incoming_message}"),
+            ("system", "Never promise a discount."),
+            ("user", "Tone: {tone}"),
+        ]
+    )
+    assert static == [("system", "Be brief.")]
+    assert dynamic == [
+        ("user", "{incoming_message}"),
+        ("system", "Never promise a discount."),
+        ("user", "Tone: {tone}"),
+    ]
+
+
+def test_prompts_without_variables_are_static() -> None:
+    prompt: Prompt = [("system", "Be brief."), ("user", "Say hello.")]
+    assert split_prompt(prompt) == (prompt, [])
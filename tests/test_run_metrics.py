@@ -0,0 +1,35 @@
+import asyncio
+from typing import cast
+
+from langchain_core.tracers import context
+
+from benchmarks.scripted_model import ScriptedChatModel
+from src.metrics.run_metrics import RunMetrics
+from src.metrics.sinks import InMemoryMetricsSink
+from src.sequence.sequence_compiler import CompiledStep
+
+
+def agent_step(index: int) -> CompiledStep:
+    return cast(
+        CompiledStep,
+        {"step": {"type": "agent", "id": f"agent-{index}"}, "depends_on": []},
+    )
+
+
+def test_steps_record_token_usage_without_new_hooks() -> None:
+    model = ScriptedChatModel(prompt_tokens=200, completion_tokens=40)
+    run_metrics = RunMetrics("seq", None, [InMemoryMetricsSink()])
+    hooks = len(context._configure_hooks)
+
+    async def run() -> None:
+        for index in range(10):
+            with run_metrics.step(agent_step(index)):
+                await model.ainvoke("hi")
+        # Calls outside of a step are not counted
+        await model.ainvoke("hi")
+
+    asyncio.run(run())
+    assert len(context._configure_hooks) == hooks
+    summary = run_metrics.finish()
+    assert [step["prompt_tokens"] for step in summary["steps"]] == [200] * 10
+    assert summary["completion_tokens"] == 400
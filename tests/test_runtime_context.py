@@ -0,0 +1,61 @@
+import asyncio
+import json
+import os
+import time
+
+import pytest
+
+from src.data.secrets_manager import SecretsManager
+from src.runtime.runtime_context import RuntimeContext
+from tests.support import run_sequence
+
+
+def test_setup_log_reports_cache_statistics(
+    runtime: RuntimeContext, runner: asyncio.Runner
+) -> None:
+    first = runtime.prepare_invocation(load_secrets=False)
+    assert first["cold_start"] is True
+    runner.run(run_sequence(runtime, "wide-4"))
+    runner.run(run_sequence(runtime, "wide-4"))
+
+    setup = runtime.prepare_invocation(load_secrets=False)
+    assert setup["cold_start"] is False
+    caches = setup["caches"]
+    assert set(caches) == {"agents", "graphs", "llm_responses", "tool_results"}
+    assert caches["graphs"]["hits"] >= 1
+    assert caches["agents"]["hits"] >= 1
+    # Printed as the runtime_setup log line
+    json.dumps(setup)
+
+
+def test_rotated_secrets_replace_clients_and_servers(
+    runtime: RuntimeContext, runner: asyncio.Runner, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    secrets = {"BENCH_API_KEY": "first"}
+
+    def import_all_secrets(self: SecretsManager) -> None:
+        self.secrets = dict(secrets)
+        self._loaded_at = time.monotonic()
+
+    monkeypatch.setattr(SecretsManager, "_import_all_secrets", import_all_secrets)
+    monkeypatch.setenv("BENCH_API_KEY", "first")
+
+    def refresh() -> None:
+        runtime.invalidate_secrets()
+        runner.run(runtime.refresh_secrets())
+
+    refresh()
+    runner.run(run_sequence(runtime, "wide-4"))
+    servers = runtime.mcp_pool.servers
+    # Unchanged values keep everything
+    refresh()
+    assert runtime.agent_cache.stats()["models"] == 1
+    assert runtime.mcp_pool.servers == servers
+
+    secrets["BENCH_API_KEY"] = "second"
+    refresh()
+    assert os.environ["BENCH_API_KEY"] == "second"
+    assert runtime.agent_cache.stats()["models"] == 0
+    runner.run(run_sequence(runtime, "wide-4"))
+    assert not any(server.is_running for server in servers)
+    assert runtime.mcp_pool.servers[0] not in servers
@@ -0,0 +1,84 @@
+import asyncio
+
+import pytest
+
+from src.runtime.runtime_context import RuntimeContext
+from src.sequence.sequence_compiler import SequenceValidationError
+from src.sequence.types import Sequence
+from src.state.session_state import layered_context, make_state_reducer
+from tests.support import echo_step, put_sequence, run_sequence
+
+
+def test_reducers_combine_writes_per_key() -> None:
+    reduce = make_state_reducer(
+        {"log": "append", "profile": "merge", "count": "add", "reply": "replace"}
+    )
+    state = reduce({}, {"log": "a", "profile": {"x": 1}, "count": 1, "reply": "r"})
+    state = reduce(
+        state,
+        {"log": ["b", "c"], "profile": {"y": 2}, "count": 2, "reply": "s", "new": 1},
+    )
+    assert state == {
+        "log": ["a", "b", "c"],
+        "profile": {"x": 1, "y": 2},
+        "count": 3,
+        "reply": "s",
+        "new": 1,
+    }
+
+
+def test_reducer_leaves_the_current_state_untouched() -> None:
+    reduce = make_state_reducer({"log": "append", "profile": "merge"})
+    current = {"log": ["a"], "profile": {"x": 1}, "reply": "r"}
+    # Siblings of a superstep are handed the same state object
+    first = reduce(current, {"log": "b", "reply": "s"})
+    second = reduce(current, {"profile": {"y": 2}})
+    assert current == {"log": ["a"], "profile": {"x": 1}, "reply": "r"}
+    assert first == {"log": ["a", "b"], "profile": {"x": 1}, "reply": "s"}
+    assert second == {"log": ["a"], "profile": {"x": 1, "y": 2}, "reply": "r"}
+
+
+def test_layered_context_prefers_the_first_layer_and_is_read_only() -> None:
+    context = layered_context({"a": 1}, {"a": 2, "b": 3})
+    assert (context["a"], context["b"]) == (1, 3)
+    with pytest.raises(TypeError):
+        context["a"] = 4  # type: ignore[index]
+
+
+def test_sequence_reducers_apply_to_step_writes(
+    runtime: RuntimeContext, runner: asyncio.Runner
+) -> None:
+    sequence: Sequence = {
+        "id": "reducer-seq",
+        "state_reducers": {"echoes": "append"},
+        "steps": [
+            echo_step(0, output_key="echoes"),
+            echo_step(1, output_key="echoes"),
+        ],
+    }
+
+    async def run() -> None:
+        await put_sequence(runtime, sequence)
+        state, _ = await run_sequence(
+            runtime, "reducer-seq", {"incoming_message": {"content": "hi"}}
+        )
+        assert [echo["index"] for echo in state["echoes"]] == [0, 1]
+
+    runner.run(run())
+
+
+def test_unknown_reducers_are_rejected(
+    runtime: RuntimeContext, runner: asyncio.Runner
+) -> None:
+    sequence: Sequence = {
+        "id": "bad-reducer-seq",
+        "state_reducers": {"echoes": "concat"},  # type: ignore[dict-item]
+        "steps": [echo_step(0)],
+    }
+
+    async def run() -> None:
+        await put_sequence(runtime, sequence)
+        with pytest.raises(SequenceValidationError, match="unknown reducer"):
+            await run_sequence(runtime, "bad-reducer-seq")
+
+    runner.run(run())
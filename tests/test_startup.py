@@ -0,0 +1,78 @@
+import asyncio
+from typing import Any
+
+import pytest
+
+from src.graph.graph_cache import CompiledGraphCache
+from src.runtime.runtime_context import RuntimeContext
+from src.runtime.startup import StartupPipeline
+from tests.support import run_sequence
+
+
+def test_stages_wait_for_the_stages_they_run_after() -> None:
+    async def stage(seconds: float) -> None:
+        await asyncio.sleep(seconds)
+
+    pipeline = StartupPipeline()
+    pipeline.add("a", lambda: stage(0.05))
+    pipeline.add("b", lambda: stage(0.01))
+    pipeline.add("c", lambda: stage(0.01), after=["a", "b"])
+    report = asyncio.run(pipeline.run())
+    stages = report["stages"]
+    assert stages["c"]["started_ms"] >= stages["a"]["finished_ms"]
+    assert report["critical_path"] == ["a", "c"]
+    with pytest.raises(ValueError, match="unknown stage d"):
+        pipeline.add("e", lambda: stage(0), after=["d"])
+
+
+def test_warm_startup_skips_the_cold_stages(
+    cold_runtime: RuntimeContext,
+    runner: asyncio.Runner,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    keys: list[Any] = []
+
+    def make_key(*args: Any) -> Any:
+        keys.append(CompiledGraphCache.make_key(*args))
+        return keys[-1]
+
+    monkeypatch.setattr(cold_runtime.graph_cache, "make_key", make_key)
+
+    async def run() -> None:
+        _, sequence_runner = await run_sequence(cold_runtime, "wide-4")
+        assert sequence_runner.startup_report is not None
+        assert set(sequence_runner.startup_report["stages"]) == {
+            "configs",
+            "mcp",
+            "models",
+            "graph",
+        }
+        # The key the graph stage computed is reused by the run
+        assert len(keys) == 1
+
+        _, sequence_runner = await run_sequence(cold_runtime, "wide-4")
+        assert sequence_runner.startup_report is not None
+        assert set(sequence_runner.startup_report["stages"]) == {"configs", "models"}
+        assert len(keys) == 2
+        assert cold_runtime.graph_cache.stats()["hits"] == 2
+
+    runner.run(run())
+
+
+def test_failed_startup_leaves_the_servers_running(
+    cold_runtime: RuntimeContext, runner: asyncio.Runner
+) -> None:
+    pool = cold_runtime.mcp_pool
+
+    async def servers_started() -> None:
+        while not pool.started:
+            await asyncio.sleep(0.01)
+
+    async def run() -> None:
+        with pytest.raises(Exception, match="missing-seq"):
+            await run_sequence(cold_runtime, "missing-seq")
+        # Cancelling the mcp stage did not stop the start
+        await asyncio.wait_for(servers_started(), timeout=5)
+        assert all(server.is_running for server in pool.servers)
+
+    runner.run(run())
@@ -0,0 +1,160 @@
+import asyncio
+import time
+from pathlib import Path
+
+import pytest
+
+from src.runtime.runtime_context import RuntimeContext
+from src.sequence.types import Sequence
+from src.state.step_checkpoints import (
+    InMemoryStepCheckpointStore,
+    SQLiteStepCheckpointStore,
+    StepCheckpointStore,
+)
+from tests.support import echo_step, put_sequence, run_sequence
+
+RUN = ("client-123", "seq", "run-1")
+
+# The echo steps write step_0 and step_1, then send_reply rejects anything
+# but a string, so a run fails there until the state holds one
+FAILING_SEQUENCE: Sequence = {
+    "id": "checkpoint-seq",
+    "steps": [
+        echo_step(0),
+        echo_step(1, "step_0"),
+        {
+            "type": "tool",
+            "id": "demo-send_reply",
+            "arguments": {
+                "append_signature_result": {"type": "dynamic", "value": "reply"},
+                "client_id": {"type": "static", "value": "client-123"},
+            },
+            "output_key": "sent",
+        },
+    ],
+}
+
+
+def outcomes(summary: object) -> dict[str, str]:
+    assert isinstance(summary, dict)
+    return {step["step"]: step["outcome"] for step in summary["steps"]}
+
+
+@pytest.fixture(params=["memory", "sqlite"])
+def store(request: pytest.FixtureRequest, tmp_path: Path) -> StepCheckpointStore:
+    if request.param == "memory":
+        return InMemoryStepCheckpointStore()
+    return SQLiteStepCheckpointStore(str(tmp_path / "checkpoints.db"))
+
+
+def test_store_records_and_loads_steps(store: StepCheckpointStore) -> None:
+    async def run() -> None:
+        await store.save(RUN, "a", {"x": 1})
+        await store.save(RUN, "b", {"y": [1, 2]})
+        assert await store.load(RUN) == {"a": {"x": 1}, "b": {"y": [1, 2]}}
+        # The same caller-chosen run id of another client is another run
+        assert await store.load(("client-456", "seq", "run-1")) == {}
+
+    asyncio.run(run())
+
+
+def test_store_ignores_expired_checkpoints(tmp_path: Path) -> None:
+    async def run() -> None:
+        for store in (
+            InMemoryStepCheckpointStore(retention_seconds=0),
+            SQLiteStepCheckpointStore(str(tmp_path / "c.db"), retention_seconds=0),
+        ):
+            await store.save(RUN, "a", {"x": 1})
+            assert await store.load(RUN) == {}
+
+    asyncio.run(run())
+
+
+def test_saves_purge_expired_runs_once_per_interval(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    clock = 1000.0
+    monkeypatch.setattr(time, "time", lambda: clock)
+    memory = InMemoryStepCheckpointStore(
+        retention_seconds=10, purge_interval_seconds=60
+    )
+    sqlite = SQLiteStepCheckpointStore(
+        str(tmp_path / "c.db"), retention_seconds=10, purge_interval_seconds=60
+    )
+
+    def stored_runs() -> tuple[int, int]:
+        (rows,) = sqlite._connection.execute(
+            "SELECT COUNT(DISTINCT run_id) FROM run_step_checkpoints"
+        ).fetchone()
+        return len(memory._runs), rows
+
+    async def save(run_id: str) -> None:
+        for store in (memory, sqlite):
+            await store.save(("client-123", "seq", run_id), "a", {"x": 1})
+
+    async def run() -> None:
+        nonlocal clock
+        await save("run-1")
+        clock += 30
+        # run-1 expired, but the last purge ran less than an interval ago
+        await save("run-2")
+        assert stored_runs() == (2, 2)
+        clock += 30
+        await save("run-3")
+        assert stored_runs() == (1, 1)
+
+    asyncio.run(run())
+
+
+def test_retried_run_resumes_after_failed_step(
+    runtime: RuntimeContext, runner: asyncio.Runner
+) -> None:
+    async def run() -> None:
+        await put_sequence(runtime, FAILING_SEQUENCE)
+        with pytest.raises(Exception, match="valid string"):
+            await run_sequence(
+                runtime,
+                "checkpoint-seq",
+                {"incoming_message": {"content": "hi"}, "reply": 1},
+                run_id="run-1",
+            )
+
+        state, sequence_runner = await run_sequence(
+            runtime,
+            "checkpoint-seq",
+            {"incoming_message": {"content": "hi"}, "reply": "signed"},
+            run_id="run-1",
+        )
+        assert sequence_runner.resumed_steps == ["bench-echo-0", "bench-echo-1"]
+        assert outcomes(sequence_runner.run_summary) == {
+            "bench-echo-0": "resumed",
+            "bench-echo-1": "resumed",
+            "demo-send_reply": "executed",
+        }
+        assert state["step_1"]["echo"]["echo"] == "hi"
+        assert state["sent"]["sent"] is True
+
+    runner.run(run())
+
+
+def test_run_ids_are_scoped_to_the_client(
+    runtime: RuntimeContext, runner: asyncio.Runner
+) -> None:
+    state = {"incoming_message": {"content": "hi"}, "reply": "signed"}
+
+    async def run() -> None:
+        await put_sequence(runtime, FAILING_SEQUENCE)
+        await run_sequence(runtime, "checkpoint-seq", state, run_id="run-1")
+
+        _, sequence_runner = await run_sequence(
+            runtime, "checkpoint-seq", state, run_id="run-1"
+        )
+        assert set(outcomes(sequence_runner.run_summary).values()) == {"resumed"}
+
+        _, sequence_runner = await run_sequence(
+            runtime, "checkpoint-seq", state, run_id="run-1", client_id="client-456"
+        )
+        assert sequence_runner.resumed_steps == []
+        assert set(outcomes(sequence_runner.run_summary).values()) == {"executed"}
+
+    runner.run(run())
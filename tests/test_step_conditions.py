@@ -0,0 +1,117 @@
+import asyncio
+from typing import Any
+
+import pytest
+
+from src.runtime.runtime_context import RuntimeContext
+from src.sequence.sequence_compiler import SequenceValidationError
+from src.sequence.step_conditions import ConditionSet
+from src.sequence.types import Sequence
+from tests.support import echo_step, put_sequence, run_sequence
+
+
+def conditional_sequence(execution_mode: str) -> Sequence:
+    # echo1 is skipped on "skip", and echo0 ends the run on "stop"
+    return {
+        "id": f"conditions-{execution_mode}",
+        "execution_mode": execution_mode,  # type: ignore[typeddict-item]
+        "steps": [
+            echo_step(0, terminate_conditions={"step_0.echo": "stop"}),
+            echo_step(1, skip_conditions={"incoming_message[content]": "skip"}),
+            echo_step(2, depends_on=["bench-echo-1"]),
+        ],
+    }
+
+
+def run_with_message(
+    runtime: RuntimeContext, runner: asyncio.Runner, content: str, execution_mode: str
+) -> Any:
+    async def run() -> Any:
+        sequence = conditional_sequence(execution_mode)
+        await put_sequence(runtime, sequence)
+        state, sequence_runner = await run_sequence(
+            runtime, sequence["id"], {"incoming_message": {"content": content}}
+        )
+        return state, sequence_runner.run_summary
+
+    return runner.run(run())
+
+
+@pytest.mark.parametrize(
+    ("conditions", "state", "matches"),
+    [
+        ({"reply": "yes"}, {"reply": "yes"}, True),
+        ({"reply": {"op": "ne", "value": "yes"}}, {}, True),
+        ({"count": {"op": "gte", "value": 2}}, {"count": 2}, True),
+        # A missing value compares with nothing
+        ({"count": {"op": "gt", "value": 2}}, {}, False),
+        (
+            {"user.tier": {"op": "in", "value": ["gold"]}},
+            {"user": {"tier": "gold"}},
+            True,
+        ),
+        ({"user.tier": {"op": "not_in", "value": ["gold"]}}, {}, True),
+        ({"reply": {"op": "exists"}}, {"reply": None}, False),
+        ({"reply": {"op": "exists", "value": False}}, {}, True),
+        ({"reply": {"op": "not", "value": {"op": "exists"}}}, {"reply": 1}, False),
+        # Met when any condition holds
+        ({"a": 1, "b": 2}, {"a": 0, "b": 2}, True),
+    ],
+)
+def test_condition_operators(
+    conditions: Any, state: dict[str, Any], matches: bool
+) -> None:
+    assert ConditionSet("step", "skip_conditions", conditions).matches(state) is matches
+
+
+@pytest.mark.parametrize(
+    "condition",
+    [{"op": "like"}, {"op": "in", "value": "gold"}, {"op": "exists", "value": 1}],
+)
+def test_invalid_conditions_are_rejected(condition: Any) -> None:
+    with pytest.raises(ValueError, match="Step step: terminate_conditions reply"):
+        ConditionSet("step", "terminate_conditions", {"reply": condition})
+
+
+@pytest.mark.parametrize("execution_mode", ["sequential", "parallel"])
+def test_terminate_conditions_end_the_run(
+    runtime: RuntimeContext, runner: asyncio.Runner, execution_mode: str
+) -> None:
+    state, summary = run_with_message(runtime, runner, "stop", execution_mode)
+    assert summary["terminated_by"] == "bench-echo-0"
+    assert "step_2" not in state
+
+    state, summary = run_with_message(runtime, runner, "go", execution_mode)
+    assert "terminated_by" not in summary
+    assert state["step_2"]["echo"] == "go"
+
+
+@pytest.mark.parametrize("execution_mode", ["sequential", "parallel"])
+def test_skip_conditions_route_around_the_step(
+    runtime: RuntimeContext, runner: asyncio.Runner, execution_mode: str
+) -> None:
+    state, summary = run_with_message(runtime, runner, "skip", execution_mode)
+    assert "step_1" not in state
+    # Steps after a skipped one still run
+    assert state["step_2"]["echo"] == "skip"
+    assert {step["step"]: step["outcome"] for step in summary["steps"]} == {
+        "bench-echo-0": "executed",
+        "bench-echo-1": "skipped",
+        "bench-echo-2": "executed",
+    }
+
+
+def test_sequences_with_invalid_conditions_are_rejected(
+    runtime: RuntimeContext, runner: asyncio.Runner
+) -> None:
+    sequence: Sequence = {
+        "id": "bad-conditions",
+        "steps": [echo_step(0, skip_conditions={"step_0": {"op": "like"}})],
+    }
+
+    async def run() -> None:
+        await put_sequence(runtime, sequence)
+        with pytest.raises(SequenceValidationError, match="unknown operator"):
+            await run_sequence(runtime, "bad-conditions")
+
+    runner.run(run())
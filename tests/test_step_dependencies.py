@@ -0,0 +1,104 @@
+import asyncio
+import time
+
+import pytest
+
+from src.runtime.runtime_context import RuntimeContext
+from src.sequence.step_dependencies import build_dependency_graph
+from src.sequence.types import Sequence
+from tests.support import echo_step, put_sequence, run_sequence
+
+
+def plan(
+    steps: dict[str, tuple[set[str], set[str]]],
+    depends_on: dict[str, list[str]] = {},
+) -> dict[str, list[str]]:
+    # Step ids mapped to what they read and write, in sequence order
+    sequence: Sequence = {
+        "id": "seq",
+        "steps": [
+            {"type": "tool", "id": step_id, "depends_on": depends_on.get(step_id, [])}
+            for step_id in steps
+        ],
+    }
+    reads = {step_id: step[0] for step_id, step in steps.items()}
+    writes = {step_id: step[1] for step_id, step in steps.items()}
+    return build_dependency_graph(sequence, reads, writes)
+
+
+def test_dependencies_follow_reads_and_writes() -> None:
+    assert plan(
+        {
+            "a": ({"message"}, {"x"}),
+            "b": ({"message"}, {"y"}),
+            # Reads what a wrote
+            "c": ({"x"}, {"z"}),
+            # Writes what c read
+            "d": (set(), {"x"}),
+            # Writes what b wrote
+            "e": (set(), {"y"}),
+        }
+    ) == {"a": [], "b": [], "c": ["a"], "d": ["c"], "e": ["b"]}
+
+
+def test_implied_dependencies_are_dropped() -> None:
+    assert plan(
+        {"a": (set(), {"x"}), "b": ({"x"}, {"y"}), "c": ({"x", "y"}, {"z"})}
+    ) == {"a": [], "b": ["a"], "c": ["b"]}
+
+
+def test_explicit_dependencies() -> None:
+    assert plan(
+        {"a": (set(), {"x"}), "b": (set(), {"y"})}, depends_on={"b": ["a"]}
+    ) == {"a": [], "b": ["a"]}
+    with pytest.raises(ValueError, match="Step a depends on b, which is not earlier"):
+        plan({"a": (set(), {"x"}), "b": (set(), {"y"})}, depends_on={"a": ["b"]})
+
+
+def test_parallel_runs_match_sequential_runs(
+    runtime: RuntimeContext, runner: asyncio.Runner
+) -> None:
+    steps = [
+        echo_step(0),
+        echo_step(1),
+        echo_step(2, "step_0"),
+        echo_step(3, "step_2"),
+    ]
+
+    async def run() -> None:
+        states = []
+        for execution_mode in ("sequential", "parallel"):
+            sequence: Sequence = {
+                "id": f"chain-{execution_mode}",
+                "execution_mode": execution_mode,  # type: ignore[typeddict-item]
+                "steps": steps,
+            }
+            await put_sequence(runtime, sequence)
+            state, _ = await run_sequence(runtime, sequence["id"])
+            states.append(state)
+        assert states[0] == states[1]
+        assert (
+            states[1]["step_3"]["echo"]["echo"]["echo"]
+            == "Do you have the SUV in stock?"
+        )
+
+    runner.run(run())
+
+
+# Four branches and the join, 200 ms each
+@pytest.mark.runtime(model_latency_ms=200, tool_latency_ms=200)
+def test_independent_steps_overlap(
+    runtime: RuntimeContext, runner: asyncio.Runner
+) -> None:
+    async def run() -> None:
+        await run_sequence(runtime, "wide-4")
+        started = time.perf_counter()
+        state, sequence_runner = await run_sequence(runtime, "wide-4")
+        elapsed = time.perf_counter() - started
+        assert state["joined"] is not None
+        assert sequence_runner.run_summary is not None
+        assert len(sequence_runner.run_summary["steps"]) == 5
+        # One layer of branches then the join, against 1s in sequence
+        assert elapsed < 0.8
+
+    runner.run(run())
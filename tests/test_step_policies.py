@@ -0,0 +1,161 @@
+import asyncio
+import time
+from typing import Any, cast
+
+import pytest
+
+from src.metrics.types import StepMetrics
+from src.runtime.runtime_context import RuntimeContext
+from src.sequence.step_policies import StepRunPolicy
+from src.sequence.types import Sequence
+from tests.support import echo_step, put_sequence, run_sequence
+
+
+def policy_metrics() -> StepMetrics:
+    # Only the counters a policy updates
+    return cast(
+        StepMetrics, {"retries": 0, "timeouts": 0, "hedges": 0, "hedges_won": 0}
+    )
+
+
+def scripted_attempts(*outcomes: Any) -> Any:
+    """
+    An attempt returning or raising the next outcome on each call. A tuple
+    (seconds, outcome) sleeps first.
+    """
+    pending = list(outcomes)
+
+    async def attempt() -> Any:
+        outcome = pending.pop(0)
+        if isinstance(outcome, tuple):
+            seconds, outcome = outcome
+            await asyncio.sleep(seconds)
+        if isinstance(outcome, Exception):
+            raise outcome
+        return outcome
+
+    return attempt
+
+
+def test_retries_retryable_errors_with_backoff() -> None:
+    policy = StepRunPolicy("step", {"max_retries": 2, "backoff_base_seconds": 0.01})
+    metrics = policy_metrics()
+    attempt = scripted_attempts(ConnectionError(), TimeoutError(), "ok")
+    assert asyncio.run(policy.run(attempt, metrics)) == "ok"
+    assert metrics["retries"] == 2
+
+
+def test_gives_up_after_max_retries_and_on_other_errors() -> None:
+    policy = StepRunPolicy("step", {"max_retries": 1, "backoff_base_seconds": 0})
+    metrics = policy_metrics()
+    with pytest.raises(ConnectionError):
+        attempt = scripted_attempts(ConnectionError(), ConnectionError())
+        asyncio.run(policy.run(attempt, metrics))
+    assert metrics["retries"] == 1
+
+    metrics = policy_metrics()
+    with pytest.raises(ValueError):
+        asyncio.run(policy.run(scripted_attempts(ValueError(), "ok"), metrics))
+    assert metrics["retries"] == 0
+
+
+def test_times_out_hanging_attempts_then_retries() -> None:
+    policy = StepRunPolicy(
+        "step",
+        {"timeout_seconds": 0.05, "max_retries": 1, "backoff_base_seconds": 0},
+    )
+    metrics = policy_metrics()
+    attempt = scripted_attempts((10, "late"), "ok")
+    assert asyncio.run(policy.run(attempt, metrics)) == "ok"
+    assert metrics["timeouts"] == 1
+    assert metrics["retries"] == 1
+
+    metrics = policy_metrics()
+    with pytest.raises(TimeoutError, match="Step step timed out"):
+        asyncio.run(
+            StepRunPolicy("step", {"timeout_seconds": 0.05}).run(
+                scripted_attempts((10, "late")), metrics
+            )
+        )
+
+
+def test_hedge_answers_when_the_first_attempt_is_slow() -> None:
+    policy = StepRunPolicy("step", {"hedge": {"delay_seconds": 0.05}})
+    metrics = policy_metrics()
+    started = time.perf_counter()
+    attempt = scripted_attempts((10, "slow"), "hedged")
+    assert asyncio.run(policy.run(attempt, metrics)) == "hedged"
+    assert time.perf_counter() - started < 1
+    assert metrics["hedges"] == 1
+    assert metrics["hedges_won"] == 1
+
+
+def test_hedge_delay_follows_observed_latencies() -> None:
+    policy = StepRunPolicy(
+        "step", {"hedge": {"percentile": 50, "delay_seconds": 5, "min_samples": 3}}
+    )
+    metrics = policy_metrics()
+    assert policy.hedge_delay() == 5
+    for seconds in (0.01, 0.02, 0.2):
+        asyncio.run(policy.run(scripted_attempts((seconds, "ok")), metrics))
+    delay = policy.hedge_delay()
+    assert delay is not None and 0.02 <= delay < 0.2
+    assert metrics["hedges"] == 0
+
+
+@pytest.mark.parametrize(
+    "step_policy",
+    [{"timeout_seconds": 0}, {"max_retries": -1}, {"hedge": {"percentile": 100}}],
+)
+def test_rejects_invalid_policies(step_policy: Any) -> None:
+    with pytest.raises(ValueError, match="Step step"):
+        StepRunPolicy("step", step_policy)
+
+
+def test_policy_steps_are_checkpointed_and_resumed(
+    runtime: RuntimeContext, runner: asyncio.Runner
+) -> None:
+    # Every step runs under the sequence's policy; send_reply fails until
+    # the state holds a string reply
+    sequence: Sequence = {
+        "id": "policy-seq",
+        "step_policy": {"timeout_seconds": 30, "max_retries": 1},
+        "steps": [
+            echo_step(0),
+            echo_step(1, "step_0"),
+            {
+                "type": "tool",
+                "id": "demo-send_reply",
+                "arguments": {
+                    "append_signature_result": {"type": "dynamic", "value": "reply"},
+                    "client_id": {"type": "static", "value": "client-123"},
+                },
+                "output_key": "sent",
+            },
+        ],
+    }
+
+    async def run() -> None:
+        await put_sequence(runtime, sequence)
+        with pytest.raises(Exception, match="valid string"):
+            await run_sequence(
+                runtime,
+                "policy-seq",
+                {"incoming_message": {"content": "hi"}, "reply": 1},
+                run_id="run-1",
+            )
+
+        _, sequence_runner = await run_sequence(
+            runtime,
+            "policy-seq",
+            {"incoming_message": {"content": "hi"}, "reply": "signed"},
+            run_id="run-1",
+        )
+        assert sequence_runner.run_summary is not None
+        steps = {step["step"]: step for step in sequence_runner.run_summary["steps"]}
+        assert steps["bench-echo-0"]["outcome"] == "resumed"
+        assert steps["bench-echo-1"]["outcome"] == "resumed"
+        assert steps["demo-send_reply"]["outcome"] == "executed"
+        assert steps["demo-send_reply"]["output_bytes"] > 0
+
+    runner.run(run())
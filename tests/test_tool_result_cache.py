@@ -0,0 +1,123 @@
+import asyncio
+from typing import Any, Awaitable, Callable
+
+import pytest
+
+from src.sequence.types import ToolCachePolicy
+from src.tools.tool_result_cache import ToolResultCache
+
+POLICY: ToolCachePolicy = {"ttl_seconds": 60}
+
+
+class Upstream:
+    """
+    A slow tool call counting its calls and whether one was cancelled.
+    """
+
+    def __init__(self, result: Any = "result", seconds: float = 0.05) -> None:
+        self.result = result
+        self.seconds = seconds
+        self.calls = 0
+        self.cancelled = 0
+
+    def call(self) -> Callable[[], Awaitable[Any]]:
+        async def call() -> Any:
+            self.calls += 1
+            try:
+                await asyncio.sleep(self.seconds)
+            except asyncio.CancelledError:
+                self.cancelled += 1
+                raise
+            if isinstance(self.result, Exception):
+                raise self.result
+            return self.result
+
+        return call
+
+
+def test_concurrent_calls_share_one_upstream_call() -> None:
+    cache, upstream = ToolResultCache(), Upstream()
+
+    async def run() -> None:
+        results = await asyncio.gather(
+            *(cache.get_or_call("key", POLICY, upstream.call()) for _ in range(3))
+        )
+        assert results == ["result"] * 3
+        assert await cache.get_or_call("key", POLICY, upstream.call()) == "result"
+
+    asyncio.run(run())
+    assert upstream.calls == 1
+    assert cache.coalesced == 2
+
+
+def test_cancelled_leader_leaves_the_call_to_followers() -> None:
+    cache, upstream = ToolResultCache(), Upstream()
+
+    async def run() -> None:
+        leader = asyncio.create_task(cache.get_or_call("key", POLICY, upstream.call()))
+        await asyncio.sleep(0.01)
+        follower = asyncio.create_task(
+            cache.get_or_call("key", POLICY, upstream.call())
+        )
+        await asyncio.sleep(0.01)
+        leader.cancel()
+        assert await follower == "result"
+        assert leader.cancelled()
+
+    asyncio.run(run())
+    assert (upstream.calls, upstream.cancelled) == (1, 0)
+
+
+def test_call_is_cancelled_once_nobody_waits() -> None:
+    cache, upstream = ToolResultCache(), Upstream()
+
+    async def run() -> None:
+        waiters = [
+            asyncio.create_task(cache.get_or_call("key", POLICY, upstream.call()))
+            for _ in range(2)
+        ]
+        await asyncio.sleep(0.01)
+        for waiter in waiters:
+            waiter.cancel()
+        await asyncio.gather(*waiters, return_exceptions=True)
+        # A later caller does not get the cancelled call
+        assert await cache.get_or_call("key", POLICY, upstream.call()) == "result"
+
+    asyncio.run(run())
+    assert (upstream.calls, upstream.cancelled) == (2, 1)
+
+
+def test_errors_reach_every_caller_and_are_not_cached() -> None:
+    cache, upstream = ToolResultCache(), Upstream(ConnectionError("down"))
+
+    async def run() -> None:
+        results = await asyncio.gather(
+            *(cache.get_or_call("key", POLICY, upstream.call()) for _ in range(2)),
+            return_exceptions=True,
+        )
+        assert all(isinstance(result, ConnectionError) for result in results)
+        upstream.result = "result"
+        assert await cache.get_or_call("key", POLICY, upstream.call()) == "result"
+
+    asyncio.run(run())
+    assert upstream.calls == 2
+
+
+def test_oversized_results_are_not_cached() -> None:
+    cache, upstream = ToolResultCache(), Upstream("x" * 100, seconds=0)
+    policy: ToolCachePolicy = {"ttl_seconds": 60, "max_entry_bytes": 10}
+
+    async def run() -> None:
+        for _ in range(2):
+            await cache.get_or_call("key", policy, upstream.call())
+
+    asyncio.run(run())
+    assert upstream.calls == 2
+    assert cache.oversized == 2
+
+
+@pytest.mark.parametrize("namespace", ["", "client-123"])
+def test_keys_depend_on_namespace_and_arguments(namespace: str) -> None:
+    key = ToolResultCache.make_key(namespace, "tool", {"a": 1, "b": 2})
+    assert key == ToolResultCache.make_key(namespace, "tool", {"b": 2, "a": 1})
+    assert key != ToolResultCache.make_key("other", "tool", {"a": 1, "b": 2})